@@ -2,11 +2,16 @@
 Base validator with common validation logic for document files.
 """
 
+import copy
 import re
+import time
+import zipfile
 from pathlib import Path
 
 import lxml.etree
 
+from . import xsd_engine
+
 
 class BaseSchemaValidator:
     """Base validator with common validation logic for document files."""
@@ -103,10 +108,17 @@ class BaseSchemaValidator:
         "http://www.w3.org/XML/1998/namespace",
     }
 
-    def __init__(self, unpacked_dir, original_file, verbose=False):
+    def __init__(self, unpacked_dir, original_file, verbose=False, jobs=None):
         self.unpacked_dir = Path(unpacked_dir).resolve()
         self.original_file = Path(original_file)
         self.verbose = verbose
+        self.jobs = jobs  # XSD validation processes (None = CPU count)
+
+        # Parsed trees shared by all checks (each part is parsed once per run)
+        self._parsed_trees = {}
+        self.parse_time = 0.0
+        # (check name, seconds) for each check run through run_check()
+        self.check_timings = []
 
         # Set schemas directory
         self.schemas_dir = Path(__file__).parent.parent.parent / "schemas"
@@ -124,6 +136,47 @@ class BaseSchemaValidator:
         """Run all validation checks and return True if all pass."""
         raise NotImplementedError("Subclasses must implement the validate method")
 
+    def parse_xml(self, xml_file):
+        """Return the parsed tree of a file, parsing each file only once per run.
+
+        The tree is shared by all checks and must be treated as read-only:
+        copy it before modifying. Parse errors are cached and raised again.
+        """
+        key = Path(xml_file)
+        tree = self._parsed_trees.get(key)
+        if tree is None:
+            start = time.perf_counter()
+            try:
+                tree = lxml.etree.parse(str(xml_file))
+            except Exception as e:
+                tree = e
+            self.parse_time += time.perf_counter() - start
+            self._parsed_trees[key] = tree
+        if isinstance(tree, Exception):
+            raise tree
+        return tree
+
+    def run_check(self, check):
+        """Run a validation check and record how long it took."""
+        start = time.perf_counter()
+        try:
+            return check()
+        finally:
+            self.check_timings.append((check.__name__, time.perf_counter() - start))
+
+    def print_timing_report(self):
+        """Print the time spent in each check run through run_check()."""
+        total = sum(seconds for _, seconds in self.check_timings)
+        print(f"\nTiming report ({type(self).__name__}):")
+        for name, seconds in sorted(self.check_timings, key=lambda t: -t[1]):
+            share = 100 * seconds / total if total else 0
+            print(f"  {name:<40} {seconds * 1000:9.1f} ms  {share:5.1f}%")
+        print(f"  {'total':<40} {total * 1000:9.1f} ms")
+        print(
+            f"  ({len(self._parsed_trees)} files parsed once in "
+            f"{self.parse_time * 1000:.1f} ms, counted in the first check using them)"
+        )
+
     def validate_xml(self):
         """Validate that all XML files are well-formed."""
         errors = []
@@ -131,7 +184,7 @@ class BaseSchemaValidator:
         for xml_file in self.xml_files:
             try:
                 # Try to parse the XML file
-                lxml.etree.parse(str(xml_file))
+                self.parse_xml(xml_file)
             except lxml.etree.XMLSyntaxError as e:
                 errors.append(
                     f"  {xml_file.relative_to(self.unpacked_dir)}: "
@@ -159,7 +212,7 @@ class BaseSchemaValidator:
 
         for xml_file in self.xml_files:
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
+                root = self.parse_xml(xml_file).getroot()
                 declared = set(root.nsmap.keys()) - {None}  # Exclude default namespace
 
                 for attr_val in [
@@ -190,13 +243,19 @@ class BaseSchemaValidator:
 
         for xml_file in self.xml_files:
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
+                root = self.parse_xml(xml_file).getroot()
                 file_ids = {}  # Track IDs that must be unique within this file
 
                 # Remove all mc:AlternateContent elements from the tree
                 mc_elements = root.xpath(
                     ".//mc:AlternateContent", namespaces={"mc": self.MC_NAMESPACE}
                 )
+                if mc_elements:
+                    # The parsed tree is shared: remove elements from a copy
+                    root = copy.deepcopy(root)
+                    mc_elements = root.xpath(
+                        ".//mc:AlternateContent", namespaces={"mc": self.MC_NAMESPACE}
+                    )
                 for elem in mc_elements:
                     elem.getparent().remove(elem)
 
@@ -310,7 +369,7 @@ class BaseSchemaValidator:
         for rels_file in rels_files:
             try:
                 # Parse relationships file
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
+                rels_root = self.parse_xml(rels_file).getroot()
 
                 # Get the directory where this .rels file is located
                 rels_dir = rels_file.parent
@@ -411,7 +470,7 @@ class BaseSchemaValidator:
 
             try:
                 # Parse the .rels file to get valid relationship IDs and their types
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
+                rels_root = self.parse_xml(rels_file).getroot()
                 rid_to_type = {}
 
                 for rel in rels_root.findall(
@@ -434,7 +493,7 @@ class BaseSchemaValidator:
                         rid_to_type[rid] = type_name
 
                 # Parse the XML file to find all r:id references
-                xml_root = lxml.etree.parse(str(xml_file)).getroot()
+                xml_root = self.parse_xml(xml_file).getroot()
 
                 # Find all elements with r:id attributes
                 for elem in xml_root.iter():
@@ -531,7 +590,7 @@ class BaseSchemaValidator:
 
         try:
             # Parse and get all declared parts and extensions
-            root = lxml.etree.parse(str(content_types_file)).getroot()
+            root = self.parse_xml(content_types_file).getroot()
             declared_parts = set()
             declared_extensions = set()
 
@@ -593,7 +652,7 @@ class BaseSchemaValidator:
                     continue
 
                 try:
-                    root_tag = lxml.etree.parse(str(xml_file)).getroot().tag
+                    root_tag = self.parse_xml(xml_file).getroot().tag
                     root_name = root_tag.split("}")[-1] if "}" in root_tag else root_tag
 
                     if root_name in declarable_roots and path_str not in declared_parts:
@@ -692,11 +751,10 @@ class BaseSchemaValidator:
         valid_count = 0
         skipped_count = 0
 
-        for xml_file in self.xml_files:
+        results = xsd_engine.validate_files(self, self.xml_files, self.jobs)
+
+        for xml_file, (is_valid, new_file_errors) in zip(self.xml_files, results):
             relative_path = str(xml_file.relative_to(self.unpacked_dir))
-            is_valid, new_file_errors = self.validate_file_against_xsd(
-                xml_file, verbose=False
-            )
 
             if is_valid is None:
                 skipped_count += 1
@@ -825,28 +883,53 @@ class BaseSchemaValidator:
 
     def _validate_single_file_xsd(self, xml_file, base_path):
         """Validate a single XML file against XSD schema. Returns (is_valid, errors_set)."""
-        schema_path = self._get_schema_path(xml_file)
+        relative_path = Path(xml_file).relative_to(base_path)
+        if not self._get_schema_path(relative_path):
+            return None, None  # Skip file
+
+        try:
+            data = Path(xml_file).read_bytes()
+        except OSError as e:
+            return False, {str(e)}
+
+        # Parts of the unpacked document reuse the shared parsed tree
+        shared_file = xml_file if Path(base_path) == self.unpacked_dir else None
+        return self._validate_xsd_content(data, relative_path, shared_file)
+
+    def _validate_xsd_content(self, data, relative_path, xml_file=None):
+        """Validate XML content against the schema selected by its package path.
+
+        Results are memoized by content hash, so identical content (e.g. an
+        unchanged part of the original document) is only validated once.
+        If xml_file is given, its shared parsed tree is used instead of data.
+        """
+        schema_path = self._get_schema_path(relative_path)
         if not schema_path:
             return None, None  # Skip file
 
+        return xsd_engine.memoized_result(
+            type(self),
+            relative_path,
+            data,
+            lambda: self._run_xsd_validation(data, relative_path, schema_path, xml_file),
+        )
+
+    def _run_xsd_validation(self, data, relative_path, schema_path, xml_file=None):
+        """Validate XML content against a compiled schema. Returns (is_valid, errors_set)."""
         try:
-            # Load schema
-            with open(schema_path, "rb") as xsd_file:
-                parser = lxml.etree.XMLParser()
-                xsd_doc = lxml.etree.parse(
-                    xsd_file, parser=parser, base_url=str(schema_path)
-                )
-                schema = lxml.etree.XMLSchema(xsd_doc)
+            # Load schema (compiled once per process)
+            schema = xsd_engine.get_schema(schema_path)
 
-            # Load and preprocess XML
-            with open(xml_file, "r") as f:
-                xml_doc = lxml.etree.parse(f)
+            # Load and preprocess XML (preprocessing works on a copy)
+            if xml_file is not None:
+                xml_doc = self.parse_xml(xml_file)
+            else:
+                xml_doc = lxml.etree.ElementTree(lxml.etree.fromstring(data))
 
             xml_doc, _ = self._remove_template_tags_from_text_nodes(xml_doc)
             xml_doc = self._preprocess_for_mc_ignorable(xml_doc)
 
             # Clean ignorable namespaces if needed
-            relative_path = xml_file.relative_to(base_path)
             if (
                 relative_path.parts
                 and relative_path.parts[0] in self.MAIN_CONTENT_FOLDERS
@@ -869,39 +952,30 @@ class BaseSchemaValidator:
     def _get_original_file_errors(self, xml_file):
         """Get XSD validation errors from a single file in the original document.
 
+        Only the matching part is read from the original archive; its errors
+        are memoized by content hash.
+
         Args:
             xml_file: Path to the XML file in unpacked_dir to check
 
         Returns:
             set: Set of error messages from the original file
         """
-        import tempfile
-        import zipfile
-
         # Resolve both paths to handle symlinks (e.g., /var vs /private/var on macOS)
         xml_file = Path(xml_file).resolve()
         unpacked_dir = self.unpacked_dir.resolve()
         relative_path = xml_file.relative_to(unpacked_dir)
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            # Extract original file
-            with zipfile.ZipFile(self.original_file, "r") as zip_ref:
-                zip_ref.extractall(temp_path)
-
-            # Find corresponding file in original
-            original_xml_file = temp_path / relative_path
-
-            if not original_xml_file.exists():
+        with zipfile.ZipFile(self.original_file, "r") as zip_ref:
+            try:
+                data = zip_ref.read(relative_path.as_posix())
+            except KeyError:
                 # File didn't exist in original, so no original errors
                 return set()
 
-            # Validate the specific file in original
-            is_valid, errors = self._validate_single_file_xsd(
-                original_xml_file, temp_path
-            )
-            return errors if errors else set()
+        # Validate the specific file in original
+        is_valid, errors = self._validate_xsd_content(data, relative_path)
+        return errors if errors else set()
 
     def _remove_template_tags_from_text_nodes(self, xml_doc):
         """Remove template tags from XML text nodes and collect warnings.
@@ -0,0 +1,97 @@
+"""
+XSD validation engine shared by the document schema validators.
+
+Compiled schemas are cached once per process, validation results are memoized
+by file content hash, and files are validated in a process pool.
+"""
+
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import lxml.etree
+
+# Below this many files, starting a pool costs more than it saves
+MIN_PARALLEL_FILES = 8
+
+# Compiled XMLSchema objects, keyed by schema path (one cache per process)
+_schema_cache = {}
+
+# XSD results keyed by (validator class, relative path, content SHA-1)
+_result_cache = {}
+
+# Validator instance used by pool workers (set by _init_worker)
+_worker_validator = None
+
+
+def get_schema(schema_path):
+    """Return the compiled XMLSchema for schema_path, compiling it once per process."""
+    key = str(schema_path)
+    schema = _schema_cache.get(key)
+    if schema is None:
+        with open(schema_path, "rb") as xsd_file:
+            parser = lxml.etree.XMLParser()
+            xsd_doc = lxml.etree.parse(
+                xsd_file, parser=parser, base_url=str(schema_path)
+            )
+            schema = lxml.etree.XMLSchema(xsd_doc)
+        _schema_cache[key] = schema
+    return schema
+
+
+def content_hash(data):
+    """SHA-1 of a file's content, used as the memoization key."""
+    return hashlib.sha1(data).hexdigest()
+
+
+def memoized_result(owner, relative_path, data, compute):
+    """Return compute() for this file content, computing it once per process.
+
+    Args:
+        owner: Validator class (schema mappings differ between subclasses)
+        relative_path: Path of the file inside the package (selects the schema)
+        data: Raw file content
+        compute: Callable returning (is_valid, errors_set)
+    """
+    key = (owner.__name__, relative_path.as_posix(), content_hash(data))
+    result = _result_cache.get(key)
+    if result is None:
+        result = compute()
+        _result_cache[key] = result
+    return result
+
+
+def _init_worker(validator_class, unpacked_dir, original_file):
+    """Create the validator used by this worker process."""
+    global _worker_validator
+    _worker_validator = validator_class(unpacked_dir, original_file)
+
+
+def _validate_in_worker(xml_file):
+    return _worker_validator.validate_file_against_xsd(xml_file)
+
+
+def validate_files(validator, xml_files, jobs=None):
+    """Validate files against their XSD schemas, in parallel when worthwhile.
+
+    Args:
+        validator: BaseSchemaValidator instance (its class is rebuilt in workers)
+        xml_files: Files to validate
+        jobs: Number of worker processes (default: CPU count, 1 = in-process)
+
+    Returns:
+        list: validate_file_against_xsd() results, in the order of xml_files
+    """
+    xml_files = list(xml_files)
+    jobs = min(jobs or os.cpu_count() or 1, len(xml_files))
+
+    if jobs <= 1 or len(xml_files) < MIN_PARALLEL_FILES:
+        return [validator.validate_file_against_xsd(f) for f in xml_files]
+
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_worker,
+        initargs=(type(validator), validator.unpacked_dir, validator.original_file),
+    ) as executor:
+        chunksize = max(1, len(xml_files) // (jobs * 4))
+        return list(executor.map(_validate_in_worker, xml_files, chunksize=chunksize))
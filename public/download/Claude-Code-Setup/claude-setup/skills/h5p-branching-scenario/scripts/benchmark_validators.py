@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark de la validation du graphe (validators.py).
+
+Genere des scenarios de 10 a 5000 noeuds et mesure
+_validate_graph_reachability() et validate_preplan() complet. Sur les petites
+tailles, compare les avertissements a l'ancienne implementation recursive
+(has_path_to_end), qui est exponentielle sur les losanges et depasse la
+limite de recursion sur les longues chaines.
+
+Usage:
+  python benchmark_validators.py
+  python benchmark_validators.py --sizes 10,100,1000 --shape diamond --repeat 5
+
+Formes:
+  chain   : suite lineaire de noeuds texte
+  diamond : treillis de questions a deux branches qui se rejoignent
+  adaptive: parcours adaptatif avec retours en arriere et boucles sans issue
+"""
+import argparse
+import random
+import sys
+import time
+from collections import deque
+from typing import Dict, List, Set
+
+from validators import _validate_graph_reachability, analyze_graph, validate_preplan
+
+# Au-dela, l'ancienne implementation est trop lente ou depasse la recursion
+REFERENCE_MAX_NODES = {'chain': 500, 'diamond': 40, 'adaptive': 200}
+
+
+# ============================================================================
+# SCENARIOS
+# ============================================================================
+
+def _text(i: int, next_id: int) -> Dict:
+    return {'type': 'text', 'title': f'Etape {i}',
+            'content': f'<p>Contenu {i}</p>', 'nextContentId': next_id}
+
+
+def _question(i: int, nexts: List[int]) -> Dict:
+    return {'type': 'branching_question', 'title': f'Question {i}',
+            'question': f'<p>Choix {i} ?</p>',
+            'alternatives': [{'nextContentId': n, 'text': f'Option {k + 1}'}
+                             for k, n in enumerate(nexts)]}
+
+
+def generate_scenario(num_nodes: int, shape: str, seed: int) -> Dict:
+    """Preplan synthetique de num_nodes noeuds."""
+    rng = random.Random(seed)
+    nodes = []
+    if shape == 'chain':
+        for i in range(num_nodes):
+            nodes.append(_text(i, i + 1 if i + 1 < num_nodes else -1))
+    elif shape == 'diamond':
+        # question i -> (i+1, i+2) : chaque noeud est rejoint par deux chemins
+        for i in range(num_nodes):
+            if i + 2 < num_nodes:
+                nodes.append(_question(i, [i + 1, i + 2]))
+            else:
+                nodes.append(_text(i, -1))
+    else:
+        # Questions vers l'avant ou en arriere ; environ 5 % des noeuds
+        # forment de petites boucles sans sortie
+        trap = set(rng.sample(range(1, num_nodes), max(1, num_nodes // 20))) if num_nodes > 1 else set()
+        for i in range(num_nodes):
+            if i in trap:
+                nodes.append(_text(i, i))
+            elif i == num_nodes - 1 or rng.random() < 0.05:
+                nodes.append(_text(i, -1))
+            else:
+                forward = rng.randint(i + 1, min(num_nodes - 1, i + 10))
+                back = rng.randint(max(0, i - 10), i)
+                nodes.append(_question(i, [forward, back, rng.randint(0, num_nodes - 1)]))
+    return {'title': f'Benchmark {shape} {num_nodes}', 'nodes': nodes,
+            'endScreens': [{'title': 'Fin', 'text': 'Fin', 'score': 0}]}
+
+
+# ============================================================================
+# REFERENCE
+# ============================================================================
+
+def validate_graph_reachability_recursive(nodes: List[Dict], errors: List, warnings: List):
+    """Ancienne implementation (BFS + has_path_to_end recursif), pour comparaison."""
+    if not nodes:
+        return
+
+    n = len(nodes)
+
+    # Construire le graphe d'adjacence
+    adj: Dict[int, Set[int]] = {i: set() for i in range(n)}
+    for i, node in enumerate(nodes):
+        ntype = node.get('type', 'text')
+        if ntype == 'branching_question':
+            for alt in node.get('alternatives', []):
+                next_id = alt.get('nextContentId', -1)
+                if 0 <= next_id < n:
+                    adj[i].add(next_id)
+        else:
+            next_id = node.get('nextContentId', -1)
+            if 0 <= next_id < n:
+                adj[i].add(next_id)
+
+    # BFS depuis noeud 0
+    visited = set()
+    queue = deque([0])
+    visited.add(0)
+    while queue:
+        current = queue.popleft()
+        for neighbor in adj[current]:
+            if neighbor not in visited:
+                visited.add(neighbor)
+                queue.append(neighbor)
+
+    # Noeuds non atteignables
+    unreachable = set(range(n)) - visited
+    if unreachable:
+        for idx in sorted(unreachable):
+            node = nodes[idx]
+            warnings.append(
+                f"Noeud {idx} ({node.get('title', 'sans titre')}) "
+                f"n'est pas atteignable depuis le noeud 0")
+
+    # Vérifier que tous les chemins mènent à une fin (-1)
+    # DFS pour trouver les noeuds sans issue
+    def has_path_to_end(node_idx: int, path: Set[int]) -> bool:
+        if node_idx in path:
+            return False  # cycle
+        node = nodes[node_idx]
+        ntype = node.get('type', 'text')
+
+        if ntype == 'branching_question':
+            nexts = [alt.get('nextContentId', -1) for alt in node.get('alternatives', [])]
+        else:
+            nexts = [node.get('nextContentId', -1)]
+
+        for next_id in nexts:
+            if next_id == -1:
+                return True
+            if 0 <= next_id < n:
+                if has_path_to_end(next_id, path | {node_idx}):
+                    return True
+        return False
+
+    for idx in visited:
+        if not has_path_to_end(idx, set()):
+            node = nodes[idx]
+            warnings.append(
+                f"Noeud {idx} ({node.get('title', 'sans titre')}) "
+                f"ne mène vers aucune fin de scénario")
+
+
+# ============================================================================
+# MESURE
+# ============================================================================
+
+def best_time(func, repeat: int) -> float:
+    """Meilleur temps (secondes) sur repeat executions."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def graph_warnings(validate, nodes: List[Dict]) -> List[str]:
+    errors, warnings = [], []
+    validate(nodes, errors, warnings)
+    return warnings
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark de la validation du graphe des scenarios")
+    parser.add_argument('--sizes', default='10,50,100,500,1000,2000,5000',
+                        help="Nombres de noeuds, separes par des virgules")
+    parser.add_argument('--shape', choices=['chain', 'diamond', 'adaptive'],
+                        default='adaptive', help="Forme du scenario")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="Executions par taille (le meilleur temps est garde)")
+    parser.add_argument('--seed', type=int, default=0, help="Graine aleatoire")
+    args = parser.parse_args()
+
+    sizes = [int(n) for n in args.sizes.split(',') if n.strip()]
+
+    header = (f"{'noeuds':>7} {'sans issue':>10} {'boucles':>8} {'ancien ms':>10} "
+              f"{'graphe ms':>10} {'preplan ms':>11}")
+    print(header)
+    print('-' * len(header))
+
+    mismatches = 0
+    for num_nodes in sizes:
+        data = generate_scenario(num_nodes, args.shape, args.seed)
+        nodes = data['nodes']
+
+        found = graph_warnings(_validate_graph_reachability, nodes)
+        graph_time = best_time(lambda: graph_warnings(_validate_graph_reachability, nodes), args.repeat)
+        preplan_time = best_time(lambda: validate_preplan(data), args.repeat)
+
+        old_ms = '-'
+        if num_nodes <= REFERENCE_MAX_NODES[args.shape]:
+            expected = graph_warnings(validate_graph_reachability_recursive, nodes)
+            if found != expected:
+                mismatches += 1
+                print(f"DIFFERENCE avec {num_nodes} noeuds")
+            old_time = best_time(
+                lambda: graph_warnings(validate_graph_reachability_recursive, nodes), args.repeat)
+            old_ms = f"{old_time * 1000:.2f}"
+
+        graph = analyze_graph(nodes)
+        print(f"{num_nodes:>7} {len(graph['dead_ends']):>10} {len(graph['closed_cycles']):>8} "
+              f"{old_ms:>10} {graph_time * 1000:>10.2f} {preplan_time * 1000:>11.2f}")
+
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -14,8 +14,6 @@ Usage:
   python generate_branching.py --input preplan.json --validate
 """
 import json
-import zipfile
-import io
 import uuid
 import sys
 import argparse
@@ -28,9 +26,11 @@ from collections import deque
 # Import validation
 try:
     from validators import validate_preplan
+    from h5p_package import write_h5p
 except ImportError:
     sys.path.insert(0, str(Path(__file__).parent))
     from validators import validate_preplan
+    from h5p_package import write_h5p
 
 
 # ============================================================================
@@ -1141,14 +1141,8 @@ def generate_h5p(data: Dict, output_path: str) -> Tuple[str, Dict]:
     """Genere le fichier .h5p final et retourne le chemin + rapport."""
     content_json, h5p_json = build_branching_scenario(data)
 
-    buf = io.BytesIO()
-    with zipfile.ZipFile(buf, 'w', zipfile.ZIP_DEFLATED) as zf:
-        zf.writestr('h5p.json', json.dumps(h5p_json, ensure_ascii=False, indent=2))
-        zf.writestr('content/content.json', json.dumps(content_json, ensure_ascii=False, indent=2))
-
     Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-    with open(output_path, 'wb') as f:
-        f.write(buf.getvalue())
+    write_h5p(output_path, h5p_json, content_json)
 
     report = generate_assembly_report(data, output_path)
 
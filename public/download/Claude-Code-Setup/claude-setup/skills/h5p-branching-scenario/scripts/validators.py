@@ -6,12 +6,15 @@ Validation extraite et enrichie :
 - validate_preplan() : validation complete (erreurs bloquantes + warnings)
 - Validators par type de noeud
 - Coherence du scoring
-- Accessibilite du graphe (BFS)
+- Accessibilite du graphe (BFS, passe inverse depuis les fins, SCC)
 - Detection LaTeX dans zones interactives
 
 Usage:
   from validators import validate_preplan
   errors, warnings = validate_preplan(data)
+
+  from validators import analyze_graph
+  graph = analyze_graph(data['nodes'])   # noeuds sans issue, boucles fermees
 """
 import re
 from typing import Dict, List, Tuple, Any, Set
@@ -522,27 +525,76 @@ def _validate_french_accents(data: Dict, warnings: List):
                     f"remplacer par '{correct}'")
 
 
-def _validate_graph_reachability(nodes: List[Dict], errors: List, warnings: List):
-    """BFS depuis noeud 0 : vérifie que tous les noeuds sont atteignables
-    et que tous les chemins mènent à une fin."""
-    if not nodes:
-        return
-
+def _graph_successors(nodes: List[Dict]) -> Tuple[List[Set[int]], List[bool]]:
+    """Successeurs de chaque noeud et présence d'une sortie vers la fin (-1)."""
     n = len(nodes)
-
-    # Construire le graphe d'adjacence
-    adj: Dict[int, Set[int]] = {i: set() for i in range(n)}
-    for i, node in enumerate(nodes):
+    successors: List[Set[int]] = []
+    exits: List[bool] = []
+    for node in nodes:
         ntype = node.get('type', 'text')
         if ntype == 'branching_question':
-            for alt in node.get('alternatives', []):
-                next_id = alt.get('nextContentId', -1)
-                if 0 <= next_id < n:
-                    adj[i].add(next_id)
+            nexts = [alt.get('nextContentId', -1) for alt in node.get('alternatives', [])]
         else:
-            next_id = node.get('nextContentId', -1)
-            if 0 <= next_id < n:
-                adj[i].add(next_id)
+            nexts = [node.get('nextContentId', -1)]
+        successors.append({next_id for next_id in nexts if 0 <= next_id < n})
+        exits.append(any(next_id == -1 for next_id in nexts))
+    return successors, exits
+
+
+def _strongly_connected_components(successors: List[Set[int]]) -> List[List[int]]:
+    """Composantes fortement connexes (Tarjan itératif, sans récursion)."""
+    successors = [sorted(nexts) for nexts in successors]
+    n = len(successors)
+    index = [-1] * n
+    low = [0] * n
+    on_stack = [False] * n
+    stack: List[int] = []
+    components: List[List[int]] = []
+    counter = 0
+
+    for root in range(n):
+        if index[root] != -1:
+            continue
+        work = [(root, 0)]
+        while work:
+            v, i = work.pop()
+            if i == 0:
+                index[v] = low[v] = counter
+                counter += 1
+                stack.append(v)
+                on_stack[v] = True
+            recurse = False
+            while i < len(successors[v]):
+                w = successors[v][i]
+                i += 1
+                if index[w] == -1:
+                    work.append((v, i))
+                    work.append((w, 0))
+                    recurse = True
+                    break
+                if on_stack[w]:
+                    low[v] = min(low[v], index[w])
+            if recurse:
+                continue
+            if low[v] == index[v]:
+                component = []
+                while True:
+                    w = stack.pop()
+                    on_stack[w] = False
+                    component.append(w)
+                    if w == v:
+                        break
+                components.append(sorted(component))
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[v])
+    return components
+
+
+def _scan_graph(nodes: List[Dict]) -> Tuple[List[Set[int]], Set[int], List[bool]]:
+    """Successeurs, noeuds atteignables depuis 0 et noeuds menant à une fin."""
+    n = len(nodes)
+    successors, exits = _graph_successors(nodes)
 
     # BFS depuis noeud 0
     visited = set()
@@ -550,44 +602,79 @@ def _validate_graph_reachability(nodes: List[Dict], errors: List, warnings: List
     visited.add(0)
     while queue:
         current = queue.popleft()
-        for neighbor in adj[current]:
+        for neighbor in successors[current]:
             if neighbor not in visited:
                 visited.add(neighbor)
                 queue.append(neighbor)
 
-    # Noeuds non atteignables
-    unreachable = set(range(n)) - visited
-    if unreachable:
-        for idx in sorted(unreachable):
-            node = nodes[idx]
-            warnings.append(
-                f"Noeud {idx} ({node.get('title', 'sans titre')}) "
-                f"n'est pas atteignable depuis le noeud 0")
-
-    # Vérifier que tous les chemins mènent à une fin (-1)
-    # DFS pour trouver les noeuds sans issue
-    def has_path_to_end(node_idx: int, path: Set[int]) -> bool:
-        if node_idx in path:
-            return False  # cycle
-        node = nodes[node_idx]
-        ntype = node.get('type', 'text')
+    # Passe inverse depuis les noeuds ayant une sortie -1 :
+    # un noeud mène à une fin s'il atteint l'un d'eux
+    predecessors: List[List[int]] = [[] for _ in range(n)]
+    for i, nexts in enumerate(successors):
+        for next_id in nexts:
+            predecessors[next_id].append(i)
+    can_end = list(exits)
+    queue = deque(i for i in range(n) if exits[i])
+    while queue:
+        current = queue.popleft()
+        for previous in predecessors[current]:
+            if not can_end[previous]:
+                can_end[previous] = True
+                queue.append(previous)
 
-        if ntype == 'branching_question':
-            nexts = [alt.get('nextContentId', -1) for alt in node.get('alternatives', [])]
-        else:
-            nexts = [node.get('nextContentId', -1)]
+    return successors, visited, can_end
 
-        for next_id in nexts:
-            if next_id == -1:
-                return True
-            if 0 <= next_id < n:
-                if has_path_to_end(next_id, path | {node_idx}):
-                    return True
-        return False
 
+def analyze_graph(nodes: List[Dict]) -> Dict[str, Any]:
+    """Analyse le graphe du scénario en temps linéaire.
+
+    Retourne :
+      reachable     : noeuds atteignables depuis le noeud 0 (triés)
+      unreachable   : noeuds non atteignables (triés)
+      dead_ends     : noeuds atteignables sans chemin vers une fin (triés)
+      closed_cycles : boucles sans sortie vers une fin (listes de noeuds)
+    """
+    n = len(nodes)
+    if not n:
+        return {'reachable': [], 'unreachable': [], 'dead_ends': [], 'closed_cycles': []}
+
+    successors, visited, can_end = _scan_graph(nodes)
+
+    closed_cycles = [
+        component for component in _strongly_connected_components(successors)
+        if not can_end[component[0]]
+        and (len(component) > 1 or component[0] in successors[component[0]])
+    ]
+
+    return {
+        'reachable': sorted(visited),
+        'unreachable': sorted(set(range(n)) - visited),
+        'dead_ends': sorted(i for i in visited if not can_end[i]),
+        'closed_cycles': sorted(closed_cycles),
+    }
+
+
+def _validate_graph_reachability(nodes: List[Dict], errors: List, warnings: List):
+    """BFS depuis noeud 0 : vérifie que tous les noeuds sont atteignables
+    et que tous les chemins mènent à une fin (voir analyze_graph)."""
+    if not nodes:
+        return
+
+    n = len(nodes)
+    successors, visited, can_end = _scan_graph(nodes)
+
+    # Noeuds non atteignables
+    for idx in sorted(set(range(n)) - visited):
+        node = nodes[idx]
+        warnings.append(
+            f"Noeud {idx} ({node.get('title', 'sans titre')}) "
+            f"n'est pas atteignable depuis le noeud 0")
+
+    # Noeuds sans issue (aucun chemin vers une fin -1)
     for idx in visited:
-        if not has_path_to_end(idx, set()):
-            node = nodes[idx]
-            warnings.append(
-                f"Noeud {idx} ({node.get('title', 'sans titre')}) "
-                f"ne mène vers aucune fin de scénario")
+        if can_end[idx]:
+            continue
+        node = nodes[idx]
+        warnings.append(
+            f"Noeud {idx} ({node.get('title', 'sans titre')}) "
+            f"ne mène vers aucune fin de scénario")
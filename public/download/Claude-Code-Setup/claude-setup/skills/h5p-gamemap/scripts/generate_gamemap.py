@@ -11,8 +11,6 @@ Usage:
   python generate_gamemap.py --json config.json --output parcours.h5p
 """
 import json
-import zipfile
-import io
 import uuid
 import random
 import argparse
@@ -22,10 +20,12 @@ from typing import Dict, List, Any, Optional
 # Import du parser
 try:
     from parse_preplan import parse_preplan, validate_preplan
+    from h5p_package import write_h5p
 except ImportError:
     import sys
     sys.path.insert(0, str(Path(__file__).parent))
     from parse_preplan import parse_preplan, validate_preplan
+    from h5p_package import write_h5p
 
 
 # ============================================================================
@@ -777,11 +777,10 @@ def generate_h5p(data: Dict, output_path: str, background_path: Optional[str] =
 
     content_json, h5p_json = build_gamemap(data, background_path)
 
-    # Lire l'image de fond
+    # Image de fond (recopiée depuis le disque au moment de l'écriture)
     image_data = None
     if background_path and Path(background_path).exists():
-        with open(background_path, 'rb') as f:
-            image_data = f.read()
+        image_data = Path(background_path)
     else:
         # Image par défaut (1x1 pixel transparent)
         import base64
@@ -789,16 +788,9 @@ def generate_h5p(data: Dict, output_path: str, background_path: Optional[str] =
             'iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=='
         )
 
-    # Créer le ZIP
-    buf = io.BytesIO()
-    with zipfile.ZipFile(buf, 'w', zipfile.ZIP_DEFLATED) as zf:
-        zf.writestr('h5p.json', json.dumps(h5p_json, ensure_ascii=False, indent=2))
-        zf.writestr('content/content.json', json.dumps(content_json, ensure_ascii=False, indent=2))
-        zf.writestr('content/images/background.png', image_data)
-
-    # Écrire le fichier
-    with open(output_path, 'wb') as f:
-        f.write(buf.getvalue())
+    # Écrire le ZIP directement dans le fichier
+    write_h5p(output_path, h5p_json, content_json,
+              media={'content/images/background.png': image_data})
 
     return output_path
 
@@ -2,6 +2,7 @@
 """
 Compile un projet cours HTML/KaTeX en fichier unique autonome.
 Usage: python compile_project.py <chemin_projet> [--output nom_fichier.html] [--no-vocabulary] [--no-theme-switcher]
+                                  [--no-tikz-cache] [--no-tikz-batch] [--tikz-jobs N]
 
 Le script :
 1. Lit config.json (niveau, theme, univers, parts_order)
@@ -96,7 +97,9 @@ def filter_vocabulary_by_niveau(vocabulary: dict, niveau: str) -> dict:
     }
 
 def compile_project(project_path: str, output_name: str = None,
-                   enable_vocabulary: bool = True, enable_theme_switcher: bool = True):
+                   enable_vocabulary: bool = True, enable_theme_switcher: bool = True,
+                   tikz_cache: bool = True, tikz_jobs: int = None,
+                   tikz_batch: bool = True):
     """Compile le projet en fichier HTML unique."""
 
     project = Path(project_path)
@@ -221,7 +224,9 @@ def compile_project(project_path: str, output_name: str = None,
 
     if tikz_file.exists() and TIKZ_AVAILABLE:
         print(f"  TikZ: Compilation des figures depuis {tikz_file.relative_to(project)}...")
-        tikz_figures = compile_all_figures(tikz_file, use_base64=True)
+        tikz_figures = compile_all_figures(tikz_file, use_base64=True,
+                                           use_cache=tikz_cache, jobs=tikz_jobs,
+                                           batch=tikz_batch)
         print(f"  TikZ: {len(tikz_figures)} figures compilées")
     elif tikz_file.exists() and not TIKZ_AVAILABLE:
         print(f"  TikZ: ATTENTION - fichier figures.tikz trouvé mais tikz_compiler non disponible")
@@ -382,6 +387,9 @@ def main():
     parser.add_argument("--output", "-o", help="Nom du fichier de sortie")
     parser.add_argument("--no-vocabulary", action="store_true", help="Désactiver les infobulles de vocabulaire")
     parser.add_argument("--no-theme-switcher", action="store_true", help="Désactiver le sélecteur de thème")
+    parser.add_argument("--no-tikz-cache", action="store_true", help="Recompiler toutes les figures TikZ")
+    parser.add_argument("--no-tikz-batch", action="store_true", help="Compiler les figures TikZ une par une (pas de document groupé)")
+    parser.add_argument("--tikz-jobs", type=int, help="Compilations TikZ en parallèle (défaut: nombre de CPU)")
 
     args = parser.parse_args()
 
@@ -389,7 +397,10 @@ def main():
         args.project_path,
         args.output,
         not args.no_vocabulary,
-        not args.no_theme_switcher
+        not args.no_theme_switcher,
+        not args.no_tikz_cache,
+        args.tikz_jobs,
+        not args.no_tikz_batch
     )
 
 if __name__ == "__main__":
@@ -4,9 +4,14 @@ Compilateur TikZ vers SVG base64 pour les cours HTML/KaTeX.
 
 Workflow:
 1. Lit un fichier figures.tikz contenant plusieurs figures nommées
-2. Compile chaque figure individuellement dans un dossier temporaire
-3. Convertit PDF → SVG via dvisvgm ou pdf2svg
-4. Encode en base64 pour insertion inline dans le HTML
+2. Réutilise les SVG déjà compilés (cache .tikz-cache/ à côté du fichier,
+   clé = préambule + code de la figure + versions de la chaîne TeX)
+3. Compile les figures restantes en un seul document standalone multi-pages
+   (un seul démarrage de pdflatex), puis découpe les pages en SVG
+   (dvisvgm --page=1- ou pdf2svg ... all)
+4. Les figures en erreur dans le lot sont recompilées une par une, en
+   parallèle (au plus autant de processus que de CPU), pour isoler l'erreur
+5. Encode en base64 pour insertion inline dans le HTML
 
 Format du fichier figures.tikz:
 ```
@@ -26,11 +31,14 @@ import os
 import re
 import sys
 import base64
+import hashlib
 import tempfile
 import subprocess
 import shutil
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 # Préambule LaTeX standard pour les figures
 TIKZ_PREAMBLE = r"""
@@ -82,6 +90,27 @@ TIKZ_POSTAMBLE = r"""
 \end{document}
 """
 
+# Dossier du cache SVG (créé à côté du fichier figures.tikz)
+CACHE_DIR_NAME = ".tikz-cache"
+
+# Mode lot : une page par environnement tikzfigure au lieu d'une par tikzpicture,
+# pour qu'une figure contenant plusieurs tikzpicture reste sur une seule page.
+TIKZ_BATCH_PREAMBLE = TIKZ_PREAMBLE.replace(
+    r"\documentclass[tikz,border=2pt]{standalone}",
+    r"\documentclass[multi,border=2pt]{standalone}"
+).replace(
+    r"\begin{document}",
+    "\\newenvironment{tikzfigure}{}{}\n\\standaloneenv{tikzfigure}\n"
+    # Pages déjà produites, écrit dans les marqueurs du log (compteur du noyau
+    # LaTeX depuis 2020, sinon compteur de page)
+    "\\newcommand{\\tikzbatchshipped}{\\ifdefined\\ReadonlyShipoutCounter"
+    "\\the\\ReadonlyShipoutCounter\\else\\the\\numexpr\\value{page}-1\\relax\\fi}\n"
+    "\n\\begin{document}"
+)
+
+# Marqueurs écrits dans le log pour rattacher les erreurs à une figure
+BATCH_MARKER = "TIKZBATCH"
+
 
 def parse_tikz_file(tikz_path: Path) -> Dict[str, str]:
     """
@@ -214,13 +243,250 @@ def svg_to_inline(svg_content: str, figure_name: str) -> str:
     return svg_content
 
 
-def compile_all_figures(tikz_path: Path, use_base64: bool = True) -> Dict[str, str]:
+@lru_cache(maxsize=None)
+def toolchain_version() -> str:
+    """
+    Versions de pdflatex, dvisvgm et pdf2svg (première ligne de --version).
+    Fait partie de la clé de cache : une mise à jour de TeX invalide le cache.
+    """
+    versions = []
+    for tool in ('pdflatex', 'dvisvgm', 'pdf2svg'):
+        try:
+            result = subprocess.run([tool, '--version'], capture_output=True, timeout=10)
+            output = (result.stdout or result.stderr).decode('utf-8', errors='ignore')
+            first_line = output.strip().splitlines()[0] if output.strip() else 'present'
+            versions.append(f"{tool}: {first_line}")
+        except (FileNotFoundError, subprocess.TimeoutExpired):
+            versions.append(f"{tool}: absent")
+    return "\n".join(versions)
+
+
+def figure_cache_key(tikz_code: str, preamble: str = TIKZ_PREAMBLE) -> str:
+    """
+    Clé de cache d'une figure : préambule + code + versions des outils.
+    preamble est celui du document qui a produit le SVG (TIKZ_BATCH_PREAMBLE
+    pour une figure issue de la compilation groupée).
+    """
+    h = hashlib.sha256()
+    for part in (preamble, tikz_code, TIKZ_POSTAMBLE, toolchain_version()):
+        h.update(part.encode('utf-8'))
+        h.update(b'\0')
+    return h.hexdigest()
+
+
+def read_cached_svg(cache_dir: Path, key: str) -> Optional[str]:
+    """Retourne le SVG en cache pour cette clé, ou None."""
+    cached = cache_dir / f"{key}.svg"
+    if cached.exists():
+        return cached.read_text(encoding='utf-8')
+    return None
+
+
+def write_cached_svg(cache_dir: Path, key: str, svg_content: str):
+    """Enregistre un SVG compilé dans le cache (écriture atomique)."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp_file = cache_dir / f"{key}.svg.tmp"
+    tmp_file.write_text(svg_content, encoding='utf-8')
+    tmp_file.replace(cache_dir / f"{key}.svg")
+
+
+def _compile_figure_job(name: str, code: str, temp_root: str) -> Tuple[str, Optional[str]]:
+    """Compile une figure dans son propre sous-dossier (exécuté dans un processus)."""
+    figure_dir = Path(temp_root) / name
+    figure_dir.mkdir(parents=True, exist_ok=True)
+    return name, compile_tikz_to_svg(code, name, figure_dir)
+
+
+def compile_figures_svg(figures: Dict[str, str], jobs: Optional[int] = None) -> Dict[str, Optional[str]]:
+    """
+    Compile des figures en SVG, en parallèle si plusieurs figures.
+
+    Args:
+        figures: Dict[nom_figure, code_tikz]
+        jobs: Nombre de processus (défaut: nombre de CPU, 1 = séquentiel)
+
+    Returns:
+        Dict[nom_figure, svg ou None si échec]
+    """
+    if not figures:
+        return {}
+
+    max_workers = min(len(figures), jobs or os.cpu_count() or 1)
+    results = {}
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if max_workers <= 1:
+            for name, code in figures.items():
+                _, svg_content = _compile_figure_job(name, code, temp_dir)
+                results[name] = svg_content
+                print(f"    Compilation: {name}... {'OK' if svg_content else 'ERREUR'}")
+            return results
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(_compile_figure_job, name, code, temp_dir)
+                for name, code in figures.items()
+            ]
+            for future in as_completed(futures):
+                name, svg_content = future.result()
+                results[name] = svg_content
+                print(f"    Compilation: {name}... {'OK' if svg_content else 'ERREUR'}")
+
+    return results
+
+
+def _first_failed_figure(log_text: str) -> Optional[int]:
+    """
+    Indice de la première figure dont le log contient une erreur LaTeX
+    (ligne commençant par '!'), None si aucune erreur.
+    Une erreur hors des marqueurs (préambule) renvoie 0.
+    """
+    current = None
+    for line in log_text.splitlines():
+        marker = re.match(rf'{BATCH_MARKER}:(BEGIN|END):(\d+):', line)
+        if marker:
+            current = int(marker.group(2)) if marker.group(1) == 'BEGIN' else None
+            continue
+        if line.startswith('!'):
+            return current if current is not None else 0
+    return None
+
+
+def _figure_pages(log_text: str) -> Dict[int, int]:
+    """
+    Page de chaque figure d'après les marqueurs du log : {indice: page}.
+
+    Les marqueurs portent le nombre de pages déjà produites ; seules les
+    figures qui ont produit exactement une page sont retenues.
+    """
+    begins: Dict[int, int] = {}
+    pages: Dict[int, int] = {}
+    for line in log_text.splitlines():
+        marker = re.match(rf'{BATCH_MARKER}:(BEGIN|END):(\d+):(\d+)', line)
+        if not marker:
+            continue
+        index, page = int(marker.group(2)), int(marker.group(3))
+        if marker.group(1) == 'BEGIN':
+            begins[index] = page
+        elif index in begins and page == begins[index] + 1:
+            pages[index] = page
+    return pages
+
+
+def _split_pdf_pages_to_svg(pdf_file: Path, temp_dir: Path) -> Dict[int, str]:
+    """Convertit chaque page d'un PDF en SVG. Retourne Dict[numéro_page, svg]."""
+    stem = pdf_file.stem
+    try:
+        subprocess.run(
+            ['dvisvgm', '--pdf', '--no-fonts', '--page=1-', '-o', f'{stem}-page-%p.svg', pdf_file.name],
+            cwd=temp_dir,
+            capture_output=True,
+            timeout=120
+        )
+    except FileNotFoundError:
+        pass
+
+    pages = sorted(temp_dir.glob(f'{stem}-page-*.svg'))
+    if not pages:
+        try:
+            subprocess.run(
+                ['pdf2svg', pdf_file.name, f'{stem}-page-%d.svg', 'all'],
+                cwd=temp_dir,
+                capture_output=True,
+                timeout=120
+            )
+        except FileNotFoundError:
+            print(f"  [ERREUR] Ni dvisvgm ni pdf2svg trouvé.")
+            return {}
+        pages = sorted(temp_dir.glob(f'{stem}-page-*.svg'))
+
+    svgs = {}
+    for page in pages:
+        number = re.search(r'-page-(\d+)\.svg$', page.name)
+        if number:
+            svgs[int(number.group(1))] = page.read_text(encoding='utf-8')
+    return svgs
+
+
+def compile_tikz_batch(figures: Dict[str, str], temp_dir: Path) -> Dict[str, Optional[str]]:
+    """
+    Compile plusieurs figures en un seul document standalone multi-pages
+    (un seul démarrage de pdflatex), puis découpe chaque page en SVG.
+
+    Les figures situées avant la première erreur sont conservées ; la figure
+    en erreur et les suivantes sont absentes du résultat (à recompiler une par
+    une pour isoler l'erreur). Chaque figure est rattachée à sa page par les
+    marqueurs du log, avec ou sans erreur : une figure sans page, ou qui en a
+    produit plusieurs, est aussi absente du résultat.
+
+    Returns:
+        Dict[nom_figure, svg] pour les figures compilées avec succès
+    """
+    names = list(figures)
+    tex_file = temp_dir / "batch.tex"
+    pdf_file = temp_dir / "batch.pdf"
+    log_file = temp_dir / "batch.log"
+
+    body = []
+    for i, name in enumerate(names):
+        body.append(f"% FIGURE: {name}\n\\typeout{{{BATCH_MARKER}:BEGIN:{i}:\\tikzbatchshipped}}\n"
+                    f"\\begin{{tikzfigure}}\n{figures[name]}\n\\end{{tikzfigure}}\n"
+                    f"\\typeout{{{BATCH_MARKER}:END:{i}:\\tikzbatchshipped}}\n")
+    tex_file.write_text(TIKZ_BATCH_PREAMBLE + "\n".join(body) + TIKZ_POSTAMBLE, encoding='utf-8')
+
+    # Sans -halt-on-error : les figures précédant une erreur restent exploitables
+    try:
+        subprocess.run(
+            ['pdflatex', '-interaction=nonstopmode', tex_file.name],
+            cwd=temp_dir,
+            capture_output=True,
+            timeout=30 + 5 * len(names)
+        )
+    except subprocess.TimeoutExpired:
+        print(f"  [ERREUR] Timeout lors de la compilation groupée")
+        return {}
+    except FileNotFoundError:
+        print(f"  [ERREUR] pdflatex non trouvé. Installez MiKTeX ou TeX Live.")
+        return {}
+
+    log_text = log_file.read_text(encoding='utf-8', errors='ignore') if log_file.exists() else ""
+    failed = _first_failed_figure(log_text)
+    valid_count = len(names) if failed is None else failed
+
+    if failed is not None:
+        print(f"  [ERREUR] Compilation groupée : erreur dans la figure {names[failed]}")
+    if not pdf_file.exists() or valid_count == 0:
+        return {}
+
+    pages = _split_pdf_pages_to_svg(pdf_file, temp_dir)
+    figure_pages = _figure_pages(log_text)
+
+    results = {}
+    for i in range(valid_count):
+        page = figure_pages.get(i)
+        if page is None or page not in pages:
+            # Correspondance page/figure incertaine : figure recompilée séparément
+            print(f"  [ERREUR] Compilation groupée : page introuvable pour la figure {names[i]}")
+            continue
+        results[names[i]] = pages[page]
+    return results
+
+
+def compile_all_figures(tikz_path: Path, use_base64: bool = True,
+                        use_cache: bool = True, jobs: Optional[int] = None,
+                        cache_dir: Optional[Path] = None, batch: bool = True) -> Dict[str, str]:
     """
     Compile toutes les figures d'un fichier .tikz.
 
     Args:
         tikz_path: Chemin vers le fichier figures.tikz
         use_base64: Si True, retourne des <img> base64, sinon SVG inline
+        use_cache: Si True, réutilise les SVG déjà compilés
+        jobs: Nombre de processus de compilation (défaut: nombre de CPU)
+        cache_dir: Dossier du cache (défaut: .tikz-cache/ à côté du fichier)
+        batch: Si True, compile les figures non cachées en un seul document
+            LaTeX multi-pages ; les figures en échec sont recompilées
+            séparément pour isoler l'erreur
 
     Returns:
         Dict[nom_figure, html_code]
@@ -232,27 +498,55 @@ def compile_all_figures(tikz_path: Path, use_base64: bool = True) -> Dict[str, s
 
     print(f"  Figures TikZ: {len(figures)} trouvées")
 
+    if cache_dir is None:
+        cache_dir = tikz_path.parent / CACHE_DIR_NAME
+
+    # Séparer les figures déjà en cache des figures à compiler. Un SVG compilé
+    # seul convient toujours ; un SVG issu du lot seulement en mode lot.
+    svgs: Dict[str, Optional[str]] = {}
+    to_compile: Dict[str, str] = {}
+
+    for name, code in figures.items():
+        if use_cache:
+            svgs[name] = read_cached_svg(cache_dir, figure_cache_key(code))
+            if svgs[name] is None and batch:
+                svgs[name] = read_cached_svg(cache_dir, figure_cache_key(code, TIKZ_BATCH_PREAMBLE))
+            if svgs[name] is not None:
+                continue
+        to_compile[name] = code
+
+    if use_cache:
+        print(f"  Cache TikZ: {len(figures) - len(to_compile)} en cache, {len(to_compile)} à compiler")
+
+    batch_svgs: Dict[str, Optional[str]] = {}
+    if batch and len(to_compile) > 1:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            batch_svgs = compile_tikz_batch(to_compile, Path(temp_dir))
+        print(f"  Compilation groupée: {len(batch_svgs)}/{len(to_compile)} figures")
+
+    # Figures non produites par le lot : compilation séparée (parallèle)
+    remaining = {name: code for name, code in to_compile.items() if name not in batch_svgs}
+    separate_svgs = compile_figures_svg(remaining, jobs)
+
+    # Chaque SVG est mis en cache sous la clé du préambule qui l'a produit
+    for compiled_svgs, preamble in ((batch_svgs, TIKZ_BATCH_PREAMBLE), (separate_svgs, TIKZ_PREAMBLE)):
+        for name, svg_content in compiled_svgs.items():
+            svgs[name] = svg_content
+            if svg_content and use_cache:
+                write_cached_svg(cache_dir, figure_cache_key(to_compile[name], preamble), svg_content)
+
+    # Conserver l'ordre du fichier figures.tikz
     compiled = {}
-
-    # Créer un dossier temporaire pour les compilations
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_path = Path(temp_dir)
-
-        for name, code in figures.items():
-            print(f"    Compilation: {name}...", end=" ")
-
-            svg_content = compile_tikz_to_svg(code, name, temp_path)
-
-            if svg_content:
-                if use_base64:
-                    compiled[name] = svg_to_base64_img(svg_content, name)
-                else:
-                    compiled[name] = svg_to_inline(svg_content, name)
-                print("OK")
+    for name in figures:
+        svg_content = svgs.get(name)
+        if svg_content:
+            if use_base64:
+                compiled[name] = svg_to_base64_img(svg_content, name)
             else:
-                # Placeholder en cas d'échec
-                compiled[name] = f'<div class="tikz-error">[Figure {name} : erreur de compilation]</div>'
-                print("ERREUR")
+                compiled[name] = svg_to_inline(svg_content, name)
+        else:
+            # Placeholder en cas d'échec
+            compiled[name] = f'<div class="tikz-error">[Figure {name} : erreur de compilation]</div>'
 
     return compiled
 
@@ -274,18 +568,26 @@ def replace_placeholders(html_content: str, figures: Dict[str, str]) -> str:
 # === Point d'entrée CLI ===
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        print("Usage: python tikz_compiler.py <fichier.tikz> [--inline]")
-        print("  --inline : SVG inline au lieu de base64 (défaut: base64)")
+        print("Usage: python tikz_compiler.py <fichier.tikz> [--inline] [--no-cache] [--no-batch] [--jobs N]")
+        print("  --inline   : SVG inline au lieu de base64 (défaut: base64)")
+        print("  --no-cache : recompiler toutes les figures (ignore .tikz-cache/)")
+        print("  --no-batch : une compilation pdflatex par figure (pas de document groupé)")
+        print("  --jobs N   : nombre de compilations en parallèle (défaut: nombre de CPU)")
         sys.exit(1)
 
     tikz_file = Path(sys.argv[1])
     use_base64 = "--inline" not in sys.argv
+    use_cache = "--no-cache" not in sys.argv
+    batch = "--no-batch" not in sys.argv
+    jobs = None
+    if "--jobs" in sys.argv:
+        jobs = int(sys.argv[sys.argv.index("--jobs") + 1])
 
     if not tikz_file.exists():
         print(f"Fichier non trouvé: {tikz_file}")
         sys.exit(1)
 
-    figures = compile_all_figures(tikz_file, use_base64)
+    figures = compile_all_figures(tikz_file, use_base64, use_cache=use_cache, jobs=jobs, batch=batch)
 
     print(f"\nFigures compilées: {len(figures)}")
     for name in figures:
@@ -15,15 +15,25 @@ Usage:
 Options:
     -m, --minify     Minifie le CSS et JS (retire commentaires, espaces inutiles)
     -w, --watch      Mode surveillance: rebuild automatique si fichier modifié
+    --poll           Mode surveillance par scrutation (sans inotify)
     -o, --output     Chemin du fichier de sortie
     -h, --help       Affiche cette aide
+
+Le mode surveillance utilise inotify sous Linux (aucune activité au repos)
+et une scrutation des dates de modification ailleurs. Chaque rebuild ne
+re-minifie que les fichiers dont le contenu a changé.
 """
 
 import os
 import sys
 import re
 import time
+import select
+import struct
+import hashlib
 import argparse
+import ctypes
+import ctypes.util
 from pathlib import Path
 from datetime import datetime
 
@@ -70,6 +80,50 @@ def minify_js(js: str) -> str:
     return js
 
 
+class MinifyCache:
+    """
+    Sorties minifiées par fichier, indexées par le hash de leur contenu.
+
+    Utilisé par le mode surveillance: un rebuild ne re-minifie que les
+    fichiers modifiés et réutilise le résultat pour tous les autres.
+    """
+
+    def __init__(self):
+        self.entries = {}
+        self.used = set()
+        self.hits = 0
+        self.misses = 0
+
+    def minify(self, content: str, minifier) -> str:
+        key = (minifier.__name__, hashlib.sha1(content.encode('utf-8')).hexdigest())
+        self.used.add(key)
+        result = self.entries.get(key)
+        if result is None:
+            result = minifier(content)
+            self.entries[key] = result
+            self.misses += 1
+        else:
+            self.hits += 1
+        return result
+
+    def start_build(self):
+        """Remet les compteurs à zéro avant un build."""
+        self.used = set()
+        self.hits = 0
+        self.misses = 0
+
+    def prune(self):
+        """Oublie les versions qui n'ont pas servi au dernier build."""
+        self.entries = {k: v for k, v in self.entries.items() if k in self.used}
+
+
+def minify_content(content: str, minifier, cache: MinifyCache = None) -> str:
+    """Applique minifier, via le cache s'il est fourni."""
+    if cache is None:
+        return minifier(content)
+    return cache.minify(content, minifier)
+
+
 def collect_css_files(base_path: Path) -> list:
     """Collecte tous les fichiers CSS dans l'ordre."""
     css_dir = base_path / 'css'
@@ -190,7 +244,8 @@ def extract_html_body(html_content: str) -> dict:
     return result
 
 
-def build_monolith(base_path: Path, output_path: Path, minify: bool = False) -> bool:
+def build_monolith(base_path: Path, output_path: Path, minify: bool = False,
+                   cache: MinifyCache = None) -> bool:
     """
     Construit le fichier HTML monolithique.
 
@@ -198,10 +253,15 @@ def build_monolith(base_path: Path, output_path: Path, minify: bool = False) ->
         base_path: Chemin vers le dossier de l'animation
         output_path: Chemin du fichier de sortie
         minify: Si True, minifie le CSS et JS
+        cache: Cache des fichiers minifiés (build incrémental du mode surveillance)
 
     Returns:
         True si succès, False sinon
     """
+    start_time = time.perf_counter()
+    if cache is not None:
+        cache.start_build()
+
     print(f"\n{'='*60}")
     print(f"BUILD MONOLITH - {datetime.now().strftime('%H:%M:%S')}")
     print(f"{'='*60}")
@@ -229,7 +289,7 @@ def build_monolith(base_path: Path, output_path: Path, minify: bool = False) ->
         content = read_file(filepath)
         if content:
             css_content.append(f"/* === {filepath.name} === */")
-            css_content.append(minify_css(content) if minify else content)
+            css_content.append(minify_content(content, minify_css, cache) if minify else content)
             print(f"  + {filepath.name}")
 
     all_css = '\n\n'.join(css_content)
@@ -243,7 +303,7 @@ def build_monolith(base_path: Path, output_path: Path, minify: bool = False) ->
         content = read_file(filepath)
         if content:
             js_content.append(f"// === {filepath.name} ===")
-            js_content.append(minify_js(content) if minify else content)
+            js_content.append(minify_content(content, minify_js, cache) if minify else content)
             print(f"  + {filepath.name}")
 
     all_js = '\n\n'.join(js_content)
@@ -279,45 +339,196 @@ def build_monolith(base_path: Path, output_path: Path, minify: bool = False) ->
         file_size = output_path.stat().st_size
         print(f"\n[SUCCÈS] Fichier généré: {output_path}")
         print(f"         Taille: {file_size / 1024:.1f} Ko")
+        if cache is not None:
+            elapsed_ms = (time.perf_counter() - start_time) * 1000
+            if minify:
+                print(f"         Minifiés: {cache.misses}, réutilisés: {cache.hits}")
+                cache.prune()
+            print(f"         Durée: {elapsed_ms:.0f} ms")
         return True
     except Exception as e:
         print(f"\n[ERREUR] Impossible d'écrire {output_path}: {e}")
         return False
 
 
-def watch_mode(base_path: Path, output_path: Path, minify: bool = False):
-    """
-    Mode surveillance: rebuild automatique quand un fichier change.
-    """
-    print("\n[WATCH] Mode surveillance activé. Ctrl+C pour arrêter.")
+# ============================================================================
+# SURVEILLANCE DES FICHIERS
+# ============================================================================
+
+# Attente après un changement, pour regrouper les écritures d'une même sauvegarde
+DEBOUNCE_SECONDS = 0.05
 
-    last_mtime = 0
 
-    while True:
+def is_source_path(base_path: Path, path: Path) -> bool:
+    """True si path est une source du build (ou un dossier qui en contient)."""
+    try:
+        parts = path.relative_to(base_path).parts
+    except ValueError:
+        return False
+    if parts in (('index.html',), ('css',), ('js',), ('js', 'scenarios')):
+        return True
+    if len(parts) == 2 and parts[0] == 'css':
+        return parts[1].endswith('.css')
+    if len(parts) == 2 and parts[0] == 'js':
+        return parts[1].endswith('.js')
+    if len(parts) == 3 and parts[:2] == ('js', 'scenarios'):
+        return parts[2].endswith('.js')
+    return False
+
+
+def source_files(base_path: Path) -> list:
+    """Toutes les sources du build, dans l'ordre de collecte."""
+    return [base_path / 'index.html'] + collect_css_files(base_path) + collect_js_files(base_path)
+
+
+class PollingWatcher:
+    """Détecte les changements en comparant dates de modification et tailles."""
+
+    name = 'scrutation'
+
+    def __init__(self, base_path: Path, interval: float = 1.0):
+        self.base_path = base_path
+        self.interval = interval
+        self.snapshot = self._snapshot()
+
+    def _snapshot(self) -> dict:
+        snapshot = {}
+        for filepath in source_files(self.base_path):
+            try:
+                stat = filepath.stat()
+            except OSError:
+                continue
+            snapshot[filepath] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def wait(self) -> list:
+        """Bloque jusqu'au prochain changement et retourne les fichiers concernés."""
+        while True:
+            time.sleep(self.interval)
+            snapshot = self._snapshot()
+            if snapshot != self.snapshot:
+                changed = {p for p in snapshot.keys() | self.snapshot.keys()
+                           if snapshot.get(p) != self.snapshot.get(p)}
+                self.snapshot = snapshot
+                return sorted(str(p.relative_to(self.base_path)) for p in changed)
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Détecte les changements avec inotify (Linux), sans activité au repos."""
+
+    name = 'inotify'
+
+    IN_MODIFY = 0x002
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_FROM = 0x040
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    IN_DELETE_SELF = 0x400
+    IN_CLOEXEC = 0o2000000
+    EVENT_HEADER = struct.Struct('iIII')
+
+    def __init__(self, base_path: Path):
+        if not sys.platform.startswith('linux'):
+            raise OSError("inotify n'est disponible que sous Linux")
+        self.base_path = base_path
+        self.libc = ctypes.CDLL(ctypes.util.find_library('c') or None, use_errno=True)
+        self.fd = self.libc.inotify_init1(self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 a échoué")
+        self.watches = {}
+        self._add_watches()
+
+    def _add_watches(self):
+        """Surveille le dossier et ses sous-dossiers sources (appelé quand ils apparaissent)."""
+        mask = (self.IN_MODIFY | self.IN_CLOSE_WRITE | self.IN_MOVED_FROM | self.IN_MOVED_TO
+                | self.IN_CREATE | self.IN_DELETE | self.IN_DELETE_SELF)
+        for directory in (self.base_path, self.base_path / 'css',
+                          self.base_path / 'js', self.base_path / 'js' / 'scenarios'):
+            if directory.is_dir():
+                wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), mask)
+                if wd >= 0:
+                    self.watches[wd] = directory
+
+    def _read_events(self, timeout: float) -> set:
+        """Lit les événements disponibles et retourne les sources touchées."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        data = os.read(self.fd, 65536)
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            wd, _mask, _cookie, length = self.EVENT_HEADER.unpack_from(data, offset)
+            offset += self.EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            directory = self.watches.get(wd)
+            if directory is None:
+                continue
+            path = directory / os.fsdecode(name) if name else directory
+            if is_source_path(self.base_path, path):
+                changed.add(path)
+        return changed
+
+    def wait(self) -> list:
+        """Bloque jusqu'au prochain changement et retourne les fichiers concernés."""
+        changed = set()
+        while not changed:
+            # Timeout pour rester interruptible par Ctrl+C
+            changed = self._read_events(1.0)
+        while True:
+            more = self._read_events(DEBOUNCE_SECONDS)
+            if not more:
+                break
+            changed |= more
+        # Un dossier source a pu être créé ou recréé
+        self._add_watches()
+        return sorted(str(p.relative_to(self.base_path)) for p in changed)
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def create_watcher(base_path: Path, poll: bool = False):
+    """inotify si disponible, sinon scrutation."""
+    if not poll:
         try:
-            # Collecter tous les fichiers à surveiller
-            files_to_watch = [base_path / 'index.html']
-            files_to_watch.extend(collect_css_files(base_path))
-            files_to_watch.extend(collect_js_files(base_path))
+            return InotifyWatcher(base_path)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(base_path)
 
-            # Trouver le plus récent
-            current_mtime = 0
-            for f in files_to_watch:
-                if f.exists():
-                    mtime = f.stat().st_mtime
-                    if mtime > current_mtime:
-                        current_mtime = mtime
 
-            # Rebuild si changement
-            if current_mtime > last_mtime:
-                last_mtime = current_mtime
-                build_monolith(base_path, output_path, minify)
+def watch_mode(base_path: Path, output_path: Path, minify: bool = False, poll: bool = False):
+    """
+    Mode surveillance: rebuild automatique quand un fichier change.
 
-            time.sleep(1)
+    Les sorties minifiées sont gardées en cache: un rebuild ne re-minifie que
+    les fichiers modifiés.
+    """
+    print("\n[WATCH] Mode surveillance activé. Ctrl+C pour arrêter.")
 
-        except KeyboardInterrupt:
-            print("\n[WATCH] Arrêt de la surveillance.")
-            break
+    cache = MinifyCache()
+    watcher = create_watcher(base_path, poll)
+    print(f"[WATCH] Détection des changements: {watcher.name}")
+
+    try:
+        build_monolith(base_path, output_path, minify, cache)
+        while True:
+            changed = watcher.wait()
+            print(f"\n[WATCH] Modifié: {', '.join(changed)}")
+            build_monolith(base_path, output_path, minify, cache)
+
+    except KeyboardInterrupt:
+        print("\n[WATCH] Arrêt de la surveillance.")
+    finally:
+        watcher.close()
 
 
 def main():
@@ -330,6 +541,7 @@ Exemples:
     python build_monolith.py -o animation.html
     python build_monolith.py -m -o animation.min.html
     python build_monolith.py --watch
+    python build_monolith.py --watch --poll
         """
     )
 
@@ -352,6 +564,12 @@ Exemples:
         help='Mode surveillance: rebuild automatique'
     )
 
+    parser.add_argument(
+        '--poll',
+        action='store_true',
+        help='Mode surveillance par scrutation au lieu d\'inotify'
+    )
+
     parser.add_argument(
         'path',
         nargs='?',
@@ -373,7 +591,7 @@ Exemples:
 
     # Exécuter
     if args.watch:
-        watch_mode(base_path, output_path, args.minify)
+        watch_mode(base_path, output_path, args.minify, args.poll)
     else:
         success = build_monolith(base_path, output_path, args.minify)
         sys.exit(0 if success else 1)
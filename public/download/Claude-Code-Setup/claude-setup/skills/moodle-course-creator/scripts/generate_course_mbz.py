@@ -6,23 +6,34 @@ Permet de creer un cours avec sections, fichiers PDF, quiz et activites.
 
 Usage:
     python generate_course_mbz.py --config cours_config.json --output mon_cours.mbz
+    python generate_course_mbz.py --config cours_config.json --output mon_cours.mbz --incremental
 """
 
 import os
 import sys
 import json
+import io
 import tarfile
-import gzip
 import shutil
-import tempfile
 import hashlib
 from datetime import datetime
 from pathlib import Path
 import argparse
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterator, Tuple, Union
 import mimetypes
 
 
+def hash_file(filepath: str) -> Tuple[str, int]:
+    """Calcule le hash SHA1 et la taille d'un fichier, lu par blocs"""
+    sha1 = hashlib.sha1()
+    size = 0
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            sha1.update(chunk)
+            size += len(chunk)
+    return sha1.hexdigest(), size
+
+
 class MoodleCourseGenerator:
     """Generateur de cours Moodle complets avec fichiers et quiz"""
 
@@ -35,7 +46,8 @@ class MoodleCourseGenerator:
     # Dossiers a exclure
     EXCLUDED_DIRS = {'Sources', 'source', 'src', 'backup', '__pycache__', '.git', 'Ressources', 'ressources'}
 
-    def __init__(self, course_fullname: str, course_shortname: str, settings: Dict = None):
+    def __init__(self, course_fullname: str, course_shortname: str, settings: Dict = None,
+                 build_cache: 'MBZBuildCache' = None):
         self.course_fullname = course_fullname
         self.course_shortname = course_shortname
         self.timestamp = int(datetime.now().timestamp())
@@ -51,7 +63,11 @@ class MoodleCourseGenerator:
         # Stockage des elements
         self.sections: List[Dict] = []
         self.files_index: List[Dict] = []  # Index des fichiers pour files.xml
-        self.files_content: Dict[str, bytes] = {}  # hash -> contenu binaire
+        # hash -> chemin du fichier source, ou contenu binaire s'il a ete genere
+        self.files_sources: Dict[str, Union[str, bytes]] = {}
+
+        # Cache de construction incrementale (hashes de fichiers, fragments XML)
+        self.build_cache = build_cache
 
     @classmethod
     def is_valid_file(cls, filepath: str) -> bool:
@@ -81,11 +97,55 @@ class MoodleCourseGenerator:
         """Calcule le hash SHA1 d'un contenu"""
         return hashlib.sha1(content).hexdigest()
 
-    def _add_file_to_index(self, filepath: str, content: bytes, component: str,
-                           filearea: str, itemid: int, contextid: int) -> Dict:
-        """Ajoute un fichier a l'index et retourne ses metadonnees"""
-        contenthash = self._compute_file_hash(content)
-        filename = os.path.basename(filepath)
+    def _hash_file(self, filepath: str) -> Tuple[str, int]:
+        """Calcule le hash SHA1 et la taille d'un fichier, lu par blocs"""
+        if self.build_cache is not None:
+            return self.build_cache.file_hash(filepath, hash_file)
+        return hash_file(filepath)
+
+    def _fragment(self, kind: str, payload, generate):
+        """
+        Retourne un fragment XML, depuis le cache de construction si ses
+        entrees (payload) n'ont pas change, sinon en appelant generate()
+        """
+        if self.build_cache is None:
+            return generate()
+        return self.build_cache.fragment(kind, payload, generate)
+
+    @staticmethod
+    def _file_payload(file_info: Dict) -> Dict:
+        """Metadonnees d'un fichier sans les dates (entree de cle de cache)"""
+        return {k: v for k, v in file_info.items() if k not in ('timecreated', 'timemodified')}
+
+    def _activity_payload(self, activity: Dict) -> Dict:
+        """Entrees dont dependent les documents XML d'une activite"""
+        payload = dict(activity)
+        for key in ('file_info', 'h5p_file_info'):
+            if key in payload:
+                payload[key] = self._file_payload(payload[key])
+        return payload
+
+    def _section_payload(self, section: Dict) -> Dict:
+        """Entrees dont dependent les documents XML d'une section"""
+        payload = {k: v for k, v in section.items() if k != 'activities'}
+        payload['sequence'] = [a['id'] for a in section['activities']]
+        return payload
+
+    def _add_file_to_index(self, filepath: str, content: Optional[bytes], component: str,
+                           filearea: str, itemid: int, contextid: int,
+                           filename: str = None) -> Dict:
+        """
+        Ajoute un fichier a l'index et retourne ses metadonnees
+
+        Si content est None, le fichier est reference par son chemin : il est
+        hashe par blocs ici et recopie dans l'archive par generate_mbz.
+        filename remplace le nom du fichier (defaut: nom de filepath).
+        """
+        if content is None:
+            contenthash, filesize = self._hash_file(filepath)
+        else:
+            contenthash, filesize = self._compute_file_hash(content), len(content)
+        filename = filename or os.path.basename(filepath)
 
         # Determiner le mimetype
         mimetype, _ = mimetypes.guess_type(filename)
@@ -107,14 +167,15 @@ class MoodleCourseGenerator:
             'itemid': itemid,
             'filepath': '/',
             'filename': filename,
-            'filesize': len(content),
+            'filesize': filesize,
             'mimetype': mimetype,
             'timecreated': self.timestamp,
             'timemodified': self.timestamp,
         }
 
         self.files_index.append(file_info)
-        self.files_content[contenthash] = content
+        # Un meme contenu n'est stocke qu'une fois dans files/
+        self.files_sources.setdefault(contenthash, filepath if content is None else content)
 
         return file_info
 
@@ -157,17 +218,14 @@ class MoodleCourseGenerator:
         Returns:
             ID de l'activite creee
         """
-        # Lire le fichier
-        with open(filepath, 'rb') as f:
-            content = f.read()
-
         self.activity_counter += 1
         activity_id = self.activity_counter
         contextid = 1000 + activity_id  # Context unique pour chaque activite
 
         # Ajouter le fichier a l'index
+        # Ajoute par reference : le contenu n'est pas charge en memoire
         file_info = self._add_file_to_index(
-            filepath, content,
+            filepath, None,
             component='mod_resource',
             filearea='content',
             itemid=0,
@@ -335,36 +393,31 @@ class MoodleCourseGenerator:
         activity_id = self.activity_counter
         contextid = 1000 + activity_id
 
-        # Obtenir le contenu H5P
+        # Obtenir le contenu H5P (chemin du paquet, ou contenu binaire)
+        h5p_source, h5p_data = None, None
+        h5p_filename = f"{name.replace(' ', '_')}.h5p"
         if h5p_file_path and os.path.exists(h5p_file_path):
-            with open(h5p_file_path, 'rb') as f:
-                h5p_data = f.read()
+            # Reference par chemin, lu au moment de l'archivage
+            h5p_source = h5p_file_path
             h5p_filename = os.path.basename(h5p_file_path)
         elif h5p_content:
             h5p_data = h5p_content
-            h5p_filename = f"{name.replace(' ', '_')}.h5p"
+        elif questions and self.build_cache is not None:
+            # Paquet genere une seule fois tant que les questions ne changent pas
+            h5p_source = self.build_cache.blob(
+                'h5p', {'name': name, 'type': h5p_type, 'questions': questions},
+                lambda: self._generate_h5p_package(questions, name, h5p_type))
         elif questions:
             # Generer H5P a partir des questions
-            try:
-                from h5p_generator import convert_quiz_to_h5p
-                h5p_data = convert_quiz_to_h5p(questions, name, h5p_type)
-            except ImportError:
-                # Fallback: charger depuis le meme dossier
-                import importlib.util
-                script_dir = os.path.dirname(os.path.abspath(__file__))
-                spec = importlib.util.spec_from_file_location("h5p_generator",
-                    os.path.join(script_dir, "h5p_generator.py"))
-                h5p_gen = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(h5p_gen)
-                h5p_data = h5p_gen.convert_quiz_to_h5p(questions, name, h5p_type)
-            h5p_filename = f"{name.replace(' ', '_')}.h5p"
+            h5p_data = self._generate_h5p_package(questions, name, h5p_type)
         else:
             raise ValueError("Il faut fournir h5p_file_path, h5p_content, ou questions")
 
         # Ajouter le fichier H5P a l'index
         file_info = self._add_file_to_index(
-            h5p_filename, h5p_data,
-            'mod_h5pactivity', 'package', 0, contextid
+            h5p_source or h5p_filename, h5p_data,
+            'mod_h5pactivity', 'package', 0, contextid,
+            filename=h5p_filename
         )
 
         activity = {
@@ -386,6 +439,21 @@ class MoodleCourseGenerator:
 
         return activity_id
 
+    def _generate_h5p_package(self, questions: List[Dict], name: str, h5p_type: str) -> bytes:
+        """Genere un paquet H5P a partir des questions (via h5p_generator.py)"""
+        try:
+            from h5p_generator import convert_quiz_to_h5p
+        except ImportError:
+            # Fallback: charger depuis le meme dossier
+            import importlib.util
+            script_dir = os.path.dirname(os.path.abspath(__file__))
+            spec = importlib.util.spec_from_file_location("h5p_generator",
+                os.path.join(script_dir, "h5p_generator.py"))
+            h5p_gen = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(h5p_gen)
+            convert_quiz_to_h5p = h5p_gen.convert_quiz_to_h5p
+        return convert_quiz_to_h5p(questions, name, h5p_type)
+
     def _generate_moodle_backup_xml(self) -> str:
         """Genere moodle_backup.xml"""
         # Lister toutes les activites
@@ -1090,10 +1158,125 @@ class MoodleCourseGenerator:
 <{root_tag}>
 {content}</{root_tag}>'''
 
+    def _iter_backup_xml(self) -> Iterator[Tuple[str, str]]:
+        """
+        Genere les documents XML de la sauvegarde, dans l'ordre de l'archive
+
+        Avec un cache de construction, seul moodle_backup.xml est toujours
+        regenere ; les autres fragments sont repris du cache si leurs entrees
+        n'ont pas change.
+
+        Yields:
+            (chemin dans l'archive, contenu XML)
+        """
+        # Fichiers racine
+        yield "moodle_backup.xml", self._generate_moodle_backup_xml()
+        yield "files.xml", self._fragment(
+            "files", [self._file_payload(f) for f in self.files_index],
+            self._generate_files_xml)
+        yield "questions.xml", self._fragment(
+            "questions",
+            [self._activity_payload(a) for s in self.sections for a in s['activities']
+             if a['type'] == 'quiz'],
+            self._generate_questions_xml)
+
+        # Fichiers vides necessaires
+        yield "gradebook.xml", self._generate_empty_xml("gradebook",
+            "  <attributes></attributes>\n  <grade_categories></grade_categories>\n"
+            "  <grade_items></grade_items>\n  <grade_letters></grade_letters>\n"
+            "  <grade_settings></grade_settings>\n")
+        yield "grade_history.xml", self._generate_empty_xml(
+            "grade_history", "  <grade_grades></grade_grades>\n")
+        yield "groups.xml", self._generate_empty_xml("groups", "  <groupings></groupings>\n")
+        yield "outcomes.xml", self._generate_empty_xml("outcomes_definition")
+        yield "roles.xml", self._generate_empty_xml("roles_definition")
+        yield "scales.xml", self._generate_empty_xml("scales_definition")
+        yield "badges.xml", self._generate_empty_xml("badges")
+        yield "completion.xml", self._generate_empty_xml("course_completion")
+
+        # Dossier course
+        yield "course/course.xml", self._fragment(
+            "course", [self.course_fullname, self.course_shortname, self.settings],
+            self._generate_course_xml)
+        yield "course/inforef.xml", self._generate_empty_xml("inforef")
+        yield "course/roles.xml", self._generate_empty_xml("roles",
+            "  <role_overrides></role_overrides>\n  <role_assignments></role_assignments>\n")
+        yield "course/enrolments.xml", self._generate_empty_xml("enrolments", "  <enrols></enrols>\n")
+        yield "course/filters.xml", self._generate_empty_xml("filters",
+            "  <filter_actives></filter_actives>\n  <filter_configs></filter_configs>\n")
+        yield "course/competencies.xml", self._generate_empty_xml("course_competencies",
+            "  <competencies></competencies>\n  <usercomps></usercomps>\n")
+        yield "course/completiondefaults.xml", self._generate_empty_xml("course_completion_defaults",
+            "  <course_completion_defaults></course_completion_defaults>\n")
+        yield "course/contentbank.xml", self._generate_empty_xml("contents")
+        yield "course/calendar.xml", self._generate_empty_xml("events")
+
+        # Sections
+        for section in self.sections:
+            section_path = f"sections/section_{section['id']}"
+            yield f"{section_path}/section.xml", self._fragment(
+                "section", self._section_payload(section),
+                lambda: self._generate_section_xml(section))
+            yield f"{section_path}/inforef.xml", self._generate_empty_xml("inforef")
+
+        # Activites (tous les documents d'une activite forment un fragment)
+        for section in self.sections:
+            for activity in section['activities']:
+                activity_path = f"activities/{activity['type']}_{activity['id']}"
+                documents = self._fragment(
+                    "activity", self._activity_payload(activity),
+                    lambda: list(self._iter_activity_xml(activity)))
+                for name, content in documents:
+                    yield f"{activity_path}/{name}", content
+
+    def _iter_activity_xml(self, activity: Dict) -> Iterator[Tuple[str, str]]:
+        """Genere les documents XML du dossier d'une activite"""
+        # XML principal selon le type
+        if activity['type'] == 'resource':
+            yield "resource.xml", self._generate_resource_xml(activity)
+        elif activity['type'] == 'page':
+            yield "page.xml", self._generate_page_xml(activity)
+        elif activity['type'] == 'quiz':
+            yield "quiz.xml", self._generate_quiz_xml(activity)
+        elif activity['type'] == 'h5pactivity':
+            yield "h5pactivity.xml", self._generate_h5pactivity_xml(activity)
+
+        # Fichiers communs
+        yield "module.xml", self._generate_module_xml(activity)
+
+        # inforef avec reference aux fichiers si c'est une resource ou h5p
+        if activity['type'] in ('resource', 'h5pactivity'):
+            key = 'file_info' if activity['type'] == 'resource' else 'h5p_file_info'
+            file_info = activity.get(key, {})
+            inforef_content = f'''  <fileref>
+    <file>
+      <id>{file_info.get('id', 1)}</id>
+    </file>
+  </fileref>
+'''
+            yield "inforef.xml", self._generate_empty_xml("inforef", inforef_content)
+        else:
+            yield "inforef.xml", self._generate_empty_xml("inforef")
+
+        yield "grades.xml", self._generate_empty_xml("activity_gradebook",
+            "  <grade_items></grade_items>\n  <grade_letters></grade_letters>\n")
+        yield "grade_history.xml", self._generate_empty_xml("grade_history",
+            "  <grade_grades></grade_grades>\n")
+        yield "roles.xml", self._generate_empty_xml("roles",
+            "  <role_overrides></role_overrides>\n  <role_assignments></role_assignments>\n")
+        yield "filters.xml", self._generate_empty_xml("filters",
+            "  <filter_actives></filter_actives>\n  <filter_configs></filter_configs>\n")
+        yield "competencies.xml", self._generate_empty_xml("course_module_competencies",
+            "  <competencies></competencies>\n")
+
     def generate_mbz(self, output_path: str) -> str:
         """
         Genere le fichier .mbz complet du cours
 
+        Les documents XML et les fichiers joints sont ecrits directement dans
+        le flux tar.gz (pas de dossier temporaire) ; les fichiers joints sont
+        recopies par blocs depuis leur chemin d'origine.
+
         Args:
             output_path: Chemin du fichier .mbz a creer
 
@@ -1103,189 +1286,285 @@ class MoodleCourseGenerator:
         if not self.sections:
             raise ValueError("Aucune section ajoutee. Utilisez add_section().")
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            tmppath = Path(tmpdir)
-
-            # Structure des dossiers
-            course_dir = tmppath / "course"
-            course_dir.mkdir()
-            sections_dir = tmppath / "sections"
-            sections_dir.mkdir()
-            activities_dir = tmppath / "activities"
-            activities_dir.mkdir()
-            files_dir = tmppath / "files"
-            files_dir.mkdir()
-
-            # Fichiers racine
-            (tmppath / "moodle_backup.xml").write_text(
-                self._generate_moodle_backup_xml(), encoding='utf-8')
-            (tmppath / "files.xml").write_text(
-                self._generate_files_xml(), encoding='utf-8')
-            (tmppath / "questions.xml").write_text(
-                self._generate_questions_xml(), encoding='utf-8')
-
-            # Fichiers vides necessaires
-            (tmppath / "gradebook.xml").write_text(
-                self._generate_empty_xml("gradebook",
-                    "  <attributes></attributes>\n  <grade_categories></grade_categories>\n"
-                    "  <grade_items></grade_items>\n  <grade_letters></grade_letters>\n"
-                    "  <grade_settings></grade_settings>\n"), encoding='utf-8')
-            (tmppath / "grade_history.xml").write_text(
-                self._generate_empty_xml("grade_history", "  <grade_grades></grade_grades>\n"),
-                encoding='utf-8')
-            (tmppath / "groups.xml").write_text(
-                self._generate_empty_xml("groups", "  <groupings></groupings>\n"),
-                encoding='utf-8')
-            (tmppath / "outcomes.xml").write_text(
-                self._generate_empty_xml("outcomes_definition"), encoding='utf-8')
-            (tmppath / "roles.xml").write_text(
-                self._generate_empty_xml("roles_definition"), encoding='utf-8')
-            (tmppath / "scales.xml").write_text(
-                self._generate_empty_xml("scales_definition"), encoding='utf-8')
-            (tmppath / "badges.xml").write_text(
-                self._generate_empty_xml("badges"), encoding='utf-8')
-            (tmppath / "completion.xml").write_text(
-                self._generate_empty_xml("course_completion"), encoding='utf-8')
-
-            # Dossier course
-            (course_dir / "course.xml").write_text(
-                self._generate_course_xml(), encoding='utf-8')
-            (course_dir / "inforef.xml").write_text(
-                self._generate_empty_xml("inforef"), encoding='utf-8')
-            (course_dir / "roles.xml").write_text(
-                self._generate_empty_xml("roles",
-                    "  <role_overrides></role_overrides>\n  <role_assignments></role_assignments>\n"),
-                encoding='utf-8')
-            (course_dir / "enrolments.xml").write_text(
-                self._generate_empty_xml("enrolments", "  <enrols></enrols>\n"),
-                encoding='utf-8')
-            (course_dir / "filters.xml").write_text(
-                self._generate_empty_xml("filters",
-                    "  <filter_actives></filter_actives>\n  <filter_configs></filter_configs>\n"),
-                encoding='utf-8')
-            (course_dir / "competencies.xml").write_text(
-                self._generate_empty_xml("course_competencies",
-                    "  <competencies></competencies>\n  <usercomps></usercomps>\n"),
-                encoding='utf-8')
-            (course_dir / "completiondefaults.xml").write_text(
-                self._generate_empty_xml("course_completion_defaults",
-                    "  <course_completion_defaults></course_completion_defaults>\n"),
-                encoding='utf-8')
-            (course_dir / "contentbank.xml").write_text(
-                self._generate_empty_xml("contents"), encoding='utf-8')
-            (course_dir / "calendar.xml").write_text(
-                self._generate_empty_xml("events"), encoding='utf-8')
-
-            # Sections
-            for section in self.sections:
-                section_path = sections_dir / f"section_{section['id']}"
-                section_path.mkdir()
-                (section_path / "section.xml").write_text(
-                    self._generate_section_xml(section), encoding='utf-8')
-                (section_path / "inforef.xml").write_text(
-                    self._generate_empty_xml("inforef"), encoding='utf-8')
-
-            # Activites
-            for section in self.sections:
-                for activity in section['activities']:
-                    activity_path = activities_dir / f"{activity['type']}_{activity['id']}"
-                    activity_path.mkdir()
-
-                    # Generer le XML principal selon le type
-                    if activity['type'] == 'resource':
-                        (activity_path / "resource.xml").write_text(
-                            self._generate_resource_xml(activity), encoding='utf-8')
-                    elif activity['type'] == 'page':
-                        (activity_path / "page.xml").write_text(
-                            self._generate_page_xml(activity), encoding='utf-8')
-                    elif activity['type'] == 'quiz':
-                        (activity_path / "quiz.xml").write_text(
-                            self._generate_quiz_xml(activity), encoding='utf-8')
-                    elif activity['type'] == 'h5pactivity':
-                        (activity_path / "h5pactivity.xml").write_text(
-                            self._generate_h5pactivity_xml(activity), encoding='utf-8')
-
-                    # Fichiers communs
-                    (activity_path / "module.xml").write_text(
-                        self._generate_module_xml(activity), encoding='utf-8')
-
-                    # inforef avec reference aux fichiers si c'est une resource ou h5p
-                    if activity['type'] == 'resource':
-                        file_info = activity.get('file_info', {})
-                        inforef_content = f'''  <fileref>
-    <file>
-      <id>{file_info.get('id', 1)}</id>
-    </file>
-  </fileref>
-'''
-                        (activity_path / "inforef.xml").write_text(
-                            self._generate_empty_xml("inforef", inforef_content),
-                            encoding='utf-8')
-                    elif activity['type'] == 'h5pactivity':
-                        file_info = activity.get('h5p_file_info', {})
-                        inforef_content = f'''  <fileref>
-    <file>
-      <id>{file_info.get('id', 1)}</id>
-    </file>
-  </fileref>
-'''
-                        (activity_path / "inforef.xml").write_text(
-                            self._generate_empty_xml("inforef", inforef_content),
-                            encoding='utf-8')
-                    else:
-                        (activity_path / "inforef.xml").write_text(
-                            self._generate_empty_xml("inforef"), encoding='utf-8')
-
-                    (activity_path / "grades.xml").write_text(
-                        self._generate_empty_xml("activity_gradebook",
-                            "  <grade_items></grade_items>\n  <grade_letters></grade_letters>\n"),
-                        encoding='utf-8')
-                    (activity_path / "grade_history.xml").write_text(
-                        self._generate_empty_xml("grade_history",
-                            "  <grade_grades></grade_grades>\n"), encoding='utf-8')
-                    (activity_path / "roles.xml").write_text(
-                        self._generate_empty_xml("roles",
-                            "  <role_overrides></role_overrides>\n  <role_assignments></role_assignments>\n"),
-                        encoding='utf-8')
-                    (activity_path / "filters.xml").write_text(
-                        self._generate_empty_xml("filters",
-                            "  <filter_actives></filter_actives>\n  <filter_configs></filter_configs>\n"),
-                        encoding='utf-8')
-                    (activity_path / "competencies.xml").write_text(
-                        self._generate_empty_xml("course_module_competencies",
-                            "  <competencies></competencies>\n"), encoding='utf-8')
-
-            # Copier les fichiers dans files/
-            for contenthash, content in self.files_content.items():
-                # Structure: files/ab/contenthash (premiers 2 caracteres comme sous-dossier)
-                subdir = files_dir / contenthash[:2]
-                subdir.mkdir(exist_ok=True)
-                (subdir / contenthash).write_bytes(content)
-
-            # Creer l'archive tar
-            tar_path = Path(output_path).with_suffix('.tar')
-            with tarfile.open(tar_path, 'w') as tar:
-                for file_path in tmppath.rglob('*'):
-                    if file_path.is_file():
-                        arcname = file_path.relative_to(tmppath)
-                        tar.add(file_path, arcname=arcname)
-
-            # Compresser avec gzip
-            with open(tar_path, 'rb') as f_in:
-                with gzip.open(output_path, 'wb') as f_out:
-                    f_out.writelines(f_in)
-
-            # Supprimer le tar intermediaire
-            tar_path.unlink()
+        with MBZStreamWriter(output_path, self.timestamp) as writer:
+            for arcname, content in self._iter_backup_xml():
+                writer.add_text(arcname, content)
+
+            # Structure: files/ab/contenthash (premiers 2 caracteres comme sous-dossier)
+            for contenthash, source in self.files_sources.items():
+                arcname = f"files/{contenthash[:2]}/{contenthash}"
+                if isinstance(source, bytes):
+                    writer.add_bytes(arcname, source)
+                else:
+                    writer.add_file(arcname, source)
+
+        if self.build_cache is not None:
+            self.build_cache.save()
 
         return str(Path(output_path).absolute())
 
 
+class MBZBuildCache:
+    """
+    Cache de construction incrementale d'un .mbz
+
+    Conserve entre deux generations :
+    - les hashes SHA1 des fichiers joints (cle: chemin, mtime, taille)
+    - les fragments XML des sections et activites (cle: hash de leurs entrees
+      et du code du generateur)
+    - les paquets H5P generes a partir de questions (fichiers blobs/)
+
+    Les entrees non utilisees lors d'une generation sont supprimees a la
+    sauvegarde.
+    """
+
+    CACHE_FILE_NAME = "build_cache.json"
+    CACHE_VERSION = 1
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = Path(cache_dir)
+        self.cache_file = self.cache_dir / self.CACHE_FILE_NAME
+        self.blobs_dir = self.cache_dir / "blobs"
+        # Le code du generateur fait partie des cles : le modifier invalide le cache
+        self.signature = hash_file(__file__)[0]
+
+        self.files: Dict[str, List] = {}
+        self.fragments: Dict[str, object] = {}
+        self._used_files: Dict[str, List] = {}
+        self._used_fragments: Dict[str, object] = {}
+        self._used_blobs = set()
+        self.stats = {'reused': 0, 'generated': 0, 'hashed': 0}
+
+        if self.cache_file.exists():
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == self.CACHE_VERSION and data.get('signature') == self.signature:
+                    self.files = data.get('files', {})
+                    self.fragments = data.get('fragments', {})
+            except (json.JSONDecodeError, OSError):
+                pass
+
+    def key(self, kind: str, payload) -> str:
+        """Cle d'un fragment : type + entrees serialisees"""
+        data = json.dumps([kind, payload], sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+    def file_hash(self, filepath: str, compute) -> Tuple[str, int]:
+        """Hash d'un fichier joint, recalcule seulement si mtime/taille ont change"""
+        path = os.path.abspath(filepath)
+        stat = os.stat(path)
+        entry = self.files.get(path)
+        if not entry or entry[0] != stat.st_mtime_ns or entry[1] != stat.st_size:
+            contenthash, size = compute(path)
+            entry = [stat.st_mtime_ns, size, contenthash]
+            self.stats['hashed'] += 1
+        self._used_files[path] = entry
+        return entry[2], entry[1]
+
+    def fragment(self, kind: str, payload, generate):
+        """Fragment en cache pour ces entrees, ou genere puis mis en cache"""
+        key = self.key(kind, payload)
+        if key in self.fragments:
+            value = self.fragments[key]
+            self.stats['reused'] += 1
+        else:
+            value = generate()
+            self.stats['generated'] += 1
+        self._used_fragments[key] = value
+        return value
+
+    def blob(self, kind: str, payload, generate) -> str:
+        """Chemin d'un contenu binaire en cache (genere par generate() si absent)"""
+        key = self.key(kind, payload)
+        path = self.blobs_dir / key
+        if not path.exists():
+            self.blobs_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix('.tmp')
+            tmp_path.write_bytes(generate())
+            tmp_path.replace(path)
+        self._used_blobs.add(key)
+        return str(path)
+
+    def save(self):
+        """Ecrit le cache (entrees utilisees uniquement, ecriture atomique)"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        data = {
+            'version': self.CACHE_VERSION,
+            'signature': self.signature,
+            'files': self._used_files,
+            'fragments': self._used_fragments,
+        }
+        tmp_file = self.cache_file.with_suffix('.json.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        tmp_file.replace(self.cache_file)
+
+        if self.blobs_dir.exists():
+            for blob in self.blobs_dir.iterdir():
+                if blob.name not in self._used_blobs:
+                    blob.unlink()
+
+
+class MBZStreamWriter:
+    """
+    Ecriture en flux d'une archive .mbz (tar compresse gzip)
+
+    Chaque entree est ajoutee directement dans le flux compresse : la memoire
+    utilisee ne depend pas de la taille du cours.
+    """
+
+    def __init__(self, output_path: str, mtime: int = None):
+        self.output_path = output_path
+        self.mtime = mtime if mtime is not None else int(datetime.now().timestamp())
+        self.tar: Optional[tarfile.TarFile] = None
+
+    def __enter__(self) -> 'MBZStreamWriter':
+        self.tar = tarfile.open(self.output_path, 'w:gz')
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.tar.close()
+        self.tar = None
+        if exc_type is not None and os.path.exists(self.output_path):
+            # Ne pas laisser une archive tronquee
+            os.remove(self.output_path)
+        return False
+
+    def _tarinfo(self, arcname: str, size: int) -> tarfile.TarInfo:
+        info = tarfile.TarInfo(arcname)
+        info.size = size
+        info.mtime = self.mtime
+        info.mode = 0o644
+        return info
+
+    def add_bytes(self, arcname: str, data: bytes):
+        """Ajoute un contenu binaire deja en memoire"""
+        self.tar.addfile(self._tarinfo(arcname, len(data)), io.BytesIO(data))
+
+    def add_text(self, arcname: str, text: str):
+        """Ajoute un document texte (XML) encode en UTF-8"""
+        self.add_bytes(arcname, text.encode('utf-8'))
+
+    def add_file(self, arcname: str, filepath: str):
+        """Ajoute un fichier du disque, recopie par blocs"""
+        with open(filepath, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            self.tar.addfile(self._tarinfo(arcname, size), f)
+
+
+# Dossier du cache de construction incrementale (cree a cote du .mbz)
+CACHE_DIR_NAME = ".mbz-cache"
+
+
+def build_course_from_config(config: Dict, build_cache: MBZBuildCache = None):
+    """
+    Construit un MoodleCourseGenerator a partir d'une configuration JSON
+
+    Returns:
+        (generateur, liste des fichiers sources exclus)
+    """
+    # Passer les settings au generateur
+    gen = MoodleCourseGenerator(
+        config['course_fullname'],
+        config['course_shortname'],
+        config.get('settings', {}),
+        build_cache=build_cache
+    )
+
+    skipped_files = []
+
+    for sec in config.get('sections', []):
+        section_id = gen.add_section(
+            sec['name'],
+            sec.get('summary', ''),
+            sec.get('visible', False)
+        )
+
+        for act in sec.get('activities', []):
+            if act['type'] == 'file':
+                # Verifier que le fichier est valide (pas une source)
+                if not MoodleCourseGenerator.is_valid_file(act['path']):
+                    skipped_files.append(act['path'])
+                    continue
+                # Verifier que le fichier existe
+                if not os.path.exists(act['path']):
+                    print(f"Attention: Fichier introuvable: {act['path']}")
+                    continue
+                gen.add_file_resource(
+                    section_id, act['name'], act['path'],
+                    act.get('description', ''),
+                    act.get('visible', False)
+                )
+            elif act['type'] == 'page':
+                gen.add_page(
+                    section_id, act['name'], act['content'],
+                    act.get('visible', False)
+                )
+            elif act['type'] == 'quiz':
+                gen.add_quiz(
+                    section_id, act['name'], act.get('intro', ''),
+                    act['questions'],
+                    act.get('visible', False)
+                )
+            elif act['type'] == 'h5p':
+                gen.add_h5p(
+                    section_id, act['name'], act.get('intro', ''),
+                    h5p_file_path=act.get('h5p_file'),
+                    questions=act.get('questions'),
+                    h5p_type=act.get('h5p_type', 'questionset'),
+                    visible=act.get('visible', False)
+                )
+
+    return gen, skipped_files
+
+
+def generate_course_from_config(config: Dict, output: str, incremental: bool = False,
+                                cache_dir: str = None) -> str:
+    """
+    Genere le .mbz decrit par une configuration JSON
+
+    Args:
+        config: Configuration du cours
+        output: Fichier .mbz de sortie
+        incremental: Si True, reutilise les hashes et fragments XML de la
+            generation precedente (cache .mbz-cache/ a cote du .mbz)
+        cache_dir: Dossier du cache (defaut: .mbz-cache/ a cote du .mbz)
+
+    Returns:
+        Chemin absolu du fichier cree
+    """
+    build_cache = None
+    if incremental:
+        build_cache = MBZBuildCache(cache_dir or Path(output).absolute().parent / CACHE_DIR_NAME)
+
+    gen, skipped_files = build_course_from_config(config, build_cache)
+
+    if skipped_files:
+        print(f"Fichiers sources exclus ({len(skipped_files)}):")
+        for f in skipped_files[:5]:
+            print(f"  - {f}")
+        if len(skipped_files) > 5:
+            print(f"  ... et {len(skipped_files) - 5} autres")
+
+    result = gen.generate_mbz(output)
+
+    if build_cache is not None:
+        stats = build_cache.stats
+        print(f"Build incremental : {stats['reused']} fragments reutilises, "
+              f"{stats['generated']} regeneres, {stats['hashed']} fichiers hashes")
+
+    return result
+
+
 def main():
     parser = argparse.ArgumentParser(description='Generateur de cours Moodle complets (.mbz)')
     parser.add_argument('--config', '-c', help='Fichier de configuration JSON')
     parser.add_argument('--output', '-o', help='Fichier .mbz de sortie')
     parser.add_argument('--scan-dir', '-s', help='Scanner un dossier pour les PDFs')
+    parser.add_argument('--incremental', '-i', action='store_true',
+                        help='Reutiliser les fragments XML et hashes de la generation precedente')
+    parser.add_argument('--cache-dir', help=f'Dossier du cache incremental (defaut: {CACHE_DIR_NAME}/ a cote du .mbz)')
 
     args = parser.parse_args()
 
@@ -1293,66 +1572,8 @@ def main():
         with open(args.config, 'r', encoding='utf-8') as f:
             config = json.load(f)
 
-        # Passer les settings au generateur
-        gen = MoodleCourseGenerator(
-            config['course_fullname'],
-            config['course_shortname'],
-            config.get('settings', {})
-        )
-
-        skipped_files = []
-
-        for sec in config.get('sections', []):
-            section_id = gen.add_section(
-                sec['name'],
-                sec.get('summary', ''),
-                sec.get('visible', False)
-            )
-
-            for act in sec.get('activities', []):
-                if act['type'] == 'file':
-                    # Verifier que le fichier est valide (pas une source)
-                    if not MoodleCourseGenerator.is_valid_file(act['path']):
-                        skipped_files.append(act['path'])
-                        continue
-                    # Verifier que le fichier existe
-                    if not os.path.exists(act['path']):
-                        print(f"Attention: Fichier introuvable: {act['path']}")
-                        continue
-                    gen.add_file_resource(
-                        section_id, act['name'], act['path'],
-                        act.get('description', ''),
-                        act.get('visible', False)
-                    )
-                elif act['type'] == 'page':
-                    gen.add_page(
-                        section_id, act['name'], act['content'],
-                        act.get('visible', False)
-                    )
-                elif act['type'] == 'quiz':
-                    gen.add_quiz(
-                        section_id, act['name'], act.get('intro', ''),
-                        act['questions'],
-                        act.get('visible', False)
-                    )
-                elif act['type'] == 'h5p':
-                    gen.add_h5p(
-                        section_id, act['name'], act.get('intro', ''),
-                        h5p_file_path=act.get('h5p_file'),
-                        questions=act.get('questions'),
-                        h5p_type=act.get('h5p_type', 'questionset'),
-                        visible=act.get('visible', False)
-                    )
-
-        if skipped_files:
-            print(f"Fichiers sources exclus ({len(skipped_files)}):")
-            for f in skipped_files[:5]:
-                print(f"  - {f}")
-            if len(skipped_files) > 5:
-                print(f"  ... et {len(skipped_files) - 5} autres")
-
         output = args.output or config.get('output', 'cours.mbz')
-        result = gen.generate_mbz(output)
+        result = generate_course_from_config(config, output, args.incremental, args.cache_dir)
         print(f"Cours genere : {result}")
 
     elif args.scan_dir:
@@ -22,15 +22,20 @@ Support LaTeX/MathJax pour formules mathematiques.
 Support HTML enrichi.
 """
 
-import json
-import zipfile
-import io
 import base64
 import re
 from typing import List, Dict, Optional, Any, Union
 from pathlib import Path
 import html
 
+# Ecriture des paquets .h5p (meme dossier)
+try:
+    from h5p_package import build_h5p, MediaSet
+except ImportError:
+    import sys
+    sys.path.insert(0, str(Path(__file__).parent))
+    from h5p_package import build_h5p, MediaSet
+
 
 def escape_html_preserve_math(text: str) -> str:
     """
@@ -128,17 +133,8 @@ class H5PAdvancedGenerator:
     def _create_h5p_package(h5p_json: Dict, content: Dict,
                             images: Optional[Dict[str, bytes]] = None) -> bytes:
         """Cree un package .h5p (fichier ZIP)"""
-        buffer = io.BytesIO()
-        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zf:
-            zf.writestr('h5p.json', json.dumps(h5p_json, ensure_ascii=False, indent=2))
-            zf.writestr('content/content.json', json.dumps(content, ensure_ascii=False, indent=2))
-
-            # Ajouter les images si presentes
-            if images:
-                for name, data in images.items():
-                    zf.writestr(f'content/images/{name}', data)
-
-        return buffer.getvalue()
+        media = {f'content/images/{name}': data for name, data in (images or {}).items()}
+        return build_h5p(h5p_json, content, media)
 
     @staticmethod
     def _get_base_dependencies() -> List[Dict]:
@@ -716,7 +712,7 @@ class H5PAdvancedGenerator:
             Contenu du fichier .h5p
         """
         h5p_slides = []
-        images = {}
+        images = MediaSet()
 
         for slide_idx, slide in enumerate(slides):
             elements = []
@@ -727,10 +723,7 @@ class H5PAdvancedGenerator:
                 if elem_type == 'text':
                     elements.append(cls._build_cp_text_element(elem))
                 elif elem_type == 'image':
-                    el, img_data = cls._build_cp_image_element(elem, slide_idx, len(elements))
-                    elements.append(el)
-                    if img_data:
-                        images.update(img_data)
+                    elements.append(cls._build_cp_image_element(elem, slide_idx, len(elements), images))
                 elif elem_type == 'quiz':
                     elements.append(cls._build_cp_quiz_element(elem))
 
@@ -824,7 +817,7 @@ class H5PAdvancedGenerator:
             ]
         }
 
-        return cls._create_h5p_package(h5p_json, content, images if images else None)
+        return cls._create_h5p_package(h5p_json, content, images.files or None)
 
     @classmethod
     def _build_cp_text_element(cls, elem: Dict) -> Dict:
@@ -844,16 +837,16 @@ class H5PAdvancedGenerator:
         }
 
     @classmethod
-    def _build_cp_image_element(cls, elem: Dict, slide_idx: int, elem_idx: int) -> tuple:
-        """Construit un element image pour Course Presentation"""
+    def _build_cp_image_element(cls, elem: Dict, slide_idx: int, elem_idx: int,
+                                images: MediaSet) -> Dict:
+        """Construit un element image pour Course Presentation (image ajoutee a images)"""
         img_path = elem.get('path', '')
-        img_data = {}
         img_name = f"slide{slide_idx}_img{elem_idx}.png"
 
-        # Si un chemin est fourni, lire l'image
+        # Si un chemin est fourni, lire l'image (une image deja presente est reutilisee)
         if img_path and Path(img_path).exists():
             with open(img_path, 'rb') as f:
-                img_data[img_name] = f.read()
+                img_name = images.add(img_name, f.read())
 
         element = {
             "x": elem.get('x', 0),
@@ -875,7 +868,7 @@ class H5PAdvancedGenerator:
             }
         }
 
-        return element, img_data
+        return element
 
     @classmethod
     def _build_cp_quiz_element(cls, elem: Dict) -> Dict:
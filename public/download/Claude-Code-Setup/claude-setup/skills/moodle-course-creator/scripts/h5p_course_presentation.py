@@ -12,14 +12,19 @@ Usage pedagogique:
 - Cours avec quiz integres
 """
 
-import json
-import zipfile
-import io
 import re
 from typing import List, Dict, Optional
 from pathlib import Path
 import html
 
+# Ecriture des paquets .h5p (meme dossier)
+try:
+    from h5p_package import build_h5p
+except ImportError:
+    import sys
+    sys.path.insert(0, str(Path(__file__).parent))
+    from h5p_package import build_h5p
+
 
 def format_latex_for_h5p(text: str) -> str:
     """
@@ -294,15 +299,11 @@ class H5PCoursePresentation:
         }
 
         # Creer le package
-        buffer = io.BytesIO()
-        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zf:
-            zf.writestr('h5p.json', json.dumps(h5p_json, ensure_ascii=False, indent=2))
-            zf.writestr('content/content.json', json.dumps(content, ensure_ascii=False, indent=2))
-
-            if bg_image_data:
-                zf.writestr(f'content/images/{bg_image_name}', bg_image_data)
+        media = {}
+        if bg_image_data:
+            media[f'content/images/{bg_image_name}'] = bg_image_data
 
-        return buffer.getvalue()
+        return build_h5p(h5p_json, content, media)
 
     @classmethod
     def _create_quiz_element(cls, quiz_type: str, stage: Dict, question: str, feedback: str) -> Dict:
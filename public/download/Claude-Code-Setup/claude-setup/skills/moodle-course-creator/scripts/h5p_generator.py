@@ -10,12 +10,18 @@ Types supportes:
 - Multiple Choice
 """
 
-import json
-import zipfile
-import io
 from typing import List, Dict, Optional
+from pathlib import Path
 import html
 
+# Ecriture des paquets .h5p (meme dossier)
+try:
+    from h5p_package import build_h5p
+except ImportError:
+    import sys
+    sys.path.insert(0, str(Path(__file__).parent))
+    from h5p_package import build_h5p
+
 
 def escape_html(text: str) -> str:
     """Echappe le texte pour HTML"""
@@ -177,13 +183,7 @@ class H5PGenerator:
             ]
         }
 
-        # Creer le fichier ZIP (.h5p)
-        buffer = io.BytesIO()
-        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zf:
-            zf.writestr('h5p.json', json.dumps(h5p_json, ensure_ascii=False, indent=2))
-            zf.writestr('content/content.json', json.dumps(content, ensure_ascii=False, indent=2))
-
-        return buffer.getvalue()
+        return build_h5p(h5p_json, content)
 
     @classmethod
     def create_single_choice_set_h5p(cls, title: str, questions: List[Dict]) -> bytes:
@@ -270,12 +270,7 @@ class H5PGenerator:
             ]
         }
 
-        buffer = io.BytesIO()
-        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zf:
-            zf.writestr('h5p.json', json.dumps(h5p_json, ensure_ascii=False, indent=2))
-            zf.writestr('content/content.json', json.dumps(content, ensure_ascii=False, indent=2))
-
-        return buffer.getvalue()
+        return build_h5p(h5p_json, content)
 
     @classmethod
     def create_true_false_h5p(cls, title: str, statement: str, correct_answer: bool,
@@ -335,12 +330,7 @@ class H5PGenerator:
             ]
         }
 
-        buffer = io.BytesIO()
-        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zf:
-            zf.writestr('h5p.json', json.dumps(h5p_json, ensure_ascii=False, indent=2))
-            zf.writestr('content/content.json', json.dumps(content, ensure_ascii=False, indent=2))
-
-        return buffer.getvalue()
+        return build_h5p(h5p_json, content)
 
 
 def convert_quiz_to_h5p(quiz_questions: List[Dict], title: str, h5p_type: str = "questionset") -> bytes:
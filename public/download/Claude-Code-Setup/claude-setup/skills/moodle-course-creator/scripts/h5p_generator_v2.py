@@ -8,14 +8,20 @@ IMPORTANT: Tout est en français, avec support MathJax pour les formules LaTeX.
 Syntaxe LaTeX: \\(formule\\) pour inline, \\[formule\\] pour display.
 """
 
-import json
-import zipfile
-import io
 import re
 from typing import List, Dict, Optional, Union
 from datetime import datetime
+from pathlib import Path
 import html
 
+# Ecriture des paquets .h5p (meme dossier)
+try:
+    from h5p_package import build_h5p
+except ImportError:
+    import sys
+    sys.path.insert(0, str(Path(__file__).parent))
+    from h5p_package import build_h5p
+
 
 def escape_html_preserve_math(text: str) -> str:
     """Échappe HTML tout en préservant les formules LaTeX MathJax"""
@@ -77,12 +83,7 @@ class H5PGeneratorV2:
         # Note: metadata n'est PAS ajouté à content pour compatibilité .mbz
         # (Le Game Map fonctionne sans metadata au top-level)
 
-        buffer = io.BytesIO()
-        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zf:
-            zf.writestr('h5p.json', json.dumps(h5p_json, ensure_ascii=False, indent=2))
-            zf.writestr('content/content.json', json.dumps(content, ensure_ascii=False, indent=2))
-
-        return buffer.getvalue()
+        return build_h5p(h5p_json, content)
 
     # =========================================================================
     # FILL IN THE BLANKS (Textes à trous) - CORRIGÉ
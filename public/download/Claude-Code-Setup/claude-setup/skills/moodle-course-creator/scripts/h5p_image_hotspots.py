@@ -12,15 +12,20 @@ Usage pedagogique:
 - Parcours decouverte interactifs
 """
 
-import json
-import zipfile
-import io
 import re
 import base64
 from typing import List, Dict, Optional, Union, Tuple
 from pathlib import Path
 import html
 
+# Ecriture des paquets .h5p (meme dossier)
+try:
+    from h5p_package import build_h5p, MediaSet
+except ImportError:
+    import sys
+    sys.path.insert(0, str(Path(__file__).parent))
+    from h5p_package import build_h5p, MediaSet
+
 
 def escape_html_preserve_math(text: str) -> str:
     """
@@ -176,7 +181,7 @@ class H5PImageHotspotsGenerator:
 
         # Construire les hotspots H5P
         h5p_hotspots = []
-        images = {}
+        images = MediaSet()
 
         for idx, hs in enumerate(hotspots):
             hotspot_content = []
@@ -200,7 +205,7 @@ class H5PImageHotspotsGenerator:
 
                     if Path(img_path).exists():
                         with open(img_path, 'rb') as f:
-                            images[img_name] = f.read()
+                            img_name = images.add(img_name, f.read())
 
                     hotspot_content.append({
                         "library": "H5P.Image 1.1",
@@ -292,20 +297,17 @@ class H5PImageHotspotsGenerator:
         }
 
         # Creer le package
-        buffer = io.BytesIO()
-        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zf:
-            zf.writestr('h5p.json', json.dumps(h5p_json, ensure_ascii=False, indent=2))
-            zf.writestr('content/content.json', json.dumps(content, ensure_ascii=False, indent=2))
+        media = {}
 
-            # Image de fond
-            if image_data:
-                zf.writestr(f'content/images/{image_name}', image_data)
+        # Image de fond
+        if image_data:
+            media[f'content/images/{image_name}'] = image_data
 
-            # Images des hotspots
-            for name, data in images.items():
-                zf.writestr(f'content/images/{name}', data)
+        # Images des hotspots
+        for name, data in images.files.items():
+            media[f'content/images/{name}'] = data
 
-        return buffer.getvalue()
+        return build_h5p(h5p_json, content, media)
 
     @classmethod
     def create_math_exploration(cls,
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ecriture des paquets .h5p (archive ZIP : h5p.json + content/).
+
+Module partage par les generateurs H5P :
+- ecriture en flux vers le fichier de sortie (pas de tampon intermediaire)
+- JSON compact (sans indentation)
+- medias deja compresses (PNG, JPEG, MP4...) stockes sans recompression
+- medias identiques d'un paquet stockes une seule fois (MediaSet, hash SHA1)
+- fichier de sortie remplace d'un bloc (jamais de paquet tronque)
+
+Copie identique dans les skills moodle-course-creator, h5p-gamemap et
+h5p-branching-scenario : chaque skill s'installe seule (comme docx/ooxml et
+pptx/ooxml), ses scripts n'importent rien hors de leur dossier. Toute
+modification doit etre reportee dans les trois copies.
+
+Usage:
+    from h5p_package import write_h5p, build_h5p, MediaSet
+
+    write_h5p('quiz.h5p', h5p_json, content,
+              media={'content/images/fond.png': Path('fond.png')})
+    data = build_h5p(h5p_json, content)          # contenu binaire du paquet
+
+    images = MediaSet()
+    path = images.add('slide0_img0.png', logo)   # nom a citer dans content.json
+    path = images.add('slide1_img0.png', logo)   # -> 'slide0_img0.png'
+    media = {f'content/images/{n}': d for n, d in images.files.items()}
+"""
+
+import hashlib
+import io
+import json
+import os
+import zipfile
+from pathlib import Path
+from typing import BinaryIO, Dict, Optional, Union
+
+# Formats deja compresses : les deflater coute du temps sans rien gagner
+STORED_EXTENSIONS = {
+    '.png', '.jpg', '.jpeg', '.gif', '.webp', '.avif',
+    '.mp3', '.m4a', '.aac', '.ogg', '.oga', '.opus',
+    '.mp4', '.m4v', '.webm', '.ogv', '.mov',
+    '.woff', '.woff2', '.zip', '.gz', '.h5p',
+}
+
+# Media : contenu binaire, ou chemin d'un fichier lu au moment de l'ecriture
+Media = Union[bytes, str, Path]
+
+
+def dump_json(obj) -> bytes:
+    """Serialise un document JSON du paquet (compact, UTF-8)"""
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def compress_type_for(arcname: str) -> int:
+    """ZIP_STORED pour les medias deja compresses, ZIP_DEFLATED sinon"""
+    if os.path.splitext(arcname)[1].lower() in STORED_EXTENSIONS:
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+
+class MediaSet:
+    """
+    Medias d'un paquet, dedoublonnes par hash SHA1
+
+    Un meme contenu ajoute sous plusieurs noms (logo repete sur chaque
+    diapositive...) n'est garde qu'une fois : add() retourne le nom sous
+    lequel il est range, a citer dans content.json.
+    """
+
+    def __init__(self):
+        self.files: Dict[str, bytes] = {}
+        self._names: Dict[str, str] = {}
+
+    def add(self, name: str, data: bytes) -> str:
+        """Ajoute data sous name, ou retourne le nom d'un contenu identique"""
+        digest = hashlib.sha1(data).hexdigest()
+        if digest not in self._names:
+            self._names[digest] = name
+            self.files[name] = data
+        return self._names[digest]
+
+
+def _write_zip(target: Union[str, Path, BinaryIO], h5p_json: Dict, content: Dict,
+               media: Optional[Dict[str, Media]]):
+    with zipfile.ZipFile(target, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('h5p.json', dump_json(h5p_json))
+        zf.writestr('content/content.json', dump_json(content))
+
+        for arcname, source in (media or {}).items():
+            compress_type = compress_type_for(arcname)
+            if isinstance(source, (str, Path)):
+                # Recopie par blocs depuis le disque
+                zf.write(source, arcname, compress_type=compress_type)
+            else:
+                zf.writestr(arcname, source, compress_type=compress_type)
+
+
+def write_h5p(target: Union[str, Path, BinaryIO], h5p_json: Dict, content: Dict,
+              media: Optional[Dict[str, Media]] = None):
+    """
+    Ecrit un paquet .h5p directement dans target
+
+    Un chemin est d'abord ecrit dans un fichier temporaire du meme dossier,
+    puis renomme : en cas d'erreur, un paquet existant reste intact.
+
+    Args:
+        target: Chemin du fichier .h5p, ou objet fichier binaire ouvert en
+                ecriture (fichier, tampon d'un membre d'archive...)
+        h5p_json: Contenu de h5p.json
+        content: Contenu de content/content.json
+        media: Medias a ajouter, {nom dans l'archive: contenu ou chemin},
+               ex. {'content/images/fond.png': image_data}
+    """
+    if not isinstance(target, (str, Path)):
+        _write_zip(target, h5p_json, content, media)
+        return
+
+    target = Path(target)
+    tmp_path = target.with_name(target.name + '.tmp')
+    try:
+        _write_zip(tmp_path, h5p_json, content, media)
+        os.replace(tmp_path, target)
+    except BaseException:
+        if tmp_path.exists():
+            tmp_path.unlink()
+        raise
+
+
+def build_h5p(h5p_json: Dict, content: Dict,
+              media: Optional[Dict[str, Media]] = None) -> bytes:
+    """Retourne le contenu binaire d'un paquet .h5p (voir write_h5p)"""
+    buffer = io.BytesIO()
+    write_h5p(buffer, h5p_json, content, media)
+    return buffer.getvalue()
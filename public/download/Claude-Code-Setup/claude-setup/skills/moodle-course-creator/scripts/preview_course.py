@@ -7,6 +7,7 @@ Génère une page HTML interactive pour vérifier le cours avant import.
 Usage:
     python preview_course.py --config cours_config.json
     python preview_course.py --config cours_config.json --output preview.html
+    python preview_course.py --config cours_config.json --mbz mon_cours.mbz
 """
 
 import json
@@ -558,11 +559,32 @@ def generate_preview_html(config: dict, output_path: str = None) -> str:
     return str(Path(output_path).absolute())
 
 
+def build_mbz(config: dict, output: str) -> str:
+    """
+    Regenere le .mbz du cours en mode incremental (seules les activites
+    modifiees depuis la generation precedente sont regenerees).
+    """
+    try:
+        from generate_course_mbz import generate_course_from_config
+    except ImportError:
+        # Fallback: charger depuis le meme dossier
+        import importlib.util
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        spec = importlib.util.spec_from_file_location("generate_course_mbz",
+            os.path.join(script_dir, "generate_course_mbz.py"))
+        mbz_gen = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(mbz_gen)
+        generate_course_from_config = mbz_gen.generate_course_from_config
+    return generate_course_from_config(config, output, incremental=True)
+
+
 def main():
     parser = argparse.ArgumentParser(description='Prévisualisateur de cours Moodle')
     parser.add_argument('--config', '-c', required=True, help='Fichier de configuration JSON')
     parser.add_argument('--output', '-o', help='Fichier HTML de sortie')
     parser.add_argument('--open', action='store_true', help='Ouvrir dans le navigateur')
+    parser.add_argument('--mbz', nargs='?', const='',
+                        help='Regenerer aussi le .mbz en mode incremental (defaut: "output" de la config)')
 
     args = parser.parse_args()
 
@@ -576,6 +598,10 @@ def main():
     output = generate_preview_html(config, args.output)
     print(f"Prévisualisation générée : {output}")
 
+    if args.mbz is not None:
+        mbz_output = build_mbz(config, args.mbz or config.get('output', 'cours.mbz'))
+        print(f"Cours généré : {mbz_output}")
+
     # Ouvrir dans le navigateur si demandé
     if args.open:
         import webbrowser
@@ -8,6 +8,7 @@ et que tous les contenus H5P sont valides avant import dans Moodle.
 
 Usage:
     python validate_mbz.py cours.mbz [--verbose] [--fix]
+    python validate_mbz.py gros_cours.mbz --stream [--jobs N]
 
 Vérifie:
     1. Structure du fichier (tar.gz valide)
@@ -25,9 +26,12 @@ import xml.etree.ElementTree as ET
 import argparse
 import sys
 import io
+import os
 import re
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, Future
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Union, BinaryIO
 from dataclasses import dataclass, field
 
 
@@ -49,6 +53,56 @@ class ValidationResult:
     def add_info(self, msg: str):
         self.info.append(msg)
 
+    def merge(self, other: 'ValidationResult'):
+        """Ajoute les messages d'un autre résultat (validation d'un sous-élément)"""
+        self.errors.extend(other.errors)
+        self.warnings.extend(other.warnings)
+        self.info.extend(other.info)
+        self.valid = self.valid and other.valid
+
+
+def validate_h5p_package(source: Union[str, BinaryIO], file_hash: str, file_path: str,
+                         verbose: bool = False) -> Tuple[bool, ValidationResult]:
+    """
+    Valide un fichier de files/ s'il s'agit d'un paquet H5P (zip avec h5p.json).
+
+    Fonction de module pour pouvoir être exécutée dans un processus séparé.
+
+    Args:
+        source: Chemin du fichier ou flux binaire (seekable)
+        file_hash: Hash SHA1 du contenu
+        file_path: Chemin du fichier dans l'archive
+
+    Returns:
+        (True si c'est un paquet H5P, messages de validation)
+    """
+    validator = MBZValidator(file_path, verbose=verbose)
+    is_h5p = False
+
+    # Vérifier si c'est un fichier H5P (zip avec h5p.json)
+    try:
+        with zipfile.ZipFile(source, 'r') as zf:
+            if 'h5p.json' in zf.namelist():
+                is_h5p = True
+                validator._validate_single_h5p(file_hash, file_path, zf)
+    except zipfile.BadZipFile:
+        # Pas un zip, probablement un PDF ou autre ressource
+        pass
+    except Exception as e:
+        if verbose:
+            validator.result.add_warning(f"Erreur vérification {file_path}: {e}")
+
+    return is_h5p, validator.result
+
+
+def _validate_spooled_h5p(path: str, file_hash: str, file_path: str,
+                          verbose: bool) -> Tuple[bool, ValidationResult]:
+    """Valide un paquet extrait dans un fichier temporaire, puis le supprime"""
+    try:
+        return validate_h5p_package(path, file_hash, file_path, verbose)
+    finally:
+        os.remove(path)
+
 
 class MBZValidator:
     """Validateur complet de fichiers .mbz"""
@@ -62,14 +116,23 @@ class MBZValidator:
     # Structure H5P attendue
     H5P_REQUIRED_FILES = ['h5p.json', 'content/content.json']
 
-    def __init__(self, mbz_path: str, verbose: bool = False):
+    # Taille des blocs lus dans l'archive en mode flux
+    STREAM_CHUNK_SIZE = 1 << 20
+
+    def __init__(self, mbz_path: str, verbose: bool = False,
+                 streaming: bool = False, jobs: Optional[int] = None):
         self.mbz_path = Path(mbz_path)
         self.verbose = verbose
+        self.streaming = streaming
+        self.jobs = jobs
         self.result = ValidationResult()
         self.tar = None
+        # En mode flux : seulement les XML utiles à la validation
         self.files_in_mbz: Dict[str, bytes] = {}
         self.h5p_activities: Dict[str, dict] = {}
         self.file_references: Dict[str, str] = {}  # hash -> filename
+        # Mode flux : hash -> résultat de validate_h5p_package (zips uniquement)
+        self.h5p_results: Dict[str, Tuple[bool, ValidationResult]] = {}
 
     def validate(self) -> ValidationResult:
         """Exécute toutes les validations"""
@@ -81,12 +144,17 @@ class MBZValidator:
         if not self._check_file_exists():
             return self.result
 
-        # 2. Vérifier la structure tar.gz
-        if not self._check_tar_structure():
-            return self.result
+        if self.streaming:
+            # 2-3. Un seul passage sur l'archive, paquets H5P validés en parallèle
+            if not self._stream_archive():
+                return self.result
+        else:
+            # 2. Vérifier la structure tar.gz
+            if not self._check_tar_structure():
+                return self.result
 
-        # 3. Charger tous les fichiers
-        self._load_all_files()
+            # 3. Charger tous les fichiers
+            self._load_all_files()
 
         # 4. Vérifier les fichiers obligatoires
         self._check_required_files()
@@ -144,6 +212,95 @@ class MBZValidator:
                 except Exception as e:
                     self.result.add_warning(f"Impossible de lire {member.name}: {e}")
 
+    def _needs_content(self, name: str) -> bool:
+        """XML dont le contenu est utilisé par les vérifications (mode flux)"""
+        return (name in self.REQUIRED_FILES or name == 'files.xml'
+                or '/h5pactivity.xml' in name)
+
+    def _stream_archive(self) -> bool:
+        """
+        Parcourt l'archive en un seul passage (mode flux, sans accès aléatoire).
+
+        Seuls les XML utiles sont gardés en mémoire. Les fichiers de files/ sont
+        hashés par blocs ; ceux qui ressemblent à un zip sont écrits dans un
+        fichier temporaire et validés par un pool de processus pendant la
+        lecture du reste de l'archive.
+        """
+        max_workers = self.jobs or os.cpu_count() or 1
+        member_count = 0
+        futures: Dict[str, Future] = {}
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            executor = ProcessPoolExecutor(max_workers=max_workers) if max_workers > 1 else None
+            try:
+                try:
+                    with tarfile.open(self.mbz_path, 'r|gz') as tar:
+                        for member in tar:
+                            member_count += 1
+                            if member.isfile():
+                                self._stream_member(tar, member, temp_dir, executor, futures)
+                except tarfile.TarError as e:
+                    self.result.add_error(f"Fichier tar.gz invalide: {e}")
+                    return False
+                except Exception as e:
+                    self.result.add_error(f"Erreur lecture archive: {e}")
+                    return False
+
+                for file_hash, future in futures.items():
+                    self.h5p_results[file_hash] = future.result()
+            finally:
+                if executor is not None:
+                    executor.shutdown(wait=True, cancel_futures=True)
+
+        # Même position que dans le mode standard (après la taille du fichier)
+        self.result.info.insert(1, f"Archive tar.gz valide ({member_count} fichiers)")
+        return True
+
+    def _stream_member(self, tar: tarfile.TarFile, member: tarfile.TarInfo, temp_dir: str,
+                       executor: Optional[ProcessPoolExecutor], futures: Dict[str, Future]):
+        """Traite un membre de l'archive en mode flux"""
+        try:
+            f = tar.extractfile(member)
+            if not member.name.startswith('files/'):
+                if self._needs_content(member.name):
+                    self.files_in_mbz[member.name] = f.read()
+                return
+
+            sha1 = hashlib.sha1()
+            chunk = f.read(self.STREAM_CHUNK_SIZE)
+            spool = None
+            if chunk.startswith(b'PK'):
+                # Zip : candidat H5P, conservé sur disque pour la validation
+                spool = tempfile.NamedTemporaryFile(dir=temp_dir, suffix='.zip', delete=False)
+            try:
+                while chunk:
+                    sha1.update(chunk)
+                    if spool is not None:
+                        spool.write(chunk)
+                    chunk = f.read(self.STREAM_CHUNK_SIZE)
+            finally:
+                if spool is not None:
+                    spool.close()
+        except Exception as e:
+            self.result.add_warning(f"Impossible de lire {member.name}: {e}")
+            return
+
+        file_hash = sha1.hexdigest()
+        already_seen = file_hash in self.file_references
+        self.file_references[file_hash] = member.name
+
+        if spool is None:
+            return
+        if already_seen:
+            # Contenu identique déjà validé
+            os.remove(spool.name)
+        elif executor is None:
+            self.h5p_results[file_hash] = _validate_spooled_h5p(
+                spool.name, file_hash, member.name, self.verbose)
+        else:
+            futures[file_hash] = executor.submit(
+                _validate_spooled_h5p, spool.name, file_hash, member.name, self.verbose)
+
     def _check_required_files(self):
         """Vérifie la présence des fichiers obligatoires"""
         for req_file in self.REQUIRED_FILES:
@@ -184,20 +341,18 @@ class MBZValidator:
         h5p_count = 0
 
         for file_hash, file_path in self.file_references.items():
-            content = self.files_in_mbz[file_path]
-
-            # Vérifier si c'est un fichier H5P (zip avec h5p.json)
-            try:
-                with zipfile.ZipFile(io.BytesIO(content), 'r') as zf:
-                    if 'h5p.json' in zf.namelist():
-                        h5p_count += 1
-                        self._validate_single_h5p(file_hash, file_path, zf)
-            except zipfile.BadZipFile:
-                # Pas un zip, probablement un PDF ou autre ressource
-                pass
-            except Exception as e:
-                if self.verbose:
-                    self.result.add_warning(f"Erreur vérification {file_path}: {e}")
+            if self.streaming:
+                # Déjà validé pendant la lecture (absent si ce n'est pas un zip)
+                outcome = self.h5p_results.get(file_hash)
+                if outcome is None:
+                    continue
+            else:
+                content = self.files_in_mbz[file_path]
+                outcome = validate_h5p_package(io.BytesIO(content), file_hash, file_path, self.verbose)
+
+            is_h5p, h5p_result = outcome
+            h5p_count += is_h5p
+            self.result.merge(h5p_result)
 
         self.result.add_info(f"Fichiers H5P validés: {h5p_count}")
 
@@ -446,10 +601,15 @@ def main():
     parser.add_argument('mbz_file', help="Chemin vers le fichier .mbz à valider")
     parser.add_argument('--verbose', '-v', action='store_true',
                         help="Afficher plus de détails")
+    parser.add_argument('--stream', action='store_true',
+                        help="Lecture en flux (un seul passage, mémoire constante) pour les gros backups")
+    parser.add_argument('--jobs', '-j', type=int,
+                        help="Processus de validation H5P en mode flux (défaut: nombre de CPU)")
 
     args = parser.parse_args()
 
-    validator = MBZValidator(args.mbz_file, verbose=args.verbose)
+    validator = MBZValidator(args.mbz_file, verbose=args.verbose,
+                             streaming=args.stream, jobs=args.jobs)
     result = validator.validate()
 
     # Code de sortie
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for shape overlap detection in inventory.py.
+
+Generates synthetic slides with 10 to 2000 shapes and times detect_overlaps()
+against the original pairwise scan, checking that both find the same
+overlapping_shapes (same IDs, same areas, same order).
+
+Usage:
+    python benchmark_overlaps.py
+    python benchmark_overlaps.py --sizes 10,100,1000 --repeat 5 --layout grid
+
+Layouts:
+    random: shapes of random size scattered over a 10" x 5.63" slide
+    grid:   a dense grid of small shapes, each slightly overlapping its neighbors
+"""
+
+import argparse
+import random
+import sys
+import time
+from typing import Dict, List
+
+from inventory import calculate_overlap, detect_overlaps
+
+SLIDE_WIDTH = 10.0  # inches
+SLIDE_HEIGHT = 5.63  # inches
+
+
+class SyntheticShape:
+    """Minimal stand-in for ShapeData: the fields detect_overlaps() uses."""
+
+    def __init__(self, shape_id: str, left: float, top: float, width: float, height: float):
+        self.shape_id = shape_id
+        self.left = left
+        self.top = top
+        self.width = width
+        self.height = height
+        self.overlapping_shapes: Dict[str, float] = {}
+
+
+def detect_overlaps_pairwise(shapes: List[SyntheticShape]) -> None:
+    """The original O(n²) implementation, used as the reference."""
+    n = len(shapes)
+    for i in range(n):
+        for j in range(i + 1, n):
+            shape1 = shapes[i]
+            shape2 = shapes[j]
+            rect1 = (shape1.left, shape1.top, shape1.width, shape1.height)
+            rect2 = (shape2.left, shape2.top, shape2.width, shape2.height)
+            overlaps, overlap_area = calculate_overlap(rect1, rect2)
+            if overlaps:
+                shape1.overlapping_shapes[shape2.shape_id] = overlap_area
+                shape2.overlapping_shapes[shape1.shape_id] = overlap_area
+
+
+def synthetic_slide(num_shapes: int, layout: str, seed: int) -> List[SyntheticShape]:
+    """Shapes rounded to 0.01" like ShapeData, sorted like sort_shapes_by_position()."""
+    rng = random.Random(seed)
+    rects = []
+    if layout == "grid":
+        cols = max(1, int((num_shapes * SLIDE_WIDTH / SLIDE_HEIGHT) ** 0.5))
+        rows = -(-num_shapes // cols)
+        cell_w, cell_h = SLIDE_WIDTH / cols, SLIDE_HEIGHT / rows
+        for k in range(num_shapes):
+            row, col = divmod(k, cols)
+            rects.append((col * cell_w, row * cell_h, cell_w * 1.3, cell_h * 1.3))
+    else:
+        for _ in range(num_shapes):
+            width = rng.uniform(0.1, 2.5)
+            height = rng.uniform(0.1, 1.2)
+            rects.append(
+                (
+                    rng.uniform(0, SLIDE_WIDTH - width),
+                    rng.uniform(0, SLIDE_HEIGHT - height),
+                    width,
+                    height,
+                )
+            )
+
+    rects = [tuple(round(v, 2) for v in rect) for rect in rects]
+    rects.sort(key=lambda r: (r[1], r[0]))
+    return [SyntheticShape(f"shape-{k}", *rect) for k, rect in enumerate(rects)]
+
+
+def time_detection(detect, num_shapes: int, layout: str, seed: int, repeat: int):
+    """Best time over repeat runs, and the overlaps found by the last run."""
+    best = float("inf")
+    shapes: List[SyntheticShape] = []
+    for _ in range(repeat):
+        shapes = synthetic_slide(num_shapes, layout, seed)
+        start = time.perf_counter()
+        detect(shapes)
+        best = min(best, time.perf_counter() - start)
+    return best, [list(s.overlapping_shapes.items()) for s in shapes]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark detect_overlaps() against the pairwise scan."
+    )
+    parser.add_argument(
+        "--sizes",
+        default="10,50,100,250,500,1000,2000",
+        help="Comma-separated shape counts per slide",
+    )
+    parser.add_argument(
+        "--layout", choices=["random", "grid"], default="random", help="Shape layout"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per size (best is kept)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    sizes = [int(n) for n in args.sizes.split(",") if n.strip()]
+
+    header = f"{'shapes':>7} {'pairs':>8} {'pairwise ms':>12} {'sweep ms':>10} {'speedup':>8}"
+    print(header)
+    print("-" * len(header))
+
+    mismatches = 0
+    for num_shapes in sizes:
+        pairwise_time, expected = time_detection(
+            detect_overlaps_pairwise, num_shapes, args.layout, args.seed, args.repeat
+        )
+        sweep_time, found = time_detection(
+            detect_overlaps, num_shapes, args.layout, args.seed, args.repeat
+        )
+        if found != expected:
+            mismatches += 1
+            print(f"MISMATCH with {num_shapes} shapes")
+
+        pairs = sum(len(items) for items in found) // 2
+        speedup = pairwise_time / sweep_time if sweep_time else float("inf")
+        print(
+            f"{num_shapes:>7} {pairs:>8} {pairwise_time * 1000:>12.2f} "
+            f"{sweep_time * 1000:>10.2f} {speedup:>7.1f}x"
+        )
+
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
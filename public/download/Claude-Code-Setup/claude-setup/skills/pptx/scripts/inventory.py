@@ -879,6 +879,49 @@ def calculate_overlap(
     return False, 0
 
 
+def find_overlapping_pairs(
+    rects: List[Tuple[float, float, float, float]], tolerance: float = 0.05
+) -> List[Tuple[int, int, float]]:
+    """Find all pairs of rectangles that overlap by more than tolerance.
+
+    Sweeps the rectangles by left edge, keeping only those whose right edge is
+    still more than tolerance past the current left edge. Candidates are then
+    checked with calculate_overlap(), so results match comparing every pair.
+
+    Args:
+        rects: (left, top, width, height) rectangles in inches
+        tolerance: Minimum overlap in inches (see calculate_overlap)
+
+    Returns:
+        Sorted list of (i, j, overlap_area) with i < j
+    """
+    order = sorted(range(len(rects)), key=lambda k: rects[k][0])
+    active: List[Tuple[float, int]] = []  # (right edge, index)
+    pairs = []
+
+    for j in order:
+        left, top, width, height = rects[j]
+        bottom = top + height
+
+        # Rectangles to the left of this one can't overlap it (or any later one)
+        # by more than tolerance: min(right1, right2) - left <= right1 - left
+        active = [(right, i) for right, i in active if right - left > tolerance]
+
+        for right, i in active:
+            other_top = rects[i][1]
+            other_bottom = other_top + rects[i][3]
+            if min(bottom, other_bottom) - max(top, other_top) <= tolerance:
+                continue
+            overlaps, overlap_area = calculate_overlap(rects[i], rects[j], tolerance)
+            if overlaps:
+                pairs.append((min(i, j), max(i, j), overlap_area))
+
+        active.append((left + width, j))
+
+    pairs.sort()
+    return pairs
+
+
 def detect_overlaps(shapes: List[ShapeData]) -> None:
     """Detect overlapping shapes and update their overlapping_shapes dictionaries.
 
@@ -888,27 +931,17 @@ def detect_overlaps(shapes: List[ShapeData]) -> None:
     Args:
         shapes: List of ShapeData objects with shape_id attributes set
     """
-    n = len(shapes)
+    # Ensure shape IDs are set
+    for i, shape in enumerate(shapes):
+        assert shape.shape_id, f"Shape at index {i} has no shape_id"
 
-    # Compare each pair of shapes
-    for i in range(n):
-        for j in range(i + 1, n):
-            shape1 = shapes[i]
-            shape2 = shapes[j]
+    rects = [(s.left, s.top, s.width, s.height) for s in shapes]
 
-            # Ensure shape IDs are set
-            assert shape1.shape_id, f"Shape at index {i} has no shape_id"
-            assert shape2.shape_id, f"Shape at index {j} has no shape_id"
-
-            rect1 = (shape1.left, shape1.top, shape1.width, shape1.height)
-            rect2 = (shape2.left, shape2.top, shape2.width, shape2.height)
-
-            overlaps, overlap_area = calculate_overlap(rect1, rect2)
-
-            if overlaps:
-                # Add shape IDs with overlap area in square inches
-                shape1.overlapping_shapes[shape2.shape_id] = overlap_area
-                shape2.overlapping_shapes[shape1.shape_id] = overlap_area
+    # Pairs come sorted, so entries are added in the same order as a pairwise scan
+    for i, j, overlap_area in find_overlapping_pairs(rects):
+        # Add shape IDs with overlap area in square inches
+        shapes[i].overlapping_shapes[shapes[j].shape_id] = overlap_area
+        shapes[j].overlapping_shapes[shapes[i].shape_id] = overlap_area
 
 
 def extract_text_inventory(
@@ -38,17 +38,30 @@ Examples:
 
     python thumbnail.py template.pptx analysis --outline-placeholders
     # Creates thumbnail grids with red outlines around text placeholders
+
+Rendering is pipelined: PDF page ranges are rasterized by parallel pdftoppm
+workers, and each grid is composed as soon as its slides are ready. Rendered
+slides are cached by content, so after editing one slide only that slide goes
+through soffice/pdftoppm again. Use --no-pipeline for the original
+sequential conversion and --no-cache to disable the cache.
 """
 
 import argparse
+import hashlib
+import json
+import os
+import shutil
 import subprocess
 import sys
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 from inventory import extract_text_inventory
 from PIL import Image, ImageDraw, ImageFont
 from pptx import Presentation
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
 
 # Constants
 THUMBNAIL_WIDTH = 300  # Fixed thumbnail width in pixels
@@ -63,6 +76,13 @@ BORDER_WIDTH = 2  # Border width around thumbnails
 FONT_SIZE_RATIO = 0.12  # Font size as fraction of thumbnail width
 LABEL_PADDING_RATIO = 0.4  # Label padding as fraction of font size
 
+# Pipeline / cache constants
+DEFAULT_CACHE_DIR = Path(tempfile.gettempdir()) / "pptx-thumbnail-cache"
+CACHE_VERSION = 1  # Bump to invalidate cached slide images
+RANGES_PER_WORKER = 4  # PDF page ranges per worker (smaller ranges stream sooner)
+# Relationships that do not affect how a slide renders
+IGNORED_RELTYPES = {RT.NOTES_SLIDE, RT.SLIDE}
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -86,6 +106,27 @@ def main():
         action="store_true",
         help="Outline text placeholders with a colored border",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Parallel pdftoppm / grid workers (default: CPU count)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=str(DEFAULT_CACHE_DIR),
+        help=f"Rendered slide cache directory (default: {DEFAULT_CACHE_DIR})",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Render every slide, without reading or updating the cache",
+    )
+    parser.add_argument(
+        "--no-pipeline",
+        action="store_true",
+        help="Convert all slides first, then build the grids sequentially",
+    )
 
     args = parser.parse_args()
 
@@ -118,23 +159,42 @@ def main():
                 if placeholder_regions:
                     print(f"Found placeholders on {len(placeholder_regions)} slides")
 
-            # Convert slides to images
-            slide_images = convert_to_images(input_path, Path(temp_dir), CONVERSION_DPI)
-            if not slide_images:
-                print("Error: No slides found")
-                sys.exit(1)
-
-            print(f"Found {len(slide_images)} slides")
-
-            # Create grids (max cols×(cols+1) images per grid)
-            grid_files = create_grids(
-                slide_images,
-                cols,
-                THUMBNAIL_WIDTH,
-                output_path,
-                placeholder_regions,
-                slide_dimensions,
-            )
+            if args.no_pipeline:
+                # Convert slides to images
+                slide_images = convert_to_images(
+                    input_path, Path(temp_dir), CONVERSION_DPI
+                )
+                if not slide_images:
+                    print("Error: No slides found")
+                    sys.exit(1)
+
+                print(f"Found {len(slide_images)} slides")
+
+                # Create grids (max cols×(cols+1) images per grid)
+                grid_files = create_grids(
+                    slide_images,
+                    cols,
+                    THUMBNAIL_WIDTH,
+                    output_path,
+                    placeholder_regions,
+                    slide_dimensions,
+                )
+            else:
+                cache = None if args.no_cache else SlideImageCache(args.cache_dir)
+                grid_files = create_grids_pipelined(
+                    input_path,
+                    Path(temp_dir),
+                    cols,
+                    THUMBNAIL_WIDTH,
+                    output_path,
+                    placeholder_regions,
+                    slide_dimensions,
+                    workers=max(1, args.workers),
+                    cache=cache,
+                )
+                if not grid_files:
+                    print("Error: No slides found")
+                    sys.exit(1)
 
             # Print saved files
             print(f"Created {len(grid_files)} grid(s):")
@@ -300,17 +360,10 @@ def create_grids(
             chunk_images, cols, width, start_idx, placeholder_regions, slide_dimensions
         )
 
-        # Generate output filename
-        if len(image_paths) <= max_images_per_grid:
-            # Single grid - use base filename without suffix
-            grid_filename = output_path
-        else:
-            # Multiple grids - insert index before extension with dash
-            stem = output_path.stem
-            suffix = output_path.suffix
-            grid_filename = output_path.parent / f"{stem}-{chunk_idx + 1}{suffix}"
-
         # Save grid
+        grid_filename = grid_output_path(
+            output_path, chunk_idx, len(image_paths), max_images_per_grid
+        )
         grid_filename.parent.mkdir(parents=True, exist_ok=True)
         grid.save(str(grid_filename), quality=JPEG_QUALITY)
         grid_files.append(str(grid_filename))
@@ -318,6 +371,17 @@ def create_grids(
     return grid_files
 
 
+def grid_output_path(output_path, chunk_idx, total_images, max_images_per_grid):
+    """Output filename of grid number chunk_idx (0-based)."""
+    if total_images <= max_images_per_grid:
+        # Single grid - use base filename without suffix
+        return output_path
+    # Multiple grids - insert index before extension with dash
+    stem = output_path.stem
+    suffix = output_path.suffix
+    return output_path.parent / f"{stem}-{chunk_idx + 1}{suffix}"
+
+
 def create_grid(
     image_paths,
     cols,
@@ -446,5 +510,281 @@ def create_grid(
     return grid
 
 
+# =============================================================================
+# Pipelined rendering
+# =============================================================================
+
+
+class SlideImageCache:
+    """Rendered slide images on disk, keyed by slide_cache_keys()."""
+
+    def __init__(self, cache_dir):
+        self.cache_dir = Path(cache_dir)
+
+    def get(self, key):
+        path = self.cache_dir / f"{key}.jpg"
+        return path if path.exists() else None
+
+    def put(self, key, image_path):
+        """Copy a rendered image into the cache and return the cached path."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self.cache_dir / f"{key}.jpg"
+        # Write then rename, so concurrent runs never see a partial image
+        tmp_path = self.cache_dir / f".{key}.{os.getpid()}.{threading.get_ident()}.tmp"
+        shutil.copyfile(image_path, tmp_path)
+        os.replace(tmp_path, path)
+        return path
+
+
+def slide_cache_keys(prs, dpi):
+    """Return one cache key per slide, from the content of everything it renders.
+
+    A key hashes the slide XML together with the parts it depends on (layout,
+    master, theme, images, charts...), the slide size and the DPI. Notes and
+    links to other slides are ignored. Slides with a slide number field also
+    hash their position, since moving them changes what they display.
+    """
+    part_digests = {}
+
+    def part_digest(part):
+        digest = part_digests.get(part.partname)
+        if digest is None:
+            digest = hashlib.sha256(part.blob).hexdigest()
+            part_digests[part.partname] = digest
+        return digest
+
+    keys = []
+    for idx, slide in enumerate(prs.slides):
+        parts = {}
+        stack = [slide.part]
+        while stack:
+            part = stack.pop()
+            if part.partname in parts:
+                continue
+            parts[part.partname] = part_digest(part)
+            for rel in part.rels.values():
+                if not rel.is_external and rel.reltype not in IGNORED_RELTYPES:
+                    stack.append(rel.target_part)
+
+        slide_xml = slide.part.blob
+        position = idx if b'type="slidenum"' in slide_xml else None
+        payload = [
+            CACHE_VERSION,
+            dpi,
+            prs.slide_width,
+            prs.slide_height,
+            position,
+            sorted(parts.items()),
+        ]
+        keys.append(hashlib.sha256(json.dumps(payload).encode("utf-8")).hexdigest())
+    return keys
+
+
+def convert_to_pdf(pptx_path, temp_dir, render_slides, total_slides):
+    """Convert the slides in render_slides (1-based) to a PDF with soffice.
+
+    When only some slides must be rendered, the others are hidden in a copy of
+    the deck (soffice skips hidden slides), so every slide keeps its position.
+    """
+    if len(render_slides) < total_slides:
+        prs = Presentation(str(pptx_path))
+        for idx, slide in enumerate(prs.slides):
+            if idx + 1 not in render_slides:
+                slide.element.set("show", "0")
+        pptx_path = temp_dir / "render-subset.pptx"
+        prs.save(str(pptx_path))
+
+    pdf_path = temp_dir / f"{pptx_path.stem}.pdf"
+    result = subprocess.run(
+        [
+            "soffice",
+            "--headless",
+            "--convert-to",
+            "pdf",
+            "--outdir",
+            str(temp_dir),
+            str(pptx_path),
+        ],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0 or not pdf_path.exists():
+        raise RuntimeError("PDF conversion failed")
+    return pdf_path
+
+
+def rasterize_page_range(pdf_path, temp_dir, dpi, first, last):
+    """Rasterize PDF pages first..last (1-based) and return {page: image path}."""
+    prefix = temp_dir / f"range-{first:04d}"
+    result = subprocess.run(
+        [
+            "pdftoppm",
+            "-jpeg",
+            "-r",
+            str(dpi),
+            "-f",
+            str(first),
+            "-l",
+            str(last),
+            str(pdf_path),
+            str(prefix),
+        ],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError("Image conversion failed")
+    # pdftoppm names pages prefix-N.jpg, zero-padded to the document's page count
+    images = {
+        int(path.stem.rsplit("-", 1)[1]): path
+        for path in temp_dir.glob(f"{prefix.name}-*.jpg")
+    }
+    if len(images) != last - first + 1:
+        raise RuntimeError("Image conversion failed")
+    return images
+
+
+def render_slide_images(pptx_path, prs, temp_dir, dpi, workers, cache=None):
+    """Render slides, yielding (slide_index, image_path) as soon as each is ready.
+
+    Cached slides come first. The rest are converted to PDF in one soffice run,
+    then rasterized in page ranges by parallel pdftoppm processes. Hidden
+    slides get a placeholder the size of the rendered slides.
+    """
+    total_slides = len(prs.slides)
+    hidden_slides = {
+        idx + 1
+        for idx, slide in enumerate(prs.slides)
+        if slide.element.get("show") == "0"
+    }
+    print(f"Total slides: {total_slides}")
+    if hidden_slides:
+        print(f"Hidden slides: {sorted(hidden_slides)}")
+
+    keys = slide_cache_keys(prs, dpi) if cache else [None] * total_slides
+
+    ready = {}  # slide_num -> image path
+    to_render = []
+    for slide_num in range(1, total_slides + 1):
+        if slide_num in hidden_slides:
+            continue
+        cached = cache.get(keys[slide_num - 1]) if cache else None
+        if cached:
+            ready[slide_num] = cached
+        else:
+            to_render.append(slide_num)
+
+    if cache:
+        print(f"Cached slides: {len(ready)}, to render: {len(to_render)}")
+
+    placeholder_path = None
+
+    def hidden_placeholders(size):
+        nonlocal placeholder_path
+        placeholder_path = temp_dir / "hidden.jpg"
+        create_hidden_slide_placeholder(size).save(placeholder_path, "JPEG")
+        for slide_num in sorted(hidden_slides):
+            yield slide_num - 1, placeholder_path
+
+    def emit(slide_num, path):
+        yield slide_num - 1, path
+        if placeholder_path is None and hidden_slides:
+            with Image.open(path) as img:
+                size = img.size
+            yield from hidden_placeholders(size)
+
+    for slide_num in sorted(ready):
+        yield from emit(slide_num, ready[slide_num])
+
+    if to_render:
+        print("Converting to PDF...")
+        pdf_path = convert_to_pdf(pptx_path, temp_dir, set(to_render), total_slides)
+
+        print(f"Converting to images at {dpi} DPI with {workers} worker(s)...")
+        pages = len(to_render)
+        range_size = max(1, -(-pages // (workers * RANGES_PER_WORKER)))
+        ranges = [
+            (first, min(first + range_size - 1, pages))
+            for first in range(1, pages + 1, range_size)
+        ]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(rasterize_page_range, pdf_path, temp_dir, dpi, f, l)
+                for f, l in ranges
+            ]
+            for future in as_completed(futures):
+                for page, path in sorted(future.result().items()):
+                    slide_num = to_render[page - 1]
+                    if cache:
+                        path = cache.put(keys[slide_num - 1], path)
+                    yield from emit(slide_num, path)
+
+    if placeholder_path is None and hidden_slides:
+        # Every slide is hidden: same default size as convert_to_images()
+        yield from hidden_placeholders((1920, 1080))
+
+
+def create_grids_pipelined(
+    pptx_path,
+    temp_dir,
+    cols,
+    width,
+    output_path,
+    placeholder_regions=None,
+    slide_dimensions=None,
+    workers=1,
+    cache=None,
+):
+    """Render slides and compose each grid as soon as all its slides are ready.
+
+    Produces the same grid files as convert_to_images() + create_grids().
+    """
+    print("Analyzing presentation...")
+    prs = Presentation(str(pptx_path))
+    total_slides = len(prs.slides)
+    if total_slides == 0:
+        return []
+
+    max_images_per_grid = cols * (cols + 1)
+    chunk_count = -(-total_slides // max_images_per_grid)
+    print(
+        f"Creating grids with {cols} columns (max {max_images_per_grid} images per grid)"
+    )
+
+    images = [None] * total_slides
+    missing = [
+        min(max_images_per_grid, total_slides - chunk_idx * max_images_per_grid)
+        for chunk_idx in range(chunk_count)
+    ]
+
+    def compose(chunk_idx):
+        start_idx = chunk_idx * max_images_per_grid
+        chunk_images = images[start_idx : start_idx + max_images_per_grid]
+        grid = create_grid(
+            chunk_images, cols, width, start_idx, placeholder_regions, slide_dimensions
+        )
+        grid_filename = grid_output_path(
+            output_path, chunk_idx, total_slides, max_images_per_grid
+        )
+        grid_filename.parent.mkdir(parents=True, exist_ok=True)
+        grid.save(str(grid_filename), quality=JPEG_QUALITY)
+        return str(grid_filename)
+
+    with ThreadPoolExecutor(max_workers=workers) as grid_executor:
+        grid_futures = {}
+        for slide_idx, path in render_slide_images(
+            pptx_path, prs, temp_dir, CONVERSION_DPI, workers, cache
+        ):
+            images[slide_idx] = path
+            chunk_idx = slide_idx // max_images_per_grid
+            missing[chunk_idx] -= 1
+            if missing[chunk_idx] == 0:
+                grid_futures[chunk_idx] = grid_executor.submit(compose, chunk_idx)
+
+        if len(grid_futures) != chunk_count:
+            raise RuntimeError("Image conversion failed")
+        return [grid_futures[i].result() for i in range(chunk_count)]
+
+
 if __name__ == "__main__":
     main()
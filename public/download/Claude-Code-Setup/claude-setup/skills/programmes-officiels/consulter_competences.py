@@ -28,6 +28,7 @@ class ConsulteurProgrammes:
             self.chemin_data = Path(chemin_data)
 
         self.programmes = {}
+        self._index = None
         self._charger_programmes()
 
     def _charger_programmes(self):
@@ -134,37 +135,85 @@ class ConsulteurProgrammes:
         # Normaliser les mots-clés (minuscules, sans accents)
         mots_cles_normalises = [self._normaliser_texte(mc) for mc in mots_cles]
 
-        resultats = []
-        programmes_a_chercher = {niveau: self.programmes[niveau]} if niveau else self.programmes
+        entrees, textes, _ = self._obtenir_index()
 
-        for niv, programme in programmes_a_chercher.items():
-            if "domaines" not in programme:
+        # Candidats via l'index inverse, puis vérification sur le texte normalisé
+        candidats = None
+        for mc in mots_cles_normalises:
+            positions = self._positions_candidates(mc)
+            if positions is not None:
+                candidats = positions if candidats is None else candidats & positions
+
+        positions = sorted(candidats) if candidats is not None else range(len(entrees))
+
+        resultats = []
+        for pos in positions:
+            niv, domaine, competence = entrees[pos]
+            if niveau and niv != niveau:
                 continue
 
-            for domaine in programme["domaines"]:
-                if "competences" not in domaine:
-                    continue
+            # Vérifier si tous les mots-clés sont présents
+            if all(mc in textes[pos] for mc in mots_cles_normalises):
+                resultats.append({
+                    **competence,
+                    "niveau": niv,
+                    "domaine": domaine.get("nom"),
+                    "domaine_code": domaine.get("code")
+                })
 
-                for competence in domaine["competences"]:
+        return resultats
+
+    def _obtenir_index(self):
+        """
+        Construit (une seule fois) l'index inverse des compétences chargées
+
+        Returns:
+            Tuple (entrées, textes normalisés, index token -> positions)
+        """
+        if self._index is not None:
+            return self._index
+
+        entrees = []
+        textes = []
+        tokens = {}
+
+        for niv, programme in self.programmes.items():
+            for domaine in programme.get("domaines", []):
+                for competence in domaine.get("competences", []):
                     # Rechercher dans l'intitulé, les capacités et les connaissances
-                    texte_a_chercher = " ".join([
+                    texte = self._normaliser_texte(" ".join([
                         competence.get("intitule", ""),
                         " ".join(competence.get("capacites", [])),
                         " ".join(competence.get("connaissances", []))
-                    ])
+                    ]))
 
-                    texte_normalise = self._normaliser_texte(texte_a_chercher)
+                    pos = len(entrees)
+                    entrees.append((niv, domaine, competence))
+                    textes.append(texte)
+                    for token in set(re.findall(r"\w+", texte)):
+                        tokens.setdefault(token, set()).add(pos)
 
-                    # Vérifier si tous les mots-clés sont présents
-                    if all(mc in texte_normalise for mc in mots_cles_normalises):
-                        resultats.append({
-                            **competence,
-                            "niveau": niv,
-                            "domaine": domaine.get("nom"),
-                            "domaine_code": domaine.get("code")
-                        })
+        self._index = (entrees, textes, tokens)
+        return self._index
 
-        return resultats
+    def _positions_candidates(self, mot_cle: str) -> Optional[set]:
+        """
+        Positions pouvant contenir le mot-clé normalisé (sur-ensemble)
+
+        Returns:
+            Ensemble de positions, ou None si le mot-clé ne contient aucun token
+        """
+        _, _, tokens = self._obtenir_index()
+
+        candidats = None
+        for token in re.findall(r"\w+", mot_cle):
+            positions = set()
+            for mot, postings in tokens.items():
+                if token in mot:
+                    positions |= postings
+            candidats = positions if candidats is None else candidats & positions
+
+        return candidats
 
     def chercher_par_theme(self, niveau: str, theme: str) -> List[Dict]:
         """
@@ -14,6 +14,8 @@ from pathlib import Path
 from collections import defaultdict
 from datetime import datetime
 
+from competence_service import build_first_level_table, save_first_level_table, FIRST_LEVEL_FILE
+
 # Chemins
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / "data"
@@ -271,6 +273,11 @@ def main():
 
     print(f"\nResume sauvegarde: {summary_file}")
 
+    # Table de premiere apparition (find_first_level, --only-new, prerequis)
+    table = build_first_level_table()
+    save_first_level_table(table)
+    print(f"Table de premiere apparition: {FIRST_LEVEL_FILE} ({table['meta']['total_terms']} termes)")
+
     if total_duplicates > 0:
         print(f"\n⚠️  ATTENTION: {total_duplicates} groupes de doublons detectes!")
         print("Consultez les fichiers *_doublons.json pour details.")
@@ -10,31 +10,9 @@ Usage:
 
 import json
 import argparse
-from pathlib import Path
 
-BASE_DIR = Path(__file__).parent.parent
-DATA_DIR = BASE_DIR / "data" / "aggregated"
+from competence_service import run_queries
 
-def load_flat_competences(niveau: str) -> list:
-    file_path = DATA_DIR / f"{niveau}_competences_flat.json"
-    if not file_path.exists():
-        return []
-    with open(file_path, "r", encoding="utf-8") as f:
-        return json.load(f).get("competences", [])
-
-def search_notion(competences: list, notion: str) -> list:
-    notion_lower = notion.lower()
-    results = []
-    for comp in competences:
-        searchable = " ".join([
-            comp.get("intitule", ""),
-            comp.get("description_detaillee", ""),
-            comp.get("sous_domaine", ""),
-            " ".join(comp.get("connaissances_associees", []))
-        ]).lower()
-        if notion_lower in searchable:
-            results.append(comp)
-    return results
 
 def main():
     parser = argparse.ArgumentParser(description="Verifier si une notion est au programme")
@@ -44,13 +22,14 @@ def main():
     args = parser.parse_args()
     niveau = args.niveau.upper()
 
-    competences = load_flat_competences(niveau)
-    if not competences:
+    count, results = run_queries([
+        {"op": "count", "niveau": niveau},
+        {"op": "in_program", "niveau": niveau, "notion": args.notion}
+    ])
+    if not count:
         print(json.dumps({"error": f"Niveau {niveau} non trouve"}))
         return
 
-    results = search_notion(competences, args.notion)
-
     output = {
         "question": f"Est-ce que '{args.notion}' est au programme de {niveau} ?",
         "reponse": len(results) > 0,
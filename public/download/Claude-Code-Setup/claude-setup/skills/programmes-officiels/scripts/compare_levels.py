@@ -9,31 +9,9 @@ Usage:
 
 import json
 import argparse
-from pathlib import Path
 
-BASE_DIR = Path(__file__).parent.parent
-DATA_DIR = BASE_DIR / "data" / "aggregated"
+from competence_service import run_queries
 
-def load_flat_competences(niveau: str) -> list:
-    file_path = DATA_DIR / f"{niveau}_competences_flat.json"
-    if not file_path.exists():
-        return []
-    with open(file_path, "r", encoding="utf-8") as f:
-        return json.load(f).get("competences", [])
-
-def search_notion(competences: list, notion: str) -> list:
-    notion_lower = notion.lower()
-    results = []
-    for comp in competences:
-        searchable = " ".join([
-            comp.get("intitule", ""),
-            comp.get("description_detaillee", ""),
-            comp.get("sous_domaine", ""),
-            " ".join(comp.get("connaissances_associees", []))
-        ]).lower()
-        if notion_lower in searchable:
-            results.append(comp)
-    return results
 
 def main():
     parser = argparse.ArgumentParser(description="Comparer deux niveaux")
@@ -45,8 +23,10 @@ def main():
     n1 = args.niveau1.upper()
     n2 = args.niveau2.upper()
 
-    comps1 = search_notion(load_flat_competences(n1), args.notion)
-    comps2 = search_notion(load_flat_competences(n2), args.notion)
+    comps1, comps2 = run_queries([
+        {"op": "notion", "niveau": n1, "notion": args.notion},
+        {"op": "notion", "niveau": n2, "notion": args.notion}
+    ])
 
     output = {
         "question": f"Comparaison de '{args.notion}' entre {n1} et {n2}",
@@ -13,17 +13,25 @@ Usage:
 Exemple:
     python compare_programs.py 16-Maths-4e-attendus-eduscol_1114746 nouveau_4e
 
-Le script compare page par page le texte extrait et identifie:
-- Pages identiques (aucune action requise)
+Le script aligne les pages de l'ancienne version sur celles de la nouvelle
+(empreintes MinHash du texte), ce qui gere les insertions, suppressions et
+deplacements de pages, puis identifie:
+- Pages identiques (aucune action requise, ou renumerotation si deplacees)
 - Pages modifiees (re-extraction necessaire)
 - Pages ajoutees (nouvelle extraction necessaire)
 - Pages supprimees (suppression des competences associees)
+
+Option --by-index : ancienne comparaison page N contre page N.
 """
 
 import sys
 import io
+import re
 import json
+import heapq
 import difflib
+import hashlib
+from dataclasses import dataclass
 from pathlib import Path
 from datetime import datetime
 from typing import Optional
@@ -40,10 +48,16 @@ PAGES_DIR = DATA_DIR / "pages"
 NOUVEAUX_DIR = SKILL_DIR / "nouveaux_programmes"
 REPORTS_DIR = DATA_DIR / "update_reports"
 
+# Seuil de similarite au-dessus duquel deux pages sont considerees identiques
+IDENTICAL_THRESHOLD = 0.95
+# Alignement: mots par shingle, taille des empreintes, Jaccard minimum
+SHINGLE_SIZE = 5
+SKETCH_SIZE = 64
+MATCH_THRESHOLD = 0.3
+
 
 def normalize_text(text: str) -> str:
     """Normalise le texte pour comparaison (enleve espaces, lowercase)."""
-    import re
     # Enlever espaces multiples
     text = re.sub(r'\s+', ' ', text)
     # Enlever accents pour comparaison robuste
@@ -93,14 +107,120 @@ def get_page_count(folder: Path) -> int:
     return len(list(folder.glob("page_*.txt")))
 
 
-def compare_programs(old_folder: Path, new_folder: Path) -> dict:
+# ============================================================================
+# ALIGNEMENT DES PAGES
+# ============================================================================
+
+@dataclass
+class PageFingerprint:
+    """Texte d'une page et ses empreintes."""
+    number: int
+    text: str
+    digest: str        # hash du texte normalise (pages strictement identiques)
+    sketch: list       # bottom-k MinHash des shingles de mots
+
+
+def page_shingles(norm: str) -> set:
+    """Hash 64 bits des suites de SHINGLE_SIZE mots du texte normalise."""
+    words = norm.split()
+    if len(words) <= SHINGLE_SIZE:
+        grams = [' '.join(words)] if words else []
+    else:
+        grams = (' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1))
+    return {int.from_bytes(hashlib.blake2b(g.encode('utf-8'), digest_size=8).digest(), 'big')
+            for g in grams}
+
+
+def fingerprint_page(number: int, text: str) -> PageFingerprint:
+    norm = normalize_text(text)
+    return PageFingerprint(
+        number=number,
+        text=text,
+        digest=hashlib.sha1(norm.encode('utf-8')).hexdigest(),
+        sketch=heapq.nsmallest(SKETCH_SIZE, page_shingles(norm)),
+    )
+
+
+def estimate_jaccard(sketch1: list, sketch2: list) -> float:
+    """Estime la similarite de Jaccard de deux pages a partir de leurs empreintes bottom-k."""
+    if not sketch1 and not sketch2:
+        return 1.0
+    if not sketch1 or not sketch2:
+        return 0.0
+    set1, set2 = set(sketch1), set(sketch2)
+    union = heapq.nsmallest(SKETCH_SIZE, set1 | set2)
+    return sum(1 for h in union if h in set1 and h in set2) / len(union)
+
+
+def align_pages(old_pages: list, new_pages: list) -> list:
     """
-    Compare deux versions d'un programme.
+    Apparie les pages anciennes et nouvelles.
+
+    1. Pages au texte normalise identique (meme numero de preference).
+    2. Pour les autres, candidats = pages partageant au moins une valeur
+       d'empreinte, appariees par Jaccard estime decroissant (puis par
+       proximite des numeros), au-dessus de MATCH_THRESHOLD.
 
     Returns:
-        Rapport de comparaison avec les actions a effectuer
+        Liste de (ancienne page, nouvelle page), triee par nouvelle page
     """
-    report = {
+    pairs = []
+    old_free = {p.number: p for p in old_pages}
+    new_free = {p.number: p for p in new_pages}
+
+    # 1. Correspondances exactes
+    by_digest = {}
+    for page in old_pages:
+        by_digest.setdefault(page.digest, []).append(page)
+    for page in new_pages:
+        candidates = [p for p in by_digest.get(page.digest, []) if p.number in old_free]
+        if candidates:
+            match = min(candidates, key=lambda p: abs(p.number - page.number))
+            pairs.append((match, page))
+            del old_free[match.number]
+            del new_free[page.number]
+
+    # 2. Correspondances approchees via un index inverse des empreintes
+    index = {}
+    for page in old_free.values():
+        for h in page.sketch:
+            index.setdefault(h, []).append(page)
+    scored = []
+    for page in new_free.values():
+        candidates = {p.number: p for h in page.sketch for p in index.get(h, [])}
+        for old in candidates.values():
+            similarity = estimate_jaccard(old.sketch, page.sketch)
+            if similarity >= MATCH_THRESHOLD:
+                scored.append((-similarity, abs(old.number - page.number), old.number, page.number))
+    for _, _, old_num, new_num in sorted(scored):
+        if old_num in old_free and new_num in new_free:
+            pairs.append((old_free.pop(old_num), new_free.pop(new_num)))
+
+    return sorted(pairs, key=lambda pair: pair[1].number)
+
+
+def line_similarity(text1: str, text2: str) -> float:
+    """Ratio de similarite (0-1) calcule sur les lignes normalisees, pondere par leur longueur."""
+    lines1 = [normalize_text(l) for l in text1.splitlines() if l.strip()]
+    lines2 = [normalize_text(l) for l in text2.splitlines() if l.strip()]
+    total = sum(map(len, lines1)) + sum(map(len, lines2))
+    if total == 0:
+        return 1.0
+    matcher = difflib.SequenceMatcher(None, lines1, lines2, autojunk=False)
+    matched = sum(len(line) for block in matcher.get_matching_blocks()
+                  for line in lines1[block.a:block.a + block.size])
+    return 2 * matched / total
+
+
+def load_fingerprints(folder: Path) -> list:
+    """Charge et indexe toutes les pages d'un dossier."""
+    return [fingerprint_page(n, load_page_text(folder, n) or '')
+            for n in range(1, get_page_count(folder) + 1)]
+
+
+def new_report(old_folder: Path, new_folder: Path) -> dict:
+    """Squelette du rapport de comparaison."""
+    return {
         'comparison_date': datetime.now().isoformat(),
         'old_program': old_folder.name,
         'new_program': new_folder.name,
@@ -118,6 +238,74 @@ def compare_programs(old_folder: Path, new_folder: Path) -> dict:
         }
     }
 
+
+def compare_programs(old_folder: Path, new_folder: Path) -> dict:
+    """
+    Compare deux versions d'un programme en alignant leurs pages.
+
+    Seules les paires alignees dont le texte differe sont comparees ligne a
+    ligne. Une page identique mais deplacee ne demande qu'une renumerotation.
+
+    Returns:
+        Rapport de comparaison avec les actions a effectuer
+    """
+    report = new_report(old_folder, new_folder)
+    old_pages = load_fingerprints(old_folder)
+    new_pages = load_fingerprints(new_folder)
+    pairs = align_pages(old_pages, new_pages)
+
+    for old, new in pairs:
+        if old.digest == new.digest:
+            similarity = 1.0
+        else:
+            similarity = line_similarity(old.text, new.text)
+
+        if similarity > IDENTICAL_THRESHOLD:
+            report['pages']['identical'].append({
+                'page': new.number,
+                'old_page': old.number,
+                'similarity': round(similarity, 3)
+            })
+        else:
+            diff = get_text_diff(old.text, new.text)
+            report['pages']['modified'].append({
+                'page': new.number,
+                'old_page': old.number,
+                'similarity': round(similarity, 3),
+                'diff_lines': len([l for l in diff if l.startswith('+') or l.startswith('-')]),
+                'diff_preview': diff[:20]
+            })
+
+    matched_old = {old.number for old, _ in pairs}
+    matched_new = {new.number for _, new in pairs}
+    for page in new_pages:
+        if page.number not in matched_new:
+            report['pages']['added'].append({
+                'page': page.number,
+                'text_length': len(page.text),
+                'preview': page.text[:200]
+            })
+    for page in old_pages:
+        if page.number not in matched_old:
+            report['pages']['removed'].append({
+                'page': page.number,
+                'text_length': len(page.text),
+                'preview': page.text[:200]
+            })
+
+    add_summary(report)
+    return report
+
+
+def compare_programs_by_index(old_folder: Path, new_folder: Path) -> dict:
+    """
+    Compare deux versions d'un programme page N contre page N (ancienne methode).
+
+    Returns:
+        Rapport de comparaison avec les actions a effectuer
+    """
+    report = new_report(old_folder, new_folder)
+
     old_pages = set(range(1, report['old_page_count'] + 1))
     new_pages = set(range(1, report['new_page_count'] + 1))
 
@@ -135,7 +323,7 @@ def compare_programs(old_folder: Path, new_folder: Path) -> dict:
 
         similarity = compute_similarity(old_text or '', new_text or '')
 
-        if similarity > 0.95:  # Quasi identiques
+        if similarity > IDENTICAL_THRESHOLD:  # Quasi identiques
             report['pages']['identical'].append({
                 'page': page_num,
                 'similarity': round(similarity, 3)
@@ -168,7 +356,12 @@ def compare_programs(old_folder: Path, new_folder: Path) -> dict:
             'preview': (old_text or '')[:200]
         })
 
-    # Calculer resume
+    add_summary(report)
+    return report
+
+
+def add_summary(report: dict):
+    """Calcule le resume et les actions requises du rapport."""
     total_changes = (
         len(report['pages']['modified']) +
         len(report['pages']['added']) +
@@ -177,6 +370,15 @@ def compare_programs(old_folder: Path, new_folder: Path) -> dict:
     report['summary']['total_changes'] = total_changes
 
     # Actions requises
+    moved = [p for p in report['pages']['identical'] if p.get('old_page', p['page']) != p['page']]
+    if moved:
+        report['summary']['actions_required'].append({
+            'action': 'RENUMBER',
+            'pages': [p['page'] for p in moved],
+            'mapping': {str(p['old_page']): p['page'] for p in moved},
+            'description': f"Renumeroter les extractions de {len(moved)} pages deplacees"
+        })
+
     if report['pages']['modified']:
         report['summary']['actions_required'].append({
             'action': 'RE_EXTRACT',
@@ -198,8 +400,6 @@ def compare_programs(old_folder: Path, new_folder: Path) -> dict:
             'description': f"Supprimer competences de {len(report['pages']['removed'])} pages"
         })
 
-    return report
-
 
 def generate_html_report(report: dict, output_path: Path):
     """Genere un rapport HTML visuel des differences."""
@@ -271,11 +471,11 @@ def generate_html_report(report: dict, output_path: Path):
         html += """
     <h2>Pages modifiees (detail)</h2>
     <table>
-        <tr><th>Page</th><th>Similarite</th><th>Lignes modifiees</th></tr>
+        <tr><th>Page</th><th>Ancienne page</th><th>Similarite</th><th>Lignes modifiees</th></tr>
 """
         for page in report['pages']['modified']:
             sim_pct = round(page['similarity'] * 100, 1)
-            html += f"        <tr><td>Page {page['page']}</td><td>{sim_pct}%</td><td>{page['diff_lines']}</td></tr>\n"
+            html += f"        <tr><td>Page {page['page']}</td><td>{page.get('old_page', page['page'])}</td><td>{sim_pct}%</td><td>{page['diff_lines']}</td></tr>\n"
 
         html += "    </table>\n"
 
@@ -323,7 +523,9 @@ def print_summary(report: dict):
     print(f"Ancien: {report['old_program']} ({report['old_page_count']} pages)")
     print(f"Nouveau: {report['new_program']} ({report['new_page_count']} pages)")
     print()
+    moved = [p for p in report['pages']['identical'] if p.get('old_page', p['page']) != p['page']]
     print(f"Pages identiques:  {len(report['pages']['identical']):3}")
+    print(f"  dont deplacees:  {len(moved):3}")
     print(f"Pages modifiees:   {len(report['pages']['modified']):3}")
     print(f"Pages ajoutees:    {len(report['pages']['added']):3}")
     print(f"Pages supprimees:  {len(report['pages']['removed']):3}")
@@ -377,6 +579,7 @@ def main():
 
     generate_html = "--html" in args
     generate_json = "--json" in args
+    by_index = "--by-index" in args
 
     old_folder = resolve_folder(old_name)
     new_folder = resolve_folder(new_name)
@@ -393,7 +596,10 @@ def main():
     print()
 
     # Comparer
-    report = compare_programs(old_folder, new_folder)
+    if by_index:
+        report = compare_programs_by_index(old_folder, new_folder)
+    else:
+        report = compare_programs(old_folder, new_folder)
 
     # Afficher resume
     print_summary(report)
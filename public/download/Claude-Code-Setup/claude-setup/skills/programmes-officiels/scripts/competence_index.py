@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""
+Index inverse persistant des competences normalisees.
+
+Construit a partir de data/normalized/*_normalized.json une base SQLite
+(data/index/search_index.sqlite) contenant :
+- les competences (ordre des fichiers identique a all_normalized.json)
+- le texte cherchable deja normalise (sans accents, minuscules)
+- un index inverse token -> positions
+- les suffixes de chaque token (recherche de sous-chaine par prefixe)
+- un index code / ancien code -> positions
+- un index (fichier, domaine) -> positions
+
+Seules les lignes utiles a une requete sont lues : une recherche par code ou
+par mot-cle ne charge ni les autres competences ni le vocabulaire complet.
+
+L'index est invalide automatiquement quand un fichier source change
+(mtime/taille, puis empreinte SHA-1 pour confirmer).
+
+Usage:
+    python competence_index.py --rebuild
+    python competence_index.py --stats
+    python competence_index.py --search "pythagore"
+"""
+
+import json
+import os
+import re
+import sys
+import sqlite3
+import hashlib
+import argparse
+import unicodedata
+from pathlib import Path
+from datetime import datetime
+from typing import List, Dict, Optional, Set, Iterable
+
+# ============================================================================
+# CHEMINS
+# ============================================================================
+BASE_DIR = Path(__file__).parent.parent
+NORMALIZED_DIR = BASE_DIR / "data" / "normalized"
+INDEX_DIR = BASE_DIR / "data" / "index"
+INDEX_FILE = INDEX_DIR / "search_index.sqlite"
+
+INDEX_VERSION = 2
+
+# Ordre des fichiers (identique a renormalize_codes.NIVEAU_TO_CODE)
+FILE_ORDER = [
+    "C3", "5E", "4E", "3E",
+    "2GT", "2STHR",
+    "1SPE", "1TECHNO", "1ENS_SCI", "1ENS_SCI_V2",
+    "TSPE", "TSPE_V2", "TCOMP", "TEXP", "TTECHNO",
+    "SPE_ANNEXE",
+]
+
+# Champs concatenes pour la recherche (meme ordre que search_keyword)
+SEARCHABLE_FIELDS = ["intitule", "description_detaillee", "formulation_bo", "sous_domaine"]
+SEARCHABLE_LIST_FIELDS = ["connaissances_associees", "keywords"]
+
+TOKEN_RE = re.compile(r"\w+")
+
+# Borne superieure des chaines commencant par un prefixe donne
+PREFIX_END = "\U0010ffff"
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE sources (
+    name TEXT PRIMARY KEY, rank INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL, sha1 TEXT NOT NULL
+);
+CREATE TABLE records (
+    pos INTEGER PRIMARY KEY, file_key TEXT NOT NULL, domaine_code TEXT NOT NULL,
+    text TEXT NOT NULL, data TEXT NOT NULL
+);
+CREATE INDEX records_domaine ON records (file_key, domaine_code);
+CREATE TABLE postings (
+    token TEXT NOT NULL, pos INTEGER NOT NULL, PRIMARY KEY (token, pos)
+) WITHOUT ROWID;
+CREATE TABLE suffixes (
+    suffix TEXT NOT NULL, token TEXT NOT NULL, PRIMARY KEY (suffix, token)
+) WITHOUT ROWID;
+CREATE TABLE codes (
+    code TEXT NOT NULL, pos INTEGER NOT NULL, PRIMARY KEY (code, pos)
+) WITHOUT ROWID;
+"""
+
+
+# ============================================================================
+# NORMALISATION
+# ============================================================================
+def normalize_text(text: str) -> str:
+    """Normalise le texte pour la recherche (accents, casse)."""
+    text = unicodedata.normalize('NFD', text)
+    text = ''.join(c for c in text if unicodedata.category(c) != 'Mn')
+    return text.lower()
+
+
+def searchable_text(comp: Dict) -> str:
+    """Texte cherchable d'une competence (non normalise)."""
+    parts = [comp.get(field, "") for field in SEARCHABLE_FIELDS]
+    parts.extend(" ".join(comp.get(field, [])) for field in SEARCHABLE_LIST_FIELDS)
+    return " ".join(parts)
+
+
+def tokenize(text: str) -> List[str]:
+    """Decoupe un texte deja normalise en tokens."""
+    return TOKEN_RE.findall(text)
+
+
+# ============================================================================
+# SIGNATURES DES SOURCES
+# ============================================================================
+def list_source_files() -> List[Path]:
+    """Liste les fichiers *_normalized.json dans l'ordre de all_normalized.json."""
+    files = {
+        p.name[:-len("_normalized.json")]: p
+        for p in NORMALIZED_DIR.glob("*_normalized.json")
+        if p.name != "all_normalized.json"
+    }
+    ordered = [files.pop(key) for key in FILE_ORDER if key in files]
+    ordered.extend(files[key] for key in sorted(files))
+    return ordered
+
+
+def file_sha1(path: Path) -> str:
+    """Empreinte SHA-1 d'un fichier."""
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def source_signature(path: Path, with_hash: bool = True) -> Dict:
+    """Signature d'un fichier source (mtime, taille, empreinte)."""
+    stat = path.stat()
+    signature = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+    if with_hash:
+        signature["sha1"] = file_sha1(path)
+    return signature
+
+
+def check_sources(sources: Dict) -> Optional[bool]:
+    """
+    Compare les sources enregistrees dans l'index avec le disque.
+
+    Returns:
+        True si identiques, None si seuls les mtime ont change (contenu
+        identique), False si l'index doit etre reconstruit.
+    """
+    current = list_source_files()
+    if [p.name for p in current] != list(sources.keys()):
+        return False
+
+    touched = False
+    for path in current:
+        saved = sources[path.name]
+        stat = path.stat()
+        if stat.st_mtime_ns == saved.get("mtime_ns") and stat.st_size == saved.get("size"):
+            continue
+        if stat.st_size != saved.get("size") or file_sha1(path) != saved.get("sha1"):
+            return False
+        saved["mtime_ns"] = stat.st_mtime_ns
+        touched = True
+
+    return None if touched else True
+
+
+# ============================================================================
+# CONSTRUCTION
+# ============================================================================
+def build_index_file(index_file: Path = INDEX_FILE):
+    """
+    Construit la base de l'index a partir des fichiers normalises.
+
+    La base est ecrite dans un fichier temporaire puis renommee : un lecteur
+    voit toujours l'ancienne ou la nouvelle base complete.
+    """
+    index_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = index_file.with_name(index_file.name + ".tmp")
+    if tmp_file.exists():
+        tmp_file.unlink()
+
+    conn = sqlite3.connect(str(tmp_file))
+    try:
+        conn.executescript(SCHEMA)
+        pos = 0
+        vocabulary: Set[str] = set()
+        all_codes: Set[str] = set()
+
+        for rank, path in enumerate(list_source_files()):
+            file_key = path.name[:-len("_normalized.json")]
+            signature = source_signature(path)
+            conn.execute(
+                "INSERT INTO sources VALUES (?, ?, ?, ?, ?)",
+                (path.name, rank, signature["mtime_ns"], signature["size"], signature["sha1"]))
+
+            with open(path, "r", encoding="utf-8") as f:
+                competences = json.load(f).get("competences", [])
+
+            records = []
+            postings = []
+            codes = []
+            for comp in competences:
+                text = normalize_text(searchable_text(comp))
+                records.append((pos, file_key, comp.get("domaine_code", ""), text,
+                                json.dumps(comp, ensure_ascii=False, separators=(",", ":"))))
+
+                tokens = set(tokenize(text))
+                vocabulary.update(tokens)
+                postings.extend((token, pos) for token in tokens)
+
+                values = {comp.get(field, "").upper() for field in ("code", "old_code")}
+                values.discard("")
+                all_codes.update(values)
+                codes.extend((value, pos) for value in values)
+                pos += 1
+
+            conn.executemany("INSERT INTO records VALUES (?, ?, ?, ?, ?)", records)
+            conn.executemany("INSERT INTO postings VALUES (?, ?)", postings)
+            conn.executemany("INSERT INTO codes VALUES (?, ?)", codes)
+
+        conn.executemany(
+            "INSERT INTO suffixes VALUES (?, ?)",
+            ((token[i:], token) for token in vocabulary for i in range(len(token))))
+
+        meta = {
+            "version": INDEX_VERSION,
+            "generated": datetime.now().isoformat(),
+            "total": pos,
+            "tokens": len(vocabulary),
+            "codes": len(all_codes),
+        }
+        conn.executemany("INSERT INTO meta VALUES (?, ?)",
+                         ((key, json.dumps(value)) for key, value in meta.items()))
+        conn.commit()
+    finally:
+        conn.close()
+
+    os.replace(tmp_file, index_file)
+
+
+def rebuild_index(index_file: Path = INDEX_FILE) -> "CompetenceIndex":
+    """Reconstruit l'index et le sauvegarde."""
+    build_index_file(index_file)
+    return CompetenceIndex(index_file)
+
+
+# ============================================================================
+# INDEX SUR DISQUE
+# ============================================================================
+class CompetenceIndex:
+    """
+    Index inverse des competences normalisees, lu a la demande.
+
+    Les competences lues sont conservees : une meme position renvoie
+    toujours le meme objet, ce qui permet position(comp).
+    """
+
+    def __init__(self, index_file: Path = INDEX_FILE):
+        self.index_file = index_file
+        self._conn = sqlite3.connect(index_file.resolve().as_uri() + "?mode=ro", uri=True)
+        self.meta = {key: json.loads(value)
+                     for key, value in self._conn.execute("SELECT key, value FROM meta")}
+        self._records: Dict[int, Dict] = {}
+        self._positions: Dict[int, int] = {}
+        self._keyword_cache: Dict[str, Set[int]] = {}
+
+    def __len__(self) -> int:
+        return self.meta["total"]
+
+    def close(self):
+        self._conn.close()
+
+    def sources(self) -> Dict:
+        """Signatures des fichiers sources, dans l'ordre de l'index."""
+        return {
+            name: {"mtime_ns": mtime_ns, "size": size, "sha1": sha1}
+            for name, mtime_ns, size, sha1 in self._conn.execute(
+                "SELECT name, mtime_ns, size, sha1 FROM sources ORDER BY rank")
+        }
+
+    def _load(self, rows) -> List[Dict]:
+        """Competences des lignes (pos, data), deja lues ou decodees."""
+        result = []
+        for pos, data in rows:
+            comp = self._records.get(pos)
+            if comp is None:
+                comp = json.loads(data)
+                self._records[pos] = comp
+                self._positions[id(comp)] = pos
+            result.append(comp)
+        return result
+
+    def record(self, pos: int) -> Optional[Dict]:
+        """Competence a la position pos."""
+        if pos in self._records:
+            return self._records[pos]
+        rows = self._conn.execute("SELECT pos, data FROM records WHERE pos = ?", (pos,)).fetchall()
+        return self._load(rows)[0] if rows else None
+
+    def position(self, comp: Dict) -> Optional[int]:
+        """Position d'une competence dans l'index (None si non indexee)."""
+        return self._positions.get(id(comp))
+
+    def competences(self, file_key: str, domaine_code: Optional[str] = None) -> List[Dict]:
+        """Competences d'un fichier de niveau, optionnellement d'un domaine."""
+        if domaine_code:
+            rows = self._conn.execute(
+                "SELECT pos, data FROM records WHERE file_key = ? AND domaine_code = ? ORDER BY pos",
+                (file_key, domaine_code))
+        else:
+            rows = self._conn.execute(
+                "SELECT pos, data FROM records WHERE file_key = ? ORDER BY pos", (file_key,))
+        return self._load(rows)
+
+    def get_by_code(self, code: str) -> Optional[Dict]:
+        """Premiere competence dont le code ou l'ancien code correspond."""
+        row = self._conn.execute(
+            "SELECT MIN(pos) FROM codes WHERE code = ?", (code.upper(),)).fetchone()
+        return self.record(row[0]) if row[0] is not None else None
+
+    def match_positions(self, keywords_normalized: Iterable[str]) -> Set[int]:
+        """Positions dont le texte contient au moins un des mots-cles (OU)."""
+        matched = set()
+        for kw in keywords_normalized:
+            cached = self._keyword_cache.get(kw)
+            if cached is not None:
+                matched.update(cached)
+                continue
+            # Un token du mot-cle est sous-chaine d'un token du texte : les
+            # suffixes commencant par ce token donnent les candidats, le
+            # texte complet n'est verifie que pour eux
+            sql = "SELECT pos FROM records WHERE instr(text, ?) > 0"
+            params = [kw]
+            for token in dict.fromkeys(tokenize(kw)):
+                sql += (" AND pos IN (SELECT p.pos FROM suffixes s"
+                        " JOIN postings p ON p.token = s.token"
+                        " WHERE s.suffix >= ? AND s.suffix < ?)")
+                params.extend((token, token + PREFIX_END))
+            cached = {pos for (pos,) in self._conn.execute(sql, params)}
+            self._keyword_cache[kw] = cached
+            matched.update(cached)
+        return matched
+
+
+_LOADED_INDEX: Optional[CompetenceIndex] = None
+
+
+def open_index(index_file: Path) -> Optional[CompetenceIndex]:
+    """Ouvre l'index s'il est a jour (None s'il est absent, perime ou illisible)."""
+    if not index_file.exists():
+        return None
+    try:
+        index = CompetenceIndex(index_file)
+        if index.meta.get("version") != INDEX_VERSION:
+            index.close()
+            return None
+        sources = index.sources()
+        state = check_sources(sources)
+        if state is False:
+            index.close()
+            return None
+        if state is None:
+            # Contenu identique, seules les dates ont change
+            with sqlite3.connect(str(index_file)) as conn:
+                conn.executemany(
+                    "UPDATE sources SET mtime_ns = ? WHERE name = ?",
+                    ((saved["mtime_ns"], name) for name, saved in sources.items()))
+            conn.close()
+        return index
+    except (sqlite3.Error, json.JSONDecodeError, KeyError, OSError):
+        return None
+
+
+def load_index(index_file: Path = INDEX_FILE, rebuild: bool = True) -> Optional[CompetenceIndex]:
+    """
+    Ouvre l'index sur disque, le reconstruit s'il est absent ou perime.
+    Retourne None s'il n'y a aucune donnee normalisee.
+    """
+    if not list_source_files():
+        return None
+
+    index = open_index(index_file)
+    if index is not None:
+        return index
+    return rebuild_index(index_file) if rebuild else None
+
+
+def get_index() -> Optional[CompetenceIndex]:
+    """Index partage du processus (ouvert une seule fois)."""
+    global _LOADED_INDEX
+    if _LOADED_INDEX is None:
+        _LOADED_INDEX = load_index()
+    return _LOADED_INDEX
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+def main():
+    parser = argparse.ArgumentParser(description="Index inverse des competences normalisees")
+    parser.add_argument("--rebuild", action="store_true", help="Reconstruire l'index")
+    parser.add_argument("--stats", action="store_true", help="Statistiques de l'index")
+    parser.add_argument("--search", "-s", help="Tester une recherche (mot-cle exact)")
+
+    args = parser.parse_args()
+
+    if args.rebuild:
+        index = rebuild_index()
+        print(f"[OK] Index reconstruit: {INDEX_FILE}")
+    else:
+        index = load_index()
+
+    if index is None:
+        print(f"[ERREUR] Aucun fichier normalise dans {NORMALIZED_DIR}")
+        sys.exit(1)
+
+    if args.stats or not args.search:
+        print(json.dumps({
+            "fichier": str(INDEX_FILE),
+            "generated": index.meta.get("generated"),
+            "competences": len(index),
+            "tokens": index.meta.get("tokens"),
+            "codes": index.meta.get("codes"),
+        }, ensure_ascii=True, indent=2))
+
+    if args.search:
+        positions = sorted(index.match_positions([normalize_text(args.search)]))
+        for pos in positions:
+            comp = index.record(pos)
+            print(f"[{comp.get('code', 'N/A')}] {comp.get('intitule', '')}")
+        print(f"\n{len(positions)} resultat(s)")
+
+
+if __name__ == "__main__":
+    main()
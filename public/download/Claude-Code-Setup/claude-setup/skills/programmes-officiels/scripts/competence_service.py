@@ -0,0 +1,759 @@
+#!/usr/bin/env python3
+"""
+Service de requetes residant pour les competences (fichiers *_competences_flat.json).
+
+Le service charge une seule fois tous les niveaux agreges et repond a des
+lots de requetes en un aller-retour. Les scripts get_prerequisites.py,
+find_first_level.py, compare_levels.py, check_in_program.py,
+get_progression.py et search_advanced.py l'utilisent automatiquement
+quand il tourne, et retombent sur une lecture locale sinon.
+
+Protocole: une ligne JSON par requete, une ligne JSON par reponse.
+    {"op": "notion", "niveau": "4E", "notion": "pythagore"}
+    {"batch": [{"op": "prerequisites", ...}, {"op": "first_level", ...}]}
+
+Reponse: {"ok": true, "result": ...} ou {"ok": false, "error": "..."}
+(une liste de reponses pour un lot).
+
+Operations:
+    notion         niveau, notion            -> competences du niveau
+    filter         niveau, query, domaine, type, exclude -> competences
+    prerequisites  niveau, notion            -> {niveau_inferieur: competences}
+    presence       notion                    -> {niveau: nombre de competences}
+    first_level    notion, [niveaux]         -> premier niveau, presence et
+                                                premieres competences (3 max)
+    in_program     niveau, notion            -> competences du niveau
+    count          niveau                    -> nombre de competences
+    levels                                   -> niveaux disponibles
+
+Usage:
+    python competence_service.py serve            # socket locale (arriere-plan)
+    python competence_service.py stdio            # lignes JSON sur stdin/stdout
+    python competence_service.py query '{"op": "first_level", "notion": "pythagore"}'
+    python competence_service.py status
+    python competence_service.py stop
+"""
+
+import os
+import re
+import sys
+import json
+import socket
+import sqlite3
+import hashlib
+import argparse
+import tempfile
+import threading
+import socketserver
+from pathlib import Path
+from datetime import datetime
+from typing import List, Dict, Optional, Tuple
+
+BASE_DIR = Path(__file__).parent.parent
+DATA_DIR = BASE_DIR / "data" / "aggregated"
+SERVICE_DIR = BASE_DIR / "data" / "index"
+ADDRESS_FILE = SERVICE_DIR / "competence_service.json"
+# Chemin court (limite ~100 caracteres des sockets Unix), unique par installation
+SOCKET_FILE = Path(tempfile.gettempdir()) / (
+    "competence_service_" + hashlib.sha1(str(BASE_DIR.resolve()).encode("utf-8")).hexdigest()[:12] + ".sock"
+)
+
+NIVEAUX = ["C3", "5E", "4E", "3E"]
+NIVEAUX_ORDER = {"C3": 0, "5E": 1, "4E": 2, "3E": 3}
+
+# Table de premiere apparition (construite par aggregate_competences.py)
+FIRST_LEVEL_FILE = DATA_DIR / "first_level_table.sqlite"
+FIRST_LEVEL_VERSION = 3
+FIRST_LEVEL_SAMPLE = 3
+TERM_RE = re.compile(r"\w+")
+
+CONNECT_TIMEOUT = 0.5
+REQUEST_TIMEOUT = 30.0
+
+
+# ============================================================================
+# CHARGEMENT ET RECHERCHE (partages avec les scripts CLI)
+# ============================================================================
+def load_flat_competences(niveau: str) -> list:
+    file_path = DATA_DIR / f"{niveau}_competences_flat.json"
+    if not file_path.exists():
+        return []
+    with open(file_path, "r", encoding="utf-8") as f:
+        return json.load(f).get("competences", [])
+
+
+def notion_text(comp: dict) -> str:
+    """Texte cherchable d'une competence pour les recherches par notion."""
+    return " ".join([
+        comp.get("intitule", ""),
+        comp.get("description_detaillee", ""),
+        comp.get("sous_domaine", ""),
+        " ".join(comp.get("connaissances_associees", []))
+    ]).lower()
+
+
+def brief_text(comp: dict) -> str:
+    """Intitule et description d'une competence (nouveaute d'une notion, --only-new)."""
+    return " ".join([
+        comp.get("intitule", ""),
+        comp.get("description_detaillee", "")
+    ]).lower()
+
+
+def search_notion(competences: list, notion: str) -> list:
+    notion_lower = notion.lower()
+    return [comp for comp in competences if notion_lower in notion_text(comp)]
+
+
+def match_query(comp: dict, query: str, exclude: Optional[str] = None) -> bool:
+    """Verifie si une competence correspond a la requete (search_advanced)."""
+    searchable = " ".join([
+        comp.get("intitule", ""),
+        comp.get("description_detaillee", ""),
+        comp.get("formulation_bo", ""),
+        comp.get("sous_domaine", ""),
+        " ".join(comp.get("connaissances_associees", []))
+    ]).lower()
+
+    if query.lower() not in searchable:
+        return False
+
+    if exclude and exclude.lower() in searchable:
+        return False
+
+    return True
+
+
+def filter_competences(
+    competences: list,
+    query: str,
+    domaine: Optional[str] = None,
+    type_comp: Optional[str] = None,
+    exclude: Optional[str] = None
+) -> list:
+    """Filtre les competences selon les criteres."""
+    results = []
+    for comp in competences:
+        if not match_query(comp, query, exclude):
+            continue
+        if domaine and comp.get("domaine", "").upper() != domaine.upper():
+            continue
+        if type_comp and comp.get("type", "") != type_comp:
+            continue
+        results.append(comp)
+    return results
+
+
+def first_level_of(notion: str) -> Optional[str]:
+    """
+    Premier niveau (college) dont l'intitule ou la description contient la
+    notion (regle de search_advanced --only-new), None si absente.
+    """
+    term = notion.lower()
+    if TERM_RE.fullmatch(term):
+        with _FIRST_LEVEL_LOCK:
+            table = load_first_level_table()
+            if table is not None:
+                level_idx = table.brief_level(term)
+                return table.meta["niveaux"][level_idx] if level_idx is not None else None
+    for niveau in NIVEAUX:
+        if any(term in brief_text(comp) for comp in load_flat_competences(niveau)):
+            return niveau
+    return None
+
+
+def get_lower_levels(niveau: str) -> list:
+    """Retourne les niveaux inferieurs."""
+    current_order = NIVEAUX_ORDER.get(niveau.upper(), 0)
+    return [n for n, order in NIVEAUX_ORDER.items() if order < current_order]
+
+
+# ============================================================================
+# TABLE DE PREMIERE APPARITION
+# ============================================================================
+FIRST_LEVEL_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE terms (
+    term TEXT PRIMARY KEY, level_idx INTEGER NOT NULL,
+    positions TEXT NOT NULL, counts TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE brief_terms (term TEXT PRIMARY KEY, level_idx INTEGER NOT NULL) WITHOUT ROWID;
+CREATE TABLE samples (
+    level_idx INTEGER NOT NULL, pos INTEGER NOT NULL, data TEXT NOT NULL,
+    PRIMARY KEY (level_idx, pos)
+) WITHOUT ROWID;
+"""
+
+
+def _flat_sources(niveaux: List[str]) -> Dict[str, list]:
+    """Signatures (mtime, taille) des fichiers plats utilises par la table."""
+    sources = {}
+    for niveau in niveaux:
+        file_path = DATA_DIR / f"{niveau}_competences_flat.json"
+        if file_path.exists():
+            stat = file_path.stat()
+            sources[niveau] = [stat.st_mtime_ns, stat.st_size]
+    return sources
+
+
+def build_first_level_table(niveaux: List[str] = NIVEAUX) -> dict:
+    """
+    Construit la table terme -> premiere apparition.
+
+    Chaque terme est une sous-chaine d'un mot du texte cherchable (meme texte
+    que search_notion), ce qui permet de repondre exactement a toute notion
+    d'un seul mot. Valeur: [indice du premier niveau, positions des premieres
+    competences dans ce niveau, nombre de competences par niveau].
+    Les competences citees dans les positions sont gardees dans "samples",
+    par (indice du niveau, position). "brief_terms" donne le premier niveau
+    de chaque terme dans l'intitule ou la description seuls (brief_text).
+    """
+    terms: Dict[str, list] = {}
+    samples: Dict[tuple, dict] = {}
+    brief_terms: Dict[str, int] = {}
+
+    for level_idx, niveau in enumerate(niveaux):
+        competences = load_flat_competences(niveau)
+        for pos, comp in enumerate(competences):
+            substrings = set()
+            for word in set(TERM_RE.findall(notion_text(comp))):
+                for i in range(len(word)):
+                    for j in range(i + 1, len(word) + 1):
+                        substrings.add(word[i:j])
+
+            for term in substrings:
+                entry = terms.get(term)
+                if entry is None:
+                    entry = terms[term] = [level_idx, [], [0] * len(niveaux)]
+                entry[2][level_idx] += 1
+                if entry[0] == level_idx and len(entry[1]) < FIRST_LEVEL_SAMPLE:
+                    entry[1].append(pos)
+                    samples[(level_idx, pos)] = comp
+
+            for word in set(TERM_RE.findall(brief_text(comp))):
+                for i in range(len(word)):
+                    for j in range(i + 1, len(word) + 1):
+                        brief_terms.setdefault(word[i:j], level_idx)
+
+    return {
+        "meta": {
+            "version": FIRST_LEVEL_VERSION,
+            "generated": datetime.now().isoformat(),
+            "niveaux": list(niveaux),
+            "sources": _flat_sources(niveaux),
+            "total_terms": len(terms)
+        },
+        "terms": terms,
+        "brief_terms": brief_terms,
+        "samples": samples
+    }
+
+
+def save_first_level_table(table: dict, path: Path = FIRST_LEVEL_FILE):
+    """Sauvegarde la table (base SQLite, remplacee de facon atomique)."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    if tmp_path.exists():
+        tmp_path.unlink()
+
+    conn = sqlite3.connect(str(tmp_path))
+    try:
+        conn.executescript(FIRST_LEVEL_SCHEMA)
+        conn.executemany("INSERT INTO meta VALUES (?, ?)",
+                         ((key, json.dumps(value)) for key, value in table["meta"].items()))
+        conn.executemany(
+            "INSERT INTO terms VALUES (?, ?, ?, ?)",
+            ((term, level_idx, json.dumps(positions), json.dumps(counts))
+             for term, (level_idx, positions, counts) in table["terms"].items()))
+        conn.executemany("INSERT INTO brief_terms VALUES (?, ?)", table["brief_terms"].items())
+        conn.executemany(
+            "INSERT INTO samples VALUES (?, ?, ?)",
+            ((level_idx, pos, json.dumps(comp, ensure_ascii=False, separators=(",", ":")))
+             for (level_idx, pos), comp in table["samples"].items()))
+        conn.commit()
+    finally:
+        conn.close()
+
+    os.replace(tmp_path, path)
+
+
+class FirstLevelTable:
+    """Table de premiere apparition sur disque, lue terme par terme."""
+
+    def __init__(self, path: Path = FIRST_LEVEL_FILE):
+        self._conn = sqlite3.connect(path.resolve().as_uri() + "?mode=ro", uri=True,
+                                     check_same_thread=False)
+        self.meta = {key: json.loads(value)
+                     for key, value in self._conn.execute("SELECT key, value FROM meta")}
+
+    def close(self):
+        self._conn.close()
+
+    def entry(self, term: str) -> Optional[list]:
+        """[indice du premier niveau, positions, nombres par niveau] ou None."""
+        row = self._conn.execute(
+            "SELECT level_idx, positions, counts FROM terms WHERE term = ?", (term,)).fetchone()
+        if row is None:
+            return None
+        return [row[0], json.loads(row[1]), json.loads(row[2])]
+
+    def brief_level(self, term: str) -> Optional[int]:
+        """Indice du premier niveau ou term apparait dans brief_text, ou None."""
+        row = self._conn.execute(
+            "SELECT level_idx FROM brief_terms WHERE term = ?", (term,)).fetchone()
+        return row[0] if row else None
+
+    def samples(self, level_idx: int, positions: List[int]) -> list:
+        """Competences du niveau level_idx aux positions donnees."""
+        comps = []
+        for pos in positions:
+            row = self._conn.execute(
+                "SELECT data FROM samples WHERE level_idx = ? AND pos = ?",
+                (level_idx, pos)).fetchone()
+            comps.append(json.loads(row[0]))
+        return comps
+
+
+_FIRST_LEVEL_TABLE: Optional[FirstLevelTable] = None
+# Le service repond depuis plusieurs threads : ouverture, reconstruction et
+# lectures de la table partagee se font sous ce verrou
+_FIRST_LEVEL_LOCK = threading.RLock()
+
+
+def _open_first_level_table() -> Optional[FirstLevelTable]:
+    """Ouvre la table sur disque si elle est a jour (None sinon)."""
+    if not FIRST_LEVEL_FILE.exists():
+        return None
+    try:
+        table = FirstLevelTable(FIRST_LEVEL_FILE)
+    except (sqlite3.Error, json.JSONDecodeError, OSError):
+        return None
+    meta = table.meta
+    if (meta.get("version") != FIRST_LEVEL_VERSION
+            or meta.get("niveaux") != NIVEAUX
+            or meta.get("sources") != _flat_sources(NIVEAUX)):
+        table.close()
+        return None
+    return table
+
+
+def load_first_level_table() -> Optional[FirstLevelTable]:
+    """
+    Ouvre la table de premiere apparition; la reconstruit si elle est
+    absente ou si un fichier plat a change depuis sa generation.
+    """
+    global _FIRST_LEVEL_TABLE
+
+    with _FIRST_LEVEL_LOCK:
+        if _FIRST_LEVEL_TABLE is not None:
+            meta = _FIRST_LEVEL_TABLE.meta
+            if meta["sources"] == _flat_sources(meta["niveaux"]):
+                return _FIRST_LEVEL_TABLE
+            _FIRST_LEVEL_TABLE.close()
+            _FIRST_LEVEL_TABLE = None
+
+        table = _open_first_level_table()
+        if table is None:
+            if not _flat_sources(NIVEAUX):
+                return None
+            save_first_level_table(build_first_level_table())
+            table = FirstLevelTable(FIRST_LEVEL_FILE)
+
+        _FIRST_LEVEL_TABLE = table
+        return table
+
+
+def lookup_notion(notion: str) -> Optional[dict]:
+    """
+    Premiere apparition d'une notion via la table.
+
+    Returns:
+        {"premier_niveau", "competences", "presence"} ou None si la notion
+        n'est pas un mot unique (il faut alors parcourir les competences).
+    """
+    term = notion.lower()
+    if not TERM_RE.fullmatch(term):
+        return None
+
+    with _FIRST_LEVEL_LOCK:
+        table = load_first_level_table()
+        if table is None:
+            return None
+
+        niveaux = table.meta["niveaux"]
+        entry = table.entry(term)
+        if entry is None:
+            return {"premier_niveau": None, "competences": [], "presence": {n: 0 for n in niveaux}}
+
+        level_idx, positions, counts = entry
+        return {
+            "premier_niveau": niveaux[level_idx],
+            "competences": table.samples(level_idx, positions),
+            "presence": dict(zip(niveaux, counts))
+        }
+
+
+# ============================================================================
+# MAGASIN EN MEMOIRE
+# ============================================================================
+class CompetenceStore:
+    """
+    Competences agregees gardees en memoire, rechargees si le fichier change.
+
+    Partage entre les threads du service : les rechargements passent par un
+    verrou, et chaque niveau est remplace d'un bloc (competences, textes).
+    """
+
+    def __init__(self):
+        self._levels: Dict[str, list] = {}
+        self._texts: Dict[str, List[str]] = {}
+        self._mtimes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def preload(self):
+        """Charge tous les niveaux disponibles."""
+        for path in sorted(DATA_DIR.glob("*_competences_flat.json")):
+            self.competences(path.name[:-len("_competences_flat.json")])
+
+    def levels(self) -> List[str]:
+        """Niveaux disponibles sur disque."""
+        return sorted(p.name[:-len("_competences_flat.json")]
+                      for p in DATA_DIR.glob("*_competences_flat.json"))
+
+    def _level(self, niveau: str) -> Tuple[list, List[str]]:
+        """Competences et textes cherchables d'un niveau (recharges si besoin)."""
+        niveau = niveau.upper()
+        file_path = DATA_DIR / f"{niveau}_competences_flat.json"
+        mtime = file_path.stat().st_mtime_ns if file_path.exists() else None
+        with self._lock:
+            if niveau not in self._levels or self._mtimes.get(niveau) != mtime:
+                comps = load_flat_competences(niveau)
+                self._levels[niveau] = comps
+                self._texts[niveau] = [notion_text(c) for c in comps]
+                self._mtimes[niveau] = mtime
+            return self._levels[niveau], self._texts[niveau]
+
+    def competences(self, niveau: str) -> list:
+        return self._level(niveau)[0]
+
+    def notion(self, niveau: str, notion: str) -> list:
+        comps, texts = self._level(niveau)
+        notion_lower = notion.lower()
+        return [comp for comp, text in zip(comps, texts) if notion_lower in text]
+
+    def execute(self, query: dict):
+        """Execute une requete et retourne son resultat (leve ValueError si invalide)."""
+        op = query.get("op")
+
+        if op == "levels":
+            return self.levels()
+
+        if op == "count":
+            return len(self.competences(query["niveau"]))
+
+        if op in ("notion", "in_program"):
+            return self.notion(query["niveau"], query["notion"])
+
+        if op == "filter":
+            return filter_competences(
+                self.competences(query["niveau"]),
+                query["query"],
+                query.get("domaine"),
+                query.get("type"),
+                query.get("exclude")
+            )
+
+        if op == "prerequisites":
+            found = lookup_notion(query["notion"])
+            return {
+                lvl: self.notion(lvl, query["notion"])
+                if found is None or found["presence"].get(lvl, 0) else []
+                for lvl in get_lower_levels(query["niveau"])
+            }
+
+        if op == "presence":
+            found = lookup_notion(query["notion"])
+            if found is not None:
+                return found["presence"]
+            return {niveau: len(self.notion(niveau, query["notion"])) for niveau in NIVEAUX}
+
+        if op == "first_level":
+            niveaux = query.get("niveaux") or NIVEAUX
+            found = lookup_notion(query["notion"]) if niveaux == NIVEAUX else None
+            if found is not None:
+                return {
+                    "premier_niveau": found["premier_niveau"],
+                    "presence_par_niveau": found["presence"],
+                    "competences": found["competences"]
+                }
+
+            presence = {}
+            premier = None
+            premieres = []
+            for niveau in niveaux:
+                results = self.notion(niveau, query["notion"])
+                presence[niveau] = len(results)
+                if results and premier is None:
+                    premier = niveau
+                    premieres = results[:FIRST_LEVEL_SAMPLE]
+            return {
+                "premier_niveau": premier,
+                "presence_par_niveau": presence,
+                "competences": premieres
+            }
+
+        raise ValueError(f"Operation inconnue: {op}")
+
+    def handle(self, request: dict):
+        """Traite une requete simple ou un lot (une erreur par requete invalide)."""
+        if not isinstance(request, dict):
+            return {"ok": False, "error": "Requete invalide: objet JSON attendu"}
+        if "batch" in request:
+            if not isinstance(request["batch"], list):
+                return {"ok": False, "error": "Requete invalide: batch doit etre une liste"}
+            return [self.handle(q) for q in request["batch"]]
+        try:
+            return {"ok": True, "result": self.execute(request)}
+        except (KeyError, ValueError, TypeError) as e:
+            return {"ok": False, "error": f"{type(e).__name__}: {e}"}
+
+
+# ============================================================================
+# SERVEUR
+# ============================================================================
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError as e:
+                response = {"ok": False, "error": f"JSON invalide: {e}"}
+            else:
+                if isinstance(request, dict) and request.get("op") == "shutdown":
+                    self._reply({"ok": True, "result": "stopping"})
+                    self.server.shutdown_requested = True
+                    return
+                response = self.server.store.handle(request)
+            self._reply(response)
+
+    def _reply(self, response):
+        self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+        self.wfile.flush()
+
+
+class _UnixServer(socketserver.ThreadingUnixStreamServer):
+    # File d'attente de connexions : au-dela, connect() echoue (EAGAIN) et les
+    # clients retombent sur une lecture locale
+    request_queue_size = 64
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    request_queue_size = 64
+
+
+def _socket_is_live(path: Path) -> bool:
+    """Vrai si un service accepte les connexions sur la socket Unix path."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(CONNECT_TIMEOUT)
+    try:
+        sock.connect(str(path))
+        return True
+    except (ConnectionRefusedError, FileNotFoundError):
+        return False
+    except OSError:
+        # Socket presente mais injoignable (timeout, droits) : ne pas y toucher
+        return True
+    finally:
+        sock.close()
+
+
+def _make_server(store: CompetenceStore):
+    """
+    Cree le serveur (socket Unix si disponible, sinon TCP local).
+
+    Une socket restee d'un service arrete brutalement est supprimee ; celle
+    d'un service qui repond encore est laissee en place (RuntimeError).
+    """
+    SERVICE_DIR.mkdir(parents=True, exist_ok=True)
+
+    server = None
+    if hasattr(socket, "AF_UNIX"):
+        if SOCKET_FILE.exists():
+            if _socket_is_live(SOCKET_FILE):
+                raise RuntimeError(f"Un service repond deja sur {SOCKET_FILE}")
+            SOCKET_FILE.unlink()
+        try:
+            server = _UnixServer(str(SOCKET_FILE), _Handler)
+            address = {"family": "unix", "address": str(SOCKET_FILE)}
+        except OSError:
+            server = None
+
+    if server is None:
+        server = _TCPServer(("127.0.0.1", 0), _Handler)
+        address = {"family": "tcp", "address": list(server.server_address)}
+
+    server.daemon_threads = True
+    server.store = store
+    server.address = address
+    server.shutdown_requested = False
+    address["pid"] = os.getpid()
+    with open(ADDRESS_FILE, "w", encoding="utf-8") as f:
+        json.dump(address, f)
+    return server
+
+
+def serve():
+    """Lance le service sur une socket locale jusqu'a 'stop'."""
+    sock = _connect()
+    if sock is not None:
+        sock.close()
+        print("[ERREUR] Le service tourne deja (utiliser 'stop' pour l'arreter)")
+        sys.exit(1)
+
+    store = CompetenceStore()
+    store.preload()
+    try:
+        server = _make_server(store)
+    except RuntimeError as e:
+        print(f"[ERREUR] {e}")
+        sys.exit(1)
+    print(f"[OK] Service pret ({len(store.levels())} niveaux charges) - "
+          f"{json.dumps(json.loads(ADDRESS_FILE.read_text(encoding='utf-8')))}", flush=True)
+
+    server.timeout = 0.5
+    try:
+        while not server.shutdown_requested:
+            server.handle_request()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if ADDRESS_FILE.exists():
+            ADDRESS_FILE.unlink()
+        if server.address["family"] == "unix" and SOCKET_FILE.exists():
+            SOCKET_FILE.unlink()
+
+
+def serve_stdio():
+    """Mode lignes JSON sur stdin/stdout (pour un processus parent)."""
+    store = CompetenceStore()
+    store.preload()
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            response = store.handle(json.loads(line))
+        except json.JSONDecodeError as e:
+            response = {"ok": False, "error": f"JSON invalide: {e}"}
+        sys.stdout.write(json.dumps(response, ensure_ascii=False) + "\n")
+        sys.stdout.flush()
+
+
+# ============================================================================
+# CLIENT
+# ============================================================================
+def _connect() -> Optional[socket.socket]:
+    """Connexion au service s'il tourne, None sinon."""
+    if not ADDRESS_FILE.exists():
+        return None
+    try:
+        address = json.loads(ADDRESS_FILE.read_text(encoding="utf-8"))
+        if address["family"] == "unix":
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            target = address["address"]
+        else:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            target = tuple(address["address"])
+        sock.settimeout(CONNECT_TIMEOUT)
+        sock.connect(target)
+        sock.settimeout(REQUEST_TIMEOUT)
+        return sock
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def send_request(request: dict):
+    """Envoie une requete brute au service. None si le service est indisponible."""
+    sock = _connect()
+    if sock is None:
+        return None
+    try:
+        with sock, sock.makefile("rwb") as stream:
+            stream.write(json.dumps(request, ensure_ascii=False).encode("utf-8") + b"\n")
+            stream.flush()
+            line = stream.readline()
+        return json.loads(line) if line else None
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+_LOCAL_STORE: Optional[CompetenceStore] = None
+
+
+def run_queries(queries: List[dict]) -> list:
+    """
+    Execute un lot de requetes: via le service s'il tourne (un seul
+    aller-retour), sinon localement dans le processus courant.
+
+    Returns:
+        Liste des resultats (leve RuntimeError si une requete echoue)
+    """
+    global _LOCAL_STORE
+
+    responses = send_request({"batch": queries})
+    if responses is None:
+        if _LOCAL_STORE is None:
+            _LOCAL_STORE = CompetenceStore()
+        responses = [_LOCAL_STORE.handle(q) for q in queries]
+
+    results = []
+    for response in responses:
+        if not response.get("ok"):
+            raise RuntimeError(response.get("error", "erreur inconnue"))
+        results.append(response["result"])
+    return results
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+def main():
+    parser = argparse.ArgumentParser(description="Service de requetes sur les competences")
+    subparsers = parser.add_subparsers(dest="commande", help="Commande a executer")
+
+    subparsers.add_parser("serve", help="Lancer le service sur une socket locale")
+    subparsers.add_parser("stdio", help="Lire des requetes JSON sur stdin")
+    parser_query = subparsers.add_parser("query", help="Envoyer une requete (ou un lot)")
+    parser_query.add_argument("request", help="Requete JSON")
+    subparsers.add_parser("status", help="Etat du service")
+    subparsers.add_parser("stop", help="Arreter le service")
+
+    args = parser.parse_args()
+
+    if args.commande == "serve":
+        serve()
+    elif args.commande == "stdio":
+        serve_stdio()
+    elif args.commande == "query":
+        request = json.loads(args.request)
+        response = send_request(request)
+        if response is None:
+            store = CompetenceStore()
+            response = store.handle(request)
+        print(json.dumps(response, ensure_ascii=False, indent=2))
+    elif args.commande == "status":
+        response = send_request({"op": "levels"})
+        if response is None:
+            print(json.dumps({"running": False}))
+        else:
+            print(json.dumps({"running": True, "niveaux": response.get("result")}, ensure_ascii=False))
+    elif args.commande == "stop":
+        response = send_request({"op": "shutdown"})
+        print("[OK] Service arrete" if response else "[INFO] Service non demarre")
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -10,32 +10,10 @@ Usage:
 
 import json
 import argparse
-from pathlib import Path
 
-BASE_DIR = Path(__file__).parent.parent
-DATA_DIR = BASE_DIR / "data" / "aggregated"
-NIVEAUX = ["C3", "5E", "4E", "3E"]
-
-def load_flat_competences(niveau: str) -> list:
-    file_path = DATA_DIR / f"{niveau}_competences_flat.json"
-    if not file_path.exists():
-        return []
-    with open(file_path, "r", encoding="utf-8") as f:
-        return json.load(f).get("competences", [])
+from competence_service import run_queries
 
-def search_notion(competences: list, notion: str) -> list:
-    notion_lower = notion.lower()
-    results = []
-    for comp in competences:
-        searchable = " ".join([
-            comp.get("intitule", ""),
-            comp.get("description_detaillee", ""),
-            comp.get("sous_domaine", ""),
-            " ".join(comp.get("connaissances_associees", []))
-        ]).lower()
-        if notion_lower in searchable:
-            results.append(comp)
-    return results
+NIVEAUX = ["C3", "5E", "4E", "3E"]
 
 def main():
     parser = argparse.ArgumentParser(description="Trouver le premier niveau d'une notion")
@@ -50,18 +28,15 @@ def main():
         "presence_par_niveau": {}
     }
 
-    for niveau in NIVEAUX:
-        competences = load_flat_competences(niveau)
-        results = search_notion(competences, args.notion)
-        count = len(results)
-        output["presence_par_niveau"][niveau] = count
+    first, = run_queries([{"op": "first_level", "notion": args.notion, "niveaux": NIVEAUX}])
+    output["presence_par_niveau"] = first["presence_par_niveau"]
 
-        if count > 0 and output["premier_niveau"] is None:
-            output["premier_niveau"] = niveau
-            output["premieres_competences"] = [
-                {"code": c.get("code"), "intitule": c.get("intitule")}
-                for c in results[:3]
-            ]
+    if first["premier_niveau"]:
+        output["premier_niveau"] = first["premier_niveau"]
+        output["premieres_competences"] = [
+            {"code": c.get("code"), "intitule": c.get("intitule")}
+            for c in first["competences"][:3]
+        ]
 
     if output["premier_niveau"]:
         output["reponse"] = f"'{args.notion}' est introduit en {output['premier_niveau']}"
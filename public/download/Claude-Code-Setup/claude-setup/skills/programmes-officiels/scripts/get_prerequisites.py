@@ -9,39 +9,9 @@ Usage:
 
 import json
 import argparse
-from pathlib import Path
 
-BASE_DIR = Path(__file__).parent.parent
-DATA_DIR = BASE_DIR / "data" / "aggregated"
+from competence_service import run_queries
 
-# Ordre des niveaux
-NIVEAUX_ORDER = {"C3": 0, "5E": 1, "4E": 2, "3E": 3}
-
-def load_flat_competences(niveau: str) -> list:
-    file_path = DATA_DIR / f"{niveau}_competences_flat.json"
-    if not file_path.exists():
-        return []
-    with open(file_path, "r", encoding="utf-8") as f:
-        return json.load(f).get("competences", [])
-
-def search_notion(competences: list, notion: str) -> list:
-    notion_lower = notion.lower()
-    results = []
-    for comp in competences:
-        searchable = " ".join([
-            comp.get("intitule", ""),
-            comp.get("description_detaillee", ""),
-            comp.get("sous_domaine", ""),
-            " ".join(comp.get("connaissances_associees", []))
-        ]).lower()
-        if notion_lower in searchable:
-            results.append(comp)
-    return results
-
-def get_lower_levels(niveau: str) -> list:
-    """Retourne les niveaux inferieurs."""
-    current_order = NIVEAUX_ORDER.get(niveau.upper(), 0)
-    return [n for n, order in NIVEAUX_ORDER.items() if order < current_order]
 
 def main():
     parser = argparse.ArgumentParser(description="Prerequis d'une notion")
@@ -50,7 +20,12 @@ def main():
 
     args = parser.parse_args()
     niveau = args.niveau.upper()
-    lower_levels = get_lower_levels(niveau)
+
+    # Un seul aller-retour: prerequis + niveau cible
+    prerequis, current_results = run_queries([
+        {"op": "prerequisites", "niveau": niveau, "notion": args.notion},
+        {"op": "notion", "niveau": niveau, "notion": args.notion}
+    ])
 
     output = {
         "niveau_cible": niveau,
@@ -59,9 +34,7 @@ def main():
     }
 
     total = 0
-    for lvl in lower_levels:
-        competences = load_flat_competences(lvl)
-        results = search_notion(competences, args.notion)
+    for lvl, results in prerequis.items():
         total += len(results)
         output["prerequis"][lvl] = [
             {
@@ -75,8 +48,6 @@ def main():
     output["total_prerequis"] = total
 
     # Ajouter aussi les competences du niveau cible pour comparaison
-    current_competences = load_flat_competences(niveau)
-    current_results = search_notion(current_competences, args.notion)
     output["competences_niveau_cible"] = [
         {"code": c.get("code"), "intitule": c.get("intitule")}
         for c in current_results
@@ -11,34 +11,10 @@ Usage:
 
 import json
 import argparse
-from pathlib import Path
 
-BASE_DIR = Path(__file__).parent.parent
-DATA_DIR = BASE_DIR / "data" / "aggregated"
-NIVEAUX = ["C3", "5E", "4E", "3E"]
-
-def load_flat_competences(niveau: str) -> list:
-    file_path = DATA_DIR / f"{niveau}_competences_flat.json"
-    if not file_path.exists():
-        return []
-    with open(file_path, "r", encoding="utf-8") as f:
-        return json.load(f).get("competences", [])
-
-def search_notion(competences: list, notion: str) -> list:
-    notion_lower = notion.lower()
-    results = []
-    for comp in competences:
-        searchable = " ".join([
-            comp.get("intitule", ""),
-            comp.get("description_detaillee", ""),
-            comp.get("sous_domaine", ""),
-            " ".join(comp.get("connaissances_associees", []))
-        ]).lower()
+from competence_service import run_queries
 
-        if notion_lower in searchable:
-            results.append(comp)
-
-    return results
+NIVEAUX = ["C3", "5E", "4E", "3E"]
 
 def main():
     parser = argparse.ArgumentParser(description="Progression d'une notion")
@@ -52,10 +28,13 @@ def main():
         "progression": {}
     }
 
+    all_results = run_queries([
+        {"op": "notion", "niveau": niveau, "notion": args.notion}
+        for niveau in NIVEAUX
+    ])
+
     total = 0
-    for niveau in NIVEAUX:
-        competences = load_flat_competences(niveau)
-        results = search_notion(competences, args.notion)
+    for niveau, results in zip(NIVEAUX, all_results):
         total += len(results)
 
         if args.compact:
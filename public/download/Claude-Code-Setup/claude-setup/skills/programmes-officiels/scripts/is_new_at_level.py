@@ -9,36 +9,8 @@ Usage:
 
 import json
 import argparse
-from pathlib import Path
 
-BASE_DIR = Path(__file__).parent.parent
-DATA_DIR = BASE_DIR / "data" / "aggregated"
-NIVEAUX_ORDER = {"C3": 0, "5E": 1, "4E": 2, "3E": 3}
-
-def load_flat_competences(niveau: str) -> list:
-    file_path = DATA_DIR / f"{niveau}_competences_flat.json"
-    if not file_path.exists():
-        return []
-    with open(file_path, "r", encoding="utf-8") as f:
-        return json.load(f).get("competences", [])
-
-def search_notion(competences: list, notion: str) -> list:
-    notion_lower = notion.lower()
-    results = []
-    for comp in competences:
-        searchable = " ".join([
-            comp.get("intitule", ""),
-            comp.get("description_detaillee", ""),
-            comp.get("sous_domaine", ""),
-            " ".join(comp.get("connaissances_associees", []))
-        ]).lower()
-        if notion_lower in searchable:
-            results.append(comp)
-    return results
-
-def get_lower_levels(niveau: str) -> list:
-    current_order = NIVEAUX_ORDER.get(niveau.upper(), 0)
-    return [n for n, order in NIVEAUX_ORDER.items() if order < current_order]
+from competence_service import get_lower_levels, run_queries
 
 def main():
     parser = argparse.ArgumentParser(description="Verifier si une notion est nouvelle")
@@ -49,18 +21,15 @@ def main():
     niveau = args.niveau.upper()
     lower_levels = get_lower_levels(niveau)
 
-    # Verifier au niveau cible
-    current_comps = load_flat_competences(niveau)
-    current_results = search_notion(current_comps, args.notion)
+    # Niveau cible + comptes par niveau (table de premiere apparition)
+    current_results, presence = run_queries([
+        {"op": "notion", "niveau": niveau, "notion": args.notion},
+        {"op": "presence", "notion": args.notion}
+    ])
 
     # Verifier aux niveaux inferieurs
-    prerequis_found = {}
-    total_prerequis = 0
-    for lvl in lower_levels:
-        comps = load_flat_competences(lvl)
-        results = search_notion(comps, args.notion)
-        prerequis_found[lvl] = len(results)
-        total_prerequis += len(results)
+    prerequis_found = {lvl: presence.get(lvl, 0) for lvl in lower_levels}
+    total_prerequis = sum(prerequis_found.values())
 
     output = {
         "question": f"'{args.notion}' est-elle une nouveaute en {niveau} ?",
@@ -52,6 +52,22 @@ def ensure_directories():
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
 
+def is_extraction_current(extraction_file: Path, page: dict) -> bool:
+    """
+    True si l'extraction existe et date d'apres la derniere re-scission de la page.
+
+    split_pdf_pages.py --incremental ajoute resplit_date aux pages dont le texte
+    a change : une extraction anterieure est alors obsolete.
+    """
+    if not extraction_file.exists():
+        return False
+    resplit_date = page.get("resplit_date")
+    if not resplit_date:
+        return True
+    extracted_at = datetime.fromtimestamp(extraction_file.stat().st_mtime)
+    return extracted_at >= datetime.fromisoformat(resplit_date)
+
+
 def get_all_pages() -> list[dict]:
     """Retourne la liste de toutes les pages avec leur statut."""
     pages = []
@@ -81,7 +97,7 @@ def get_all_pages() -> list[dict]:
                 "page_number": page["page_number"],
                 "text_file": pdf_folder / f"page_{page['page_number']:03d}.txt",
                 "extraction_file": extraction_file,
-                "status": "extracted" if extraction_file.exists() else "pending",
+                "status": "extracted" if is_extraction_current(extraction_file, page) else "pending",
                 "themes": page.get("detected_themes", []),
                 "text_length": page.get("text_length", 0)
             })
@@ -16,6 +16,8 @@ from pathlib import Path
 from collections import defaultdict
 from datetime import datetime
 
+from competence_index import rebuild_index, INDEX_FILE
+
 # Chemins
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / "data"
@@ -272,5 +274,9 @@ def main():
 
     print(f"Fichier mapping: {mapping_file}")
 
+    # Reconstruire l'index de recherche
+    index = rebuild_index()
+    print(f"Index de recherche: {INDEX_FILE} ({index.meta['tokens']} tokens)")
+
 if __name__ == "__main__":
     main()
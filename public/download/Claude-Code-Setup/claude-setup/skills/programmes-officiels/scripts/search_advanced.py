@@ -24,80 +24,18 @@ Usage:
 
 import json
 import argparse
-from pathlib import Path
-from typing import List, Dict, Optional
 
-BASE_DIR = Path(__file__).parent.parent
-DATA_DIR = BASE_DIR / "data" / "aggregated"
+from competence_service import first_level_of, run_queries
+
 NIVEAUX = ["C3", "5E", "4E", "3E"]
 NIVEAUX_ORDER = {"C3": 0, "5E": 1, "4E": 2, "3E": 3}
 
-def load_flat_competences(niveau: str) -> list:
-    file_path = DATA_DIR / f"{niveau}_competences_flat.json"
-    if not file_path.exists():
-        return []
-    with open(file_path, "r", encoding="utf-8") as f:
-        return json.load(f).get("competences", [])
-
-def match_query(comp: dict, query: str, exclude: Optional[str] = None) -> bool:
-    """Verifie si une competence correspond a la requete."""
-    searchable = " ".join([
-        comp.get("intitule", ""),
-        comp.get("description_detaillee", ""),
-        comp.get("formulation_bo", ""),
-        comp.get("sous_domaine", ""),
-        " ".join(comp.get("connaissances_associees", []))
-    ]).lower()
-
-    if query.lower() not in searchable:
-        return False
-
-    if exclude and exclude.lower() in searchable:
-        return False
-
-    return True
-
-def filter_competences(
-    competences: list,
-    query: str,
-    domaine: Optional[str] = None,
-    type_comp: Optional[str] = None,
-    exclude: Optional[str] = None
-) -> list:
-    """Filtre les competences selon les criteres."""
-    results = []
-    for comp in competences:
-        # Filtre requete
-        if not match_query(comp, query, exclude):
-            continue
-
-        # Filtre domaine
-        if domaine and comp.get("domaine", "").upper() != domaine.upper():
-            continue
-
-        # Filtre type
-        if type_comp and comp.get("type", "") != type_comp:
-            continue
-
-        results.append(comp)
-
-    return results
-
 def is_new_at_level(notion: str, niveau: str) -> bool:
-    """Verifie si la notion est nouvelle a ce niveau."""
-    current_order = NIVEAUX_ORDER.get(niveau, 0)
-    lower_levels = [n for n, order in NIVEAUX_ORDER.items() if order < current_order]
-
-    for lvl in lower_levels:
-        comps = load_flat_competences(lvl)
-        for comp in comps:
-            searchable = " ".join([
-                comp.get("intitule", ""),
-                comp.get("description_detaillee", "")
-            ]).lower()
-            if notion.lower() in searchable:
-                return False
-    return True
+    """Verifie si la notion est nouvelle a ce niveau (table de premiere apparition)."""
+    premier = first_level_of(notion)
+    if premier is None:
+        return True
+    return NIVEAUX_ORDER.get(premier, 0) >= NIVEAUX_ORDER.get(niveau, 0)
 
 def main():
     parser = argparse.ArgumentParser(description="Recherche avancee avec filtres")
@@ -136,19 +74,25 @@ def main():
     all_results = []
     results_by_niveau = {}
 
-    for niveau in niveaux:
-        competences = load_flat_competences(niveau)
-        results = filter_competences(
-            competences,
-            args.query,
-            args.domaine,
-            args.type_comp,
-            args.exclude
-        )
+    # Un seul lot de requetes pour tous les niveaux
+    all_filtered = run_queries([
+        {
+            "op": "filter",
+            "niveau": niveau,
+            "query": args.query,
+            "domaine": args.domaine,
+            "type": args.type_comp,
+            "exclude": args.exclude
+        }
+        for niveau in niveaux
+    ])
+
+    for niveau, filtered in zip(niveaux, all_filtered):
+        results = [dict(r) for r in filtered]
 
         # Filtre nouveautes
-        if args.only_new:
-            results = [r for r in results if is_new_at_level(args.query, niveau)]
+        if args.only_new and not is_new_at_level(args.query, niveau):
+            results = []
 
         for r in results:
             r["_niveau"] = niveau
@@ -11,6 +11,11 @@ Usage:
     python search_competences.py --stats
     python search_competences.py --list-niveaux
     python search_competences.py --list-domaines
+    python search_competences.py --rebuild-index
+
+Les recherches passent par l'index inverse data/index/search_index.sqlite
+(voir competence_index.py), reconstruit automatiquement si les fichiers
+normalises changent.
 """
 
 import json
@@ -21,6 +26,8 @@ from pathlib import Path
 from typing import List, Dict, Optional
 import unicodedata
 
+from competence_index import get_index, rebuild_index
+
 # ============================================================================
 # FORCER ENCODAGE UTF-8 POUR WINDOWS
 # ============================================================================
@@ -237,19 +244,27 @@ def normalize_domaine(domaine: str) -> str:
 # ============================================================================
 # CHARGEMENT DES DONNEES
 # ============================================================================
-def load_normalized_competences(niveau_code: str) -> List[Dict]:
-    """Charge les competences normalisees d'un niveau."""
+def load_normalized_competences(niveau_code: str, domaine_letter: Optional[str] = None) -> List[Dict]:
+    """Charge les competences normalisees d'un niveau (via l'index si disponible)."""
     file_key = NIVEAU_CODE_TO_FILE.get(niveau_code)
     if not file_key:
         return []
 
+    index = get_index()
+    if index is not None:
+        return index.competences(file_key, domaine_letter)
+
     file_path = NORMALIZED_DIR / f"{file_key}_normalized.json"
     if not file_path.exists():
         return []
 
     with open(file_path, "r", encoding="utf-8") as f:
         data = json.load(f)
-        return data.get("competences", [])
+        competences = data.get("competences", [])
+
+    if domaine_letter:
+        competences = filter_by_domaine(competences, domaine_letter)
+    return competences
 
 
 def load_all_competences() -> List[Dict]:
@@ -268,6 +283,10 @@ def load_all_competences() -> List[Dict]:
 # ============================================================================
 def search_by_code(code: str) -> Optional[Dict]:
     """Recherche une competence par son code exact."""
+    index = get_index()
+    if index is not None:
+        return index.get_by_code(code)
+
     all_comps = load_all_competences()
     code_upper = code.upper()
 
@@ -294,30 +313,35 @@ def search_keyword(competences: List[Dict], keyword: str, limit: int = 20, fuzzy
     # Normaliser pour comparaison sans accents
     keywords_normalized = [normalize_text(k) for k in keywords]
 
+    # Positions correspondantes dans l'index (textes deja normalises)
+    index = get_index()
+    matched = index.match_positions(keywords_normalized) if index is not None else set()
+
     results = []
     seen_codes = set()
 
     for comp in competences:
-        # Construire le texte cherchable
-        searchable_parts = [
-            comp.get("intitule", ""),
-            comp.get("description_detaillee", ""),
-            comp.get("formulation_bo", ""),
-            comp.get("sous_domaine", ""),
-            " ".join(comp.get("connaissances_associees", [])),
-            " ".join(comp.get("keywords", [])),  # Nouveau champ keywords
-        ]
-        combined = " ".join(searchable_parts)
-        combined_normalized = normalize_text(combined)
-
-        # Chercher chaque mot-cle
-        for kw in keywords_normalized:
-            if kw in combined_normalized:
-                code = comp.get("code", "")
-                if code not in seen_codes:
-                    results.append(comp)
-                    seen_codes.add(code)
-                break
+        pos = index.position(comp) if index is not None else None
+        if pos is not None:
+            found = pos in matched
+        else:
+            # Competence hors index: construire le texte cherchable
+            searchable_parts = [
+                comp.get("intitule", ""),
+                comp.get("description_detaillee", ""),
+                comp.get("formulation_bo", ""),
+                comp.get("sous_domaine", ""),
+                " ".join(comp.get("connaissances_associees", [])),
+                " ".join(comp.get("keywords", [])),  # Nouveau champ keywords
+            ]
+            combined_normalized = normalize_text(" ".join(searchable_parts))
+            found = any(kw in combined_normalized for kw in keywords_normalized)
+
+        if found:
+            code = comp.get("code", "")
+            if code not in seen_codes:
+                results.append(comp)
+                seen_codes.add(code)
 
         if len(results) >= limit:
             break
@@ -501,9 +525,17 @@ Exemples:
     parser.add_argument("--list-niveaux", action="store_true", help="Lister les niveaux")
     parser.add_argument("--list-domaines", action="store_true", help="Lister les domaines")
     parser.add_argument("--list-synonyms", action="store_true", help="Lister les synonymes de recherche")
+    parser.add_argument("--rebuild-index", action="store_true", help="Reconstruire l'index de recherche")
 
     args = parser.parse_args()
 
+    # Reconstruction forcee de l'index
+    if args.rebuild_index:
+        index = rebuild_index()
+        print(f"Index reconstruit: {len(index)} competences, {index.meta['tokens']} tokens")
+        if not (args.code or args.niveau or args.all_levels or args.stats):
+            return
+
     # Mode stats
     if args.stats:
         stats = get_stats()
@@ -564,15 +596,12 @@ Exemples:
     all_results = []
 
     for niveau_code in niveaux_to_search:
-        competences = load_normalized_competences(niveau_code)
+        # Filtre par domaine applique par l'index
+        competences = load_normalized_competences(niveau_code, domaine_filter)
 
         if not competences:
             continue
 
-        # Filtrer par domaine si specifie
-        if domaine_filter:
-            competences = filter_by_domaine(competences, domaine_filter)
-
         # Recherche par mot-cle
         if args.keyword:
             results = search_keyword(competences, args.keyword, args.limit, fuzzy=not args.exact)
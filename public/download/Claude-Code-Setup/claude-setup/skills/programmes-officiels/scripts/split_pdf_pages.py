@@ -7,11 +7,29 @@ Usage:
     python split_pdf_pages.py 2GT.pdf            # Traite un PDF spécifique
     python split_pdf_pages.py --list             # Liste les PDFs disponibles
     python split_pdf_pages.py --status           # Affiche le statut des scissions
+    python split_pdf_pages.py --workers 4        # Nombre de processus (défaut: nombre de CPU)
+    python split_pdf_pages.py --incremental      # Ne re-scinde que les pages modifiées
+
+Chaque PDF n'est ouvert qu'une fois par processus : le texte de toutes ses
+pages est extrait dans la même passe. Les PDFs (ou, pour un PDF seul, des
+tranches de pages) sont répartis sur un pool de processus.
+
+index.json garde un hash du contenu de chaque page (content_hash). En mode
+--incremental, seules les pages dont le hash a changé sont re-scindées : les
+autres gardent leur entrée d'index telle quelle. Une page dont le texte a
+changé reçoit une date resplit_date, qui rend son extraction existante
+obsolète pour orchestrate_extraction.py. Une page seulement déplacée (même
+hash, autre numéro) garde son entrée d'index et son fichier d'extraction,
+renumérotés.
 """
 
 import sys
+import os
 import json
 import io
+import time
+import hashlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
 
@@ -21,6 +39,7 @@ sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='repla
 
 # Import des bibliothèques PDF
 from PyPDF2 import PdfReader, PdfWriter
+from PyPDF2.generic import ArrayObject
 import pdfplumber
 
 # Chemins
@@ -29,6 +48,10 @@ SKILL_DIR = SCRIPT_DIR.parent
 PDF_DIR = SKILL_DIR / "pdf"
 DATA_DIR = SKILL_DIR / "data"
 PAGES_DIR = DATA_DIR / "pages"  # Dossier racine pour les pages
+EXTRACTIONS_DIR = DATA_DIR / "extractions"  # Extractions par page (orchestrate_extraction.py)
+
+# Pages minimum par processus (en dessous, ouvrir le PDF coûte plus qu'il ne rapporte)
+MIN_PAGES_PER_WORKER = 4
 
 
 def ensure_directories():
@@ -51,31 +74,253 @@ def get_safe_folder_name(pdf_name: str) -> str:
     return name
 
 
-def split_single_pdf(pdf_path: Path, force: bool = False) -> dict:
+def build_page_info(page_index: int, page_text: str) -> dict:
+    """Métadonnées d'une page pour index.json."""
+    # Résumé court du contenu (premiers 500 caractères)
+    text_preview = page_text[:500].replace("\n", " ").strip()
+    if len(page_text) > 500:
+        text_preview += "..."
+
+    return {
+        "page_number": page_index,
+        "filename": f"page_{page_index:03d}.pdf",
+        "text_length": len(page_text),
+        "preview": text_preview,
+        # Détecter les sections/thèmes potentiels
+        "detected_themes": detect_themes(page_text),
+        "status": "pending"  # Pour le traitement par agent
+    }
+
+
+def page_content_hash(page) -> str:
+    """
+    Hash du contenu d'une page PyPDF2 : flux de contenu, images et formulaires
+    (XObjects), taille et rotation. Ne dépend pas du reste du document.
+    """
+    digest = hashlib.sha1()
+    contents = page.get_contents()
+    if contents is not None:
+        # Une page peut avoir plusieurs flux de contenu (ArrayObject)
+        streams = contents if isinstance(contents, ArrayObject) else [contents]
+        for stream in streams:
+            digest.update(stream.get_object().get_data())
+    digest.update(repr([float(v) for v in page.mediabox]).encode())
+    digest.update(repr(page.get("/Rotate", 0)).encode())
+
+    resources = page.get("/Resources")
+    xobjects = resources.get_object().get("/XObject") if resources is not None else None
+    if xobjects is not None:
+        xobjects = xobjects.get_object()
+        for name in sorted(xobjects):
+            digest.update(name.encode())
+            try:
+                digest.update(xobjects[name].get_object().get_data())
+            except Exception:
+                digest.update(repr(xobjects[name].get_object()).encode())
+    return digest.hexdigest()
+
+
+def split_pages(reader, plumber, output_dir: Path, page_nums, open_error=None,
+                progress=None, known_texts=None) -> list[dict]:
+    """
+    Écrit page_XXX.pdf et page_XXX.txt pour les pages demandées (0-based).
+
+    reader (PyPDF2) et plumber (pdfplumber) sont déjà ouverts : le PDF
+    source n'est pas relu pour chaque page. Si pdfplumber n'a pas pu ouvrir
+    le PDF, open_error est reporté dans le texte de chaque page.
+    known_texts ({page_num: texte}) évite de ré-extraire un texte déjà connu.
+    """
+    pages = []
+    for page_num in page_nums:
+        page_index = page_num + 1  # Numérotation 1-based
+
+        # Créer un PDF pour cette page uniquement
+        writer = PdfWriter()
+        writer.add_page(reader.pages[page_num])
+        with open(output_dir / f"page_{page_index:03d}.pdf", 'wb') as output_file:
+            writer.write(output_file)
+
+        # Extraire le texte de la page pour l'index
+        page_text = ""
+        if known_texts and page_num in known_texts:
+            page_text = known_texts[page_num]
+        else:
+            try:
+                if open_error is not None:
+                    raise open_error
+                if page_num < len(plumber.pages):
+                    page = plumber.pages[page_num]
+                    page_text = page.extract_text() or ""
+                    # Libérer le cache de mise en page (pdfplumber >= 0.10)
+                    if hasattr(page, "close"):
+                        page.close()
+            except Exception as e:
+                page_text = f"[Erreur extraction: {e}]"
+
+        page_info = build_page_info(page_index, page_text)
+        page_info["content_hash"] = page_content_hash(reader.pages[page_num])
+        pages.append(page_info)
+
+        # Sauvegarder aussi le texte brut
+        with open(output_dir / f"page_{page_index:03d}.txt", 'w', encoding='utf-8') as f:
+            f.write(page_text)
+
+        if progress:
+            progress(len(pages))
+
+    return pages
+
+
+def open_pdf(pdf_path: Path):
+    """Ouvre le PDF avec PyPDF2 et pdfplumber. Retourne (reader, plumber, erreur)."""
+    reader = PdfReader(str(pdf_path))
+    try:
+        return reader, pdfplumber.open(pdf_path), None
+    except Exception as e:
+        return reader, None, e
+
+
+def split_page_list(pdf_path: Path, output_dir: Path, page_nums: list[int],
+                    known_texts: dict = None) -> list[dict]:
+    """Tâche du pool : scinde les pages demandées avec une seule ouverture du PDF."""
+    reader, plumber, open_error = open_pdf(pdf_path)
+    try:
+        return split_pages(reader, plumber, output_dir, page_nums, open_error,
+                           known_texts=known_texts)
+    finally:
+        if plumber is not None:
+            plumber.close()
+
+
+def run_split(pdf_path: Path, reader, plumber, open_error, output_dir: Path,
+              page_nums: list[int], workers: int, log, known_texts: dict = None) -> list[dict]:
+    """
+    Scinde page_nums, dans ce processus ou réparties en tranches contiguës
+    sur un pool (chaque processus rouvre le PDF une fois).
+
+    Retourne les métadonnées des pages, dans l'ordre de page_nums.
+    """
+    total = len(page_nums)
+    workers = max(1, min(workers, total // MIN_PAGES_PER_WORKER))
+    if workers == 1:
+        return split_pages(
+            reader, plumber, output_dir, page_nums, open_error,
+            progress=lambda done: log(f"   ✓ Page {done}/{total}", end="\r"),
+            known_texts=known_texts)
+
+    bounds = [total * k // workers for k in range(workers + 1)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {}
+        for a, b in zip(bounds, bounds[1:]):
+            chunk = page_nums[a:b]
+            chunk_texts = {n: known_texts[n] for n in chunk if n in known_texts} if known_texts else None
+            futures[executor.submit(split_page_list, pdf_path, output_dir, chunk, chunk_texts)] = a
+        chunks = {}
+        done = 0
+        for future in as_completed(futures):
+            chunks[futures[future]] = future.result()
+            done += len(chunks[futures[future]])
+            log(f"   ✓ Page {done}/{total}", end="\r")
+    return [page for a in sorted(chunks) for page in chunks[a]]
+
+
+def read_text(path: Path):
+    """Contenu d'un page_XXX.txt, ou None s'il n'existe pas."""
+    try:
+        return path.read_text(encoding='utf-8')
+    except OSError:
+        return None
+
+
+def update_extractions(folder_name: str, copies: dict, stale):
+    """
+    Met à jour les fichiers d'extraction après une scission incrémentale.
+
+    copies : {nouveau numéro de page: ancien numéro} (1-based) pour les pages
+    dont le contenu se trouvait à un autre numéro ; l'extraction de l'ancien
+    numéro est recopiée au nouveau. stale : anciens numéros dont l'extraction
+    ne correspond plus à aucune page (page re-scindée ou disparue), supprimés.
+    Les sources sont toutes lues avant toute écriture, ce qui permet les
+    décalages en chaîne (5 -> 6, 6 -> 7...). La date de modification est
+    conservée : elle sert à orchestrate_extraction.py pour juger si
+    l'extraction est à jour.
+    """
+    extraction_dir = EXTRACTIONS_DIR / folder_name
+    if not extraction_dir.is_dir():
+        return
+
+    def extraction_path(page_index):
+        return extraction_dir / f"page_{page_index:03d}_competences.json"
+
+    loaded = []
+    for new_index, old_index in copies.items():
+        path = extraction_path(old_index)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                loaded.append((new_index, json.load(f), path.stat().st_mtime))
+        except (OSError, json.JSONDecodeError):
+            continue
+
+    for old_index in stale:
+        extraction_path(old_index).unlink(missing_ok=True)
+
+    for new_index, data, mtime in loaded:
+        if isinstance(data.get("source"), dict):
+            data["source"]["page"] = new_index
+        for comp in data.get("competences", []):
+            if isinstance(comp.get("source"), dict):
+                comp["source"]["page"] = new_index
+        path = extraction_path(new_index)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.utime(path, (mtime, mtime))
+
+
+def split_single_pdf(pdf_path: Path, force: bool = False, workers: int = 1,
+                     verbose: bool = True, incremental: bool = False) -> dict:
     """
     Scinde un PDF en pages individuelles.
 
+    Avec workers > 1, les pages sont réparties en tranches sur un pool de
+    processus (chaque processus ouvre le PDF une fois).
+
+    Avec incremental=True et un index.json existant, seules les pages dont
+    content_hash a changé (ou dont les fichiers manquent) sont re-scindées.
+    Les autres gardent leur entrée d'index, statut compris. Une page
+    re-scindée dont le texte est identique garde aussi son entrée ; si le
+    texte a changé, elle repart en "pending" avec une resplit_date. Une page
+    dont le hash était celui d'une autre page reprend une copie de l'entrée
+    et du fichier d'extraction de ce numéro ; l'extraction d'origine n'est
+    retirée que si son numéro ne l'utilise plus (page re-scindée ou
+    disparue).
+
     Retourne un dictionnaire avec les métadonnées de la scission.
     """
+    log = print if verbose else (lambda *a, **k: None)
     folder_name = get_safe_folder_name(pdf_path.name)
     output_dir = PAGES_DIR / folder_name
 
     # Vérifier si déjà fait
     index_file = output_dir / "index.json"
-    if index_file.exists() and not force:
-        print(f"  [SKIP] {pdf_path.name} déjà traité (utilisez --force pour retraiter)")
+    previous = None
+    if index_file.exists() and incremental:
+        with open(index_file, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+    elif index_file.exists() and not force:
+        log(f"  [SKIP] {pdf_path.name} déjà traité (utilisez --force ou --incremental pour retraiter)")
         with open(index_file, 'r', encoding='utf-8') as f:
             return json.load(f)
 
-    print(f"\n📄 Traitement de {pdf_path.name}...")
+    log(f"\n📄 Traitement de {pdf_path.name}...")
+    start_time = time.perf_counter()
 
     # Créer le dossier de sortie
     output_dir.mkdir(exist_ok=True)
 
-    # Ouvrir le PDF avec PyPDF2 pour la scission
-    reader = PdfReader(str(pdf_path))
+    # Ouvrir le PDF une seule fois (PyPDF2 pour la scission, pdfplumber pour le texte)
+    reader, plumber, open_error = open_pdf(pdf_path)
     total_pages = len(reader.pages)
-    print(f"   -> {total_pages} pages détectées")
+    log(f"   -> {total_pages} pages détectées")
 
     # Préparer les métadonnées
     result = {
@@ -86,62 +331,91 @@ def split_single_pdf(pdf_path: Path, force: bool = False) -> dict:
         "pages": []
     }
 
-    # Extraire chaque page
-    for page_num in range(total_pages):
-        page_index = page_num + 1  # Numérotation 1-based
-        page_filename = f"page_{page_index:03d}.pdf"
-        page_path = output_dir / page_filename
-
-        # Créer un PDF pour cette page uniquement
-        writer = PdfWriter()
-        writer.add_page(reader.pages[page_num])
-
-        with open(page_path, 'wb') as output_file:
-            writer.write(output_file)
-
-        # Extraire le texte de la page pour l'index
-        page_text = ""
-        try:
-            with pdfplumber.open(pdf_path) as pdf:
-                if page_num < len(pdf.pages):
-                    page_text = pdf.pages[page_num].extract_text() or ""
-        except Exception as e:
-            page_text = f"[Erreur extraction: {e}]"
-
-        # Résumé court du contenu (premiers 500 caractères)
-        text_preview = page_text[:500].replace("\n", " ").strip()
-        if len(page_text) > 500:
-            text_preview += "..."
-
-        # Détecter les sections/thèmes potentiels
-        detected_themes = detect_themes(page_text)
-
-        page_info = {
-            "page_number": page_index,
-            "filename": page_filename,
-            "text_length": len(page_text),
-            "preview": text_preview,
-            "detected_themes": detected_themes,
-            "status": "pending"  # Pour le traitement par agent
-        }
-
-        result["pages"].append(page_info)
-
-        # Sauvegarder aussi le texte brut
-        txt_filename = f"page_{page_index:03d}.txt"
-        txt_path = output_dir / txt_filename
-        with open(txt_path, 'w', encoding='utf-8') as f:
-            f.write(page_text)
-
-        print(f"   ✓ Page {page_index}/{total_pages}", end="\r")
-
-    print(f"   ✓ {total_pages} pages extraites            ")
+    # Pages à (re)scinder
+    kept = {}
+    known_texts = {}
+    old_texts = {}
+    moved_from = {}
+    to_split = list(range(total_pages))
+    if previous is not None:
+        old_pages = {p["page_number"]: p for p in previous.get("pages", [])}
+        old_by_hash = {p["content_hash"]: p for p in old_pages.values() if p.get("content_hash")}
+        to_split = []
+        for page_num in range(total_pages):
+            page_index = page_num + 1
+            page_hash = page_content_hash(reader.pages[page_num])
+            old = old_pages.get(page_index)
+            files_present = ((output_dir / f"page_{page_index:03d}.pdf").exists()
+                             and (output_dir / f"page_{page_index:03d}.txt").exists())
+            if old and old.get("content_hash") == page_hash and files_present:
+                kept[page_num] = old
+                continue
+            to_split.append(page_num)
+            if old:
+                old_texts[page_num] = read_text(output_dir / f"page_{page_index:03d}.txt")
+            # Page déplacée : son texte et son extraction sont déjà connus
+            moved = old_by_hash.get(page_hash)
+            if moved and moved["page_number"] != page_index:
+                moved_from[page_num] = moved
+                text = read_text(output_dir / f"page_{moved['page_number']:03d}.txt")
+                if text is not None:
+                    known_texts[page_num] = text
+        log(f"   -> {len(kept)} pages inchangées, {len(to_split)} à re-scinder")
+
+    try:
+        split_infos = run_split(pdf_path, reader, plumber, open_error, output_dir,
+                                to_split, workers, log, known_texts)
+    finally:
+        if plumber is not None:
+            plumber.close()
+
+    # Assembler l'index dans l'ordre des pages
+    resplit_date = datetime.now().isoformat()
+    changed_text = 0
+    resplit = set()
+    for page_num, info in zip(to_split, split_infos):
+        old = old_pages.get(page_num + 1) if previous is not None else None
+        moved = moved_from.get(page_num)
+        if moved is not None:
+            # Même contenu à un autre numéro : statut et extraction suivent la page
+            kept[page_num] = dict(moved, page_number=info["page_number"],
+                                  filename=info["filename"], content_hash=info["content_hash"])
+        elif old is not None and old_texts.get(page_num) == read_text(output_dir / f"page_{page_num + 1:03d}.txt"):
+            # Même texte : l'extraction existante reste valable
+            kept[page_num] = dict(old, content_hash=info["content_hash"])
+        else:
+            if previous is not None:
+                info["resplit_date"] = resplit_date
+                changed_text += 1
+            kept[page_num] = info
+            resplit.add(page_num + 1)
+    result["pages"] = [kept[page_num] for page_num in range(total_pages)]
+
+    if previous is not None:
+        # Pages disparues depuis la version précédente
+        removed = range(total_pages + 1, previous.get("total_pages", 0) + 1)
+        for old_index in removed:
+            for ext in ("pdf", "txt"):
+                (output_dir / f"page_{old_index:03d}.{ext}").unlink(missing_ok=True)
+
+        # Extractions recopiées depuis leur ancien numéro ; un ancien numéro
+        # resté en place (inchangé ou même texte) garde la sienne
+        copies = {page_num + 1: moved["page_number"] for page_num, moved in moved_from.items()}
+        stale = {old_index for old_index in copies.values() if old_index in resplit}
+        stale.update(removed)
+        update_extractions(folder_name, copies, stale)
+
+    elapsed = time.perf_counter() - start_time
+    rate = len(to_split) / elapsed if elapsed > 0 else 0
+    log(f"   ✓ {len(to_split)} pages extraites en {elapsed:.1f} s ({rate:.1f} pages/s)")
+    if previous is not None:
+        log(f"   ✓ {changed_text} page(s) au texte modifié, à ré-extraire")
 
     # Sauvegarder l'index
     with open(index_file, 'w', encoding='utf-8') as f:
         json.dump(result, f, ensure_ascii=False, indent=2)
 
-    print(f"   ✓ Index sauvegardé: {index_file.name}")
+    log(f"   ✓ Index sauvegardé: {index_file.name}")
 
     return result
 
@@ -174,8 +448,12 @@ def detect_themes(text: str) -> list[str]:
     return detected
 
 
-def process_all_pdfs(force: bool = False) -> dict:
-    """Traite tous les PDFs disponibles."""
+def process_all_pdfs(force: bool = False, workers: int = 1, incremental: bool = False) -> dict:
+    """
+    Traite tous les PDFs disponibles.
+
+    Avec workers > 1, chaque PDF est scindé dans un processus du pool.
+    """
     ensure_directories()
 
     pdf_files = get_pdf_list()
@@ -187,8 +465,33 @@ def process_all_pdfs(force: bool = False) -> dict:
         "pdfs": []
     }
 
+    start_time = time.perf_counter()
+    split_results = {}
+    if workers <= 1 or len(pdf_files) <= 1:
+        for pdf_path in pdf_files:
+            split_results[pdf_path] = split_single_pdf(pdf_path, force=force, workers=workers,
+                                                       incremental=incremental)
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(pdf_files))) as executor:
+            futures = {
+                executor.submit(split_single_pdf, pdf_path, force, 1, False, incremental): pdf_path
+                for pdf_path in pdf_files
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                pdf_path = futures[future]
+                result = future.result()
+                split_results[pdf_path] = result
+                print(f"  ✓ [{done}/{len(pdf_files)}] {pdf_path.name}: "
+                      f"{result.get('total_pages', 0)} pages")
+
+    pages_done = sum(r.get("total_pages", 0) for r in split_results.values())
+    elapsed = time.perf_counter() - start_time
+    rate = pages_done / elapsed if elapsed > 0 else 0
+    print(f"\n⏱  {pages_done} pages en {elapsed:.1f} s ({rate:.1f} pages/s, "
+          f"{workers} processus)")
+
     for pdf_path in pdf_files:
-        result = split_single_pdf(pdf_path, force=force)
+        result = split_results[pdf_path]
         results["pdfs"].append({
             "name": pdf_path.name,
             "folder": result.get("folder_name", ""),
@@ -256,6 +559,20 @@ def main():
     if force:
         args.remove("--force")
 
+    incremental = "--incremental" in args
+    if incremental:
+        args.remove("--incremental")
+
+    workers = os.cpu_count() or 1
+    if "--workers" in args:
+        i = args.index("--workers")
+        try:
+            workers = max(1, int(args[i + 1]))
+        except (IndexError, ValueError):
+            print("❌ --workers attend un nombre de processus")
+            return
+        del args[i:i + 2]
+
     ensure_directories()
 
     if args:
@@ -269,10 +586,10 @@ def main():
             list_pdfs()
             return
 
-        split_single_pdf(pdf_path, force=force)
+        split_single_pdf(pdf_path, force=force, workers=workers, incremental=incremental)
     else:
         # Traiter tous les PDFs
-        results = process_all_pdfs(force=force)
+        results = process_all_pdfs(force=force, workers=workers, incremental=incremental)
 
         print("\n" + "="*50)
         print("📊 RÉSUMÉ")
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Tests de split_pdf_pages.py : hash des pages et mode --incremental.
+
+Usage:
+    python -m pytest tests/test_split_pdf_pages.py
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+from PyPDF2 import PageObject, PdfReader, PdfWriter
+from PyPDF2.generic import ArrayObject, DecodedStreamObject, DictionaryObject, NameObject
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+import split_pdf_pages  # noqa: E402
+
+
+def text_stream(writer: PdfWriter, text: str):
+    """Flux de contenu qui affiche text, ajouté au document."""
+    stream = DecodedStreamObject()
+    stream.set_data(f"BT /F1 12 Tf 72 700 Td ({text}) Tj ET".encode("latin-1"))
+    return writer._add_object(stream)
+
+
+def write_pdf(path: Path, pages: list, multi_stream: bool = False):
+    """PDF d'une page par texte ; multi_stream coupe chaque page en deux flux."""
+    writer = PdfWriter()
+    font = writer._add_object(DictionaryObject({
+        NameObject("/Type"): NameObject("/Font"),
+        NameObject("/Subtype"): NameObject("/Type1"),
+        NameObject("/BaseFont"): NameObject("/Helvetica"),
+    }))
+    for text in pages:
+        page = PageObject.create_blank_page(None, width=612, height=792)
+        page[NameObject("/Resources")] = DictionaryObject({
+            NameObject("/Font"): DictionaryObject({NameObject("/F1"): font}),
+        })
+        if multi_stream:
+            half = len(text) // 2
+            page[NameObject("/Contents")] = ArrayObject(
+                [text_stream(writer, text[:half]), text_stream(writer, text[half:])])
+        else:
+            page[NameObject("/Contents")] = text_stream(writer, text)
+        writer.add_page(page)
+    with open(path, "wb") as f:
+        writer.write(f)
+
+
+def test_content_hash_multi_stream_page(tmp_path):
+    write_pdf(tmp_path / "multi.pdf", ["Premiere page", "Seconde page"], multi_stream=True)
+    reader = PdfReader(str(tmp_path / "multi.pdf"))
+    assert isinstance(reader.pages[0].get_contents(), ArrayObject)
+
+    hashes = [split_pdf_pages.page_content_hash(page) for page in reader.pages]
+    assert hashes[0] != hashes[1]
+    # Stable d'une lecture à l'autre
+    reader_again = PdfReader(str(tmp_path / "multi.pdf"))
+    assert split_pdf_pages.page_content_hash(reader_again.pages[0]) == hashes[0]
+
+
+def test_split_multi_stream_pdf(tmp_path, monkeypatch):
+    monkeypatch.setattr(split_pdf_pages, "PAGES_DIR", tmp_path / "pages")
+    (tmp_path / "pages").mkdir()
+    write_pdf(tmp_path / "multi.pdf", ["Premiere page", "Seconde page"], multi_stream=True)
+
+    result = split_pdf_pages.split_single_pdf(tmp_path / "multi.pdf", verbose=False)
+
+    assert [p["page_number"] for p in result["pages"]] == [1, 2]
+    assert all(p["content_hash"] for p in result["pages"])
+
+
+@pytest.fixture
+def programme(tmp_path, monkeypatch):
+    """PDF de 4 pages scindé, avec une extraction par page."""
+    monkeypatch.setattr(split_pdf_pages, "PAGES_DIR", tmp_path / "pages")
+    monkeypatch.setattr(split_pdf_pages, "EXTRACTIONS_DIR", tmp_path / "extractions")
+    (tmp_path / "pages").mkdir()
+    pdf_path = tmp_path / "programme.pdf"
+    write_pdf(pdf_path, ["Page A", "Page B", "Page C", "Page D"])
+
+    result = split_pdf_pages.split_single_pdf(pdf_path, verbose=False)
+    folder = result["folder_name"]
+    extraction_dir = tmp_path / "extractions" / folder
+    extraction_dir.mkdir(parents=True)
+    index_file = tmp_path / "pages" / folder / "index.json"
+    for page in result["pages"]:
+        page["status"] = "extracted"
+        n = page["page_number"]
+        data = {"source": {"pdf": pdf_path.name, "page": n},
+                "competences": [{"code": f"C{n}", "source": {"pdf": pdf_path.name, "page": n}}]}
+        (extraction_dir / f"page_{n:03d}_competences.json").write_text(json.dumps(data), encoding="utf-8")
+    index_file.write_text(json.dumps(result), encoding="utf-8")
+    return pdf_path, extraction_dir
+
+
+def test_incremental_insert_keeps_moved_pages(programme):
+    pdf_path, extraction_dir = programme
+    write_pdf(pdf_path, ["Page A", "Nouvelle page", "Page B", "Page C", "Page D"])
+
+    result = split_pdf_pages.split_single_pdf(pdf_path, verbose=False, incremental=True)
+    pages = result["pages"]
+
+    # Seule la page insérée est à extraire
+    assert [p["status"] for p in pages] == ["extracted", "pending", "extracted", "extracted", "extracted"]
+    assert [bool(p.get("resplit_date")) for p in pages] == [False, True, False, False, False]
+    assert [p["page_number"] for p in pages] == [1, 2, 3, 4, 5]
+
+    # Les extractions ont suivi leur page
+    assert not (extraction_dir / "page_002_competences.json").exists()
+    for n, code in [(1, "C1"), (3, "C2"), (4, "C3"), (5, "C4")]:
+        data = json.loads((extraction_dir / f"page_{n:03d}_competences.json").read_text(encoding="utf-8"))
+        assert data["source"]["page"] == n
+        assert data["competences"] == [{"code": code, "source": {"pdf": pdf_path.name, "page": n}}]
+
+
+def read_extraction(extraction_dir: Path, n: int) -> dict:
+    return json.loads((extraction_dir / f"page_{n:03d}_competences.json").read_text(encoding="utf-8"))
+
+
+def test_incremental_duplicate_keeps_source_extraction(programme):
+    pdf_path, extraction_dir = programme
+    write_pdf(pdf_path, ["Page A", "Page A", "Page C", "Page D"])
+
+    result = split_pdf_pages.split_single_pdf(pdf_path, verbose=False, incremental=True)
+
+    # La page 1 est inchangée ; la page 2 reprend une copie de son extraction
+    assert [p["status"] for p in result["pages"]] == ["extracted"] * 4
+    assert read_extraction(extraction_dir, 1)["competences"][0]["code"] == "C1"
+    copy = read_extraction(extraction_dir, 2)
+    assert copy["source"]["page"] == 2
+    assert copy["competences"] == [{"code": "C1", "source": {"pdf": pdf_path.name, "page": 2}}]
+
+
+def test_incremental_appended_copy_keeps_source_extraction(programme):
+    pdf_path, extraction_dir = programme
+    write_pdf(pdf_path, ["Page A", "Page B", "Page C", "Page D", "Page B"])
+
+    result = split_pdf_pages.split_single_pdf(pdf_path, verbose=False, incremental=True)
+
+    assert [p["status"] for p in result["pages"]] == ["extracted"] * 5
+    for n, code in [(1, "C1"), (2, "C2"), (3, "C3"), (4, "C4"), (5, "C2")]:
+        data = read_extraction(extraction_dir, n)
+        assert data["source"]["page"] == n
+        assert data["competences"][0]["code"] == code
+
+
+def test_incremental_removed_pages_drop_extractions(programme):
+    pdf_path, extraction_dir = programme
+    write_pdf(pdf_path, ["Page A", "Page B"])
+
+    result = split_pdf_pages.split_single_pdf(pdf_path, verbose=False, incremental=True)
+
+    assert result["total_pages"] == 2
+    assert sorted(p.name for p in extraction_dir.iterdir()) == [
+        "page_001_competences.json", "page_002_competences.json"]
+    pages_dir = split_pdf_pages.PAGES_DIR / result["folder_name"]
+    assert not (pages_dir / "page_003.pdf").exists()
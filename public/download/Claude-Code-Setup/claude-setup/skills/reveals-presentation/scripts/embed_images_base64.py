@@ -9,20 +9,36 @@ La version embedded sera plus lourde mais entièrement portable (pas de dossier
 
 Usage:
     python embed_images_base64.py <fichier_html> [--output <fichier_sortie>] [--suffix <suffixe>]
+        [--quality 85] [--max-width 1600] [--workers N]
 
 Arguments:
     fichier_html : Fichier HTML contenant des balises <img> avec src locale
     --output : Nom du fichier de sortie (défaut: <nom>_embedded.html)
     --suffix : Suffixe pour le fichier de sortie (défaut: _embedded)
+    --quality : Recompresser les images en JPEG avec cette qualité (nécessite Pillow)
+    --max-width : Réduire les images plus larges que cette largeur en pixels (nécessite Pillow)
+    --workers : Nombre de threads d'encodage (défaut: automatique)
+
+Chaque image n'est lue et encodée qu'une fois, même si elle apparaît plusieurs fois.
+Sans --quality ni --max-width, les octets des images sont conservés tels quels.
 """
 
 import re
+import io
 import base64
+import hashlib
 import os
 import argparse
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+try:
+    from PIL import Image
+    HAS_PIL = True
+except ImportError:
+    HAS_PIL = False
+
 def get_image_mime_type(image_path):
     """Détermine le type MIME d'une image selon son extension."""
     ext = image_path.suffix.lower()
@@ -38,23 +54,126 @@ def get_image_mime_type(image_path):
     }
     return mime_types.get(ext, 'image/png')
 
-def image_to_base64(image_path):
-    """Convertit une image en chaîne base64."""
+# ============================================================================
+# ENCODAGE (cache par contenu + recompression optionnelle)
+# ============================================================================
+
+# Balises <img> avec src entre guillemets simples ou doubles
+IMG_PATTERN = re.compile(r'<img\s+([^>]*\s+)?src=(["\'])([^"\']+)\2([^>]*)>')
+
+# Sources laissées telles quelles (externes ou déjà en base64)
+EXTERNAL_PREFIXES = ('http://', 'https://', 'data:', '//', 'mailto:')
+
+# Formats que la recompression ne touche pas (vectoriel, animations, icônes)
+NON_RECOMPRESSIBLE = {'.svg', '.gif', '.ico'}
+
+# Data URI déjà calculés, clé = (SHA-256 du contenu, MIME, options de recompression)
+_encoding_cache = {}
+
+
+def recompress_image(data, quality=85, max_width=None):
+    """
+    Recompresse une image (même logique que compress_and_encode_image).
+
+    Les images avec transparence restent en PNG optimisé, les autres passent
+    en JPEG. Redimensionne si l'image dépasse max_width.
+
+    Returns:
+        (octets, type MIME) ou None si Pillow est absent ou l'image illisible
+    """
+    if not HAS_PIL:
+        return None
+    try:
+        img = Image.open(io.BytesIO(data))
+        img.load()
+    except Exception:
+        return None
+
+    if max_width and img.width > max_width:
+        ratio = max_width / img.width
+        img = img.resize((max_width, max(1, int(img.height * ratio))), Image.Resampling.LANCZOS)
+
+    buffer = io.BytesIO()
+    if img.mode in ('RGBA', 'LA', 'P'):
+        # Garder PNG pour les images avec transparence
+        img.save(buffer, format='PNG', optimize=True)
+        return buffer.getvalue(), 'image/png'
+
+    if img.mode != 'RGB':
+        img = img.convert('RGB')
+    img.save(buffer, format='JPEG', quality=quality, optimize=True)
+    return buffer.getvalue(), 'image/jpeg'
+
+
+def encode_image(image_path, quality=None, max_width=None):
+    """
+    Encode une image en data URI, une seule fois par contenu.
+
+    Deux chemins vers le même fichier (ou deux copies identiques) partagent
+    le même encodage. Si quality ou max_width est donné, l'image est
+    recompressée et le résultat n'est gardé que s'il est plus petit.
+
+    Returns:
+        (data_uri, taille_originale, taille_encodee) ou None en cas d'erreur
+    """
     try:
-        with open(image_path, 'rb') as img_file:
-            return base64.b64encode(img_file.read()).decode('utf-8')
+        data = image_path.read_bytes()
     except Exception as e:
         print(f"  ERREUR lors de la lecture de {image_path}: {e}")
         return None
 
-def convert_html_images_to_base64(html_file_path, output_file_path=None, suffix="_embedded"):
+    mime_type = get_image_mime_type(image_path)
+    recompress = (quality is not None or max_width is not None) and \
+        image_path.suffix.lower() not in NON_RECOMPRESSIBLE
+    key = (hashlib.sha256(data).hexdigest(), mime_type, quality, max_width) if recompress \
+        else (hashlib.sha256(data).hexdigest(), mime_type)
+
+    cached = _encoding_cache.get(key)
+    if cached is not None:
+        return cached
+
+    payload = data
+    if recompress:
+        result = recompress_image(data, quality if quality is not None else 85, max_width)
+        if result is not None and len(result[0]) < len(data):
+            payload, mime_type = result
+
+    data_uri = f"data:{mime_type};base64,{base64.b64encode(payload).decode('utf-8')}"
+    entry = (data_uri, len(data), len(payload))
+    _encoding_cache[key] = entry
+    return entry
+
+
+def encode_images(image_paths, quality=None, max_width=None, workers=None):
+    """
+    Encode des images en parallèle (lecture disque, zlib et base64 libèrent le GIL).
+
+    Returns:
+        dict {chemin: résultat de encode_image}
+    """
+    image_paths = list(dict.fromkeys(image_paths))
+    if len(image_paths) <= 1 or workers == 1:
+        return {p: encode_image(p, quality, max_width) for p in image_paths}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(lambda p: encode_image(p, quality, max_width), image_paths)
+        return dict(zip(image_paths, results))
+
+
+def convert_html_images_to_base64(html_file_path, output_file_path=None, suffix="_embedded",
+                                  quality=None, max_width=None, workers=None):
     """
     Convertit toutes les images locales d'un fichier HTML en base64.
 
+    Les images sont encodées en parallèle (une fois par contenu), puis le HTML
+    est réécrit en une seule passe.
+
     Args:
         html_file_path: Chemin vers le fichier HTML source
         output_file_path: Chemin vers le fichier HTML de sortie (optionnel)
         suffix: Suffixe à ajouter au nom du fichier si output_file_path n'est pas spécifié
+        quality: Qualité JPEG pour recompresser les images (optionnel, nécessite Pillow)
+        max_width: Largeur maximale en pixels, les images plus larges sont réduites (optionnel)
+        workers: Nombre de threads d'encodage (défaut: automatique)
 
     Returns:
         Path vers le fichier créé
@@ -75,64 +194,70 @@ def convert_html_images_to_base64(html_file_path, output_file_path=None, suffix=
     with open(html_path, 'r', encoding='utf-8') as f:
         html_content = f.read()
 
-    # Trouver toutes les balises img avec src
-    # Pattern pour capturer les guillemets simples ou doubles
-    img_pattern = r'<img\s+([^>]*\s+)?src=(["\'])([^"\']+)\2([^>]*)>'
-    matches = list(re.finditer(img_pattern, html_content))
-
+    matches = list(IMG_PATTERN.finditer(html_content))
     print(f"  -> {len(matches)} balise(s) <img> trouvee(s)\n")
 
+    if (quality is not None or max_width is not None) and not HAS_PIL:
+        print("WARNING: Pillow non installé, images non recompressées.")
+        print("Installer avec: pip install Pillow\n")
+
+    # Encoder toutes les images locales existantes avant la réécriture
+    local_paths = []
+    for match in matches:
+        src_value = match.group(3)
+        if not src_value.startswith(EXTERNAL_PREFIXES):
+            image_path = html_path.parent / src_value
+            if image_path.exists():
+                local_paths.append(image_path)
+    encoded = encode_images(local_paths, quality, max_width, workers)
+
     # Compter les images converties
     converted_count = 0
     skipped_count = 0
     total_size_kb = 0
+    total_original_kb = 0
+    counter = iter(range(1, len(matches) + 1))
 
-    # Parcourir toutes les correspondances
-    for i, match in enumerate(matches, 1):
-        full_tag = match.group(0)
-        quote_char = match.group(2)  # Mémoriser le type de guillemet utilisé
+    def replace_tag(match):
+        nonlocal converted_count, skipped_count, total_size_kb, total_original_kb
+        i = next(counter)
         src_value = match.group(3)
 
         # Ignorer les URLs externes et les images déjà en base64
-        if src_value.startswith(('http://', 'https://', 'data:', '//', 'mailto:')):
+        if src_value.startswith(EXTERNAL_PREFIXES):
             print(f"[{i}/{len(matches)}] Ignoré (externe/base64): {src_value[:50]}...")
             skipped_count += 1
-            continue
+            return match.group(0)
 
-        # Construire le chemin complet vers l'image
         image_path = html_path.parent / src_value
-
-        if not image_path.exists():
+        if image_path not in encoded:
             print(f"[{i}/{len(matches)}] Image introuvable: {src_value}")
             print(f"  Chemin recherché: {image_path}")
             skipped_count += 1
-            continue
+            return match.group(0)
 
-        # Convertir l'image en base64
         print(f"[{i}/{len(matches)}] Conversion: {src_value}...")
-        base64_data = image_to_base64(image_path)
-
-        if base64_data is None:
+        result = encoded[image_path]
+        if result is None:
             skipped_count += 1
-            continue
-
-        # Déterminer le type MIME
-        mime_type = get_image_mime_type(image_path)
+            return match.group(0)
 
-        # Créer le data URI
-        data_uri = f"data:{mime_type};base64,{base64_data}"
-
-        # Créer la nouvelle balise img avec data URI (en conservant le type de guillemet)
-        new_tag = full_tag.replace(f'src={quote_char}{src_value}{quote_char}', f'src={quote_char}{data_uri}{quote_char}')
-
-        # Remplacer dans le HTML
-        html_content = html_content.replace(full_tag, new_tag)
+        data_uri, original_size, encoded_size = result
         converted_count += 1
+        total_size_kb += encoded_size / 1024
+        total_original_kb += original_size / 1024
+        if encoded_size < original_size:
+            print(f"  OK ({encoded_size / 1024:.1f} KB, avant recompression: {original_size / 1024:.1f} KB)")
+        else:
+            print(f"  OK ({encoded_size / 1024:.1f} KB)")
+
+        # Remplacer uniquement la valeur de src (en conservant le type de guillemet)
+        start, end = match.span(3)
+        tag_start = match.start()
+        full_tag = match.group(0)
+        return full_tag[:start - tag_start] + data_uri + full_tag[end - tag_start:]
 
-        # Afficher la taille de l'image
-        size_kb = len(base64_data) * 3 / 4 / 1024  # Approximation de la taille
-        total_size_kb += size_kb
-        print(f"  OK ({size_kb:.1f} KB)")
+    html_content = IMG_PATTERN.sub(replace_tag, html_content)
 
     # Écrire le nouveau fichier HTML
     print(f"\nEcriture du fichier {output_path.name}...")
@@ -148,6 +273,8 @@ def convert_html_images_to_base64(html_file_path, output_file_path=None, suffix=
     print(f"  - {converted_count} image(s) convertie(s) en base64")
     print(f"  - {skipped_count} image(s) ignoree(s)")
     print(f"  - Taille totale des images: {total_size_kb:.1f} KB")
+    if total_size_kb < total_original_kb:
+        print(f"  - Avant recompression: {total_original_kb:.1f} KB")
     print(f"\nTailles des fichiers:")
     print(f"  - Original: {original_size_kb:.1f} KB")
     print(f"  - Embedded: {new_size_kb:.1f} KB")
@@ -176,13 +303,32 @@ def main():
         help="Suffixe pour le fichier de sortie si --output n'est pas spécifié (défaut: _embedded)"
     )
 
+    parser.add_argument(
+        "--quality",
+        type=int,
+        help="Recompresser les images opaques en JPEG avec cette qualité, ex. 85 (nécessite Pillow)"
+    )
+    parser.add_argument(
+        "--max-width",
+        type=int,
+        help="Réduire les images plus larges que cette largeur en pixels (nécessite Pillow)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Nombre de threads d'encodage (défaut: automatique)"
+    )
+
     args = parser.parse_args()
 
     try:
         output_path = convert_html_images_to_base64(
             args.html_file,
             args.output,
-            args.suffix
+            args.suffix,
+            quality=args.quality,
+            max_width=args.max_width,
+            workers=args.workers
         )
 
         print(f"\nLe fichier embedded est pret pour le partage:")
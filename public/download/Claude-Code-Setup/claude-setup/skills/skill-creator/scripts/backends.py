@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""Query backends for run_eval.py.
+
+A backend runs one eval query and streams its stream-json output as raw
+bytes; run_eval decodes the events and decides whether the skill triggered.
+
+- ClaudeCliBackend runs `claude -p` (the real thing).
+- SimulatedBackend is a deterministic local stand-in. It emits realistic
+  stream-json events with configurable latency and trigger behavior, so the
+  eval harness itself can be benchmarked and regression-tested offline.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+import select
+import subprocess
+import time
+from typing import AsyncIterator, Iterator
+
+
+def build_command(query: str, model: str | None = None) -> list[str]:
+    """Build the `claude -p` command line for a query."""
+    cmd = [
+        "claude",
+        "-p", query,
+        "--output-format", "stream-json",
+        "--verbose",
+        "--include-partial-messages",
+    ]
+    if model:
+        cmd.extend(["--model", model])
+    return cmd
+
+
+def subprocess_env() -> dict[str, str]:
+    """Environment for nested `claude -p` runs.
+
+    Remove CLAUDECODE env var to allow nesting claude -p inside a
+    Claude Code session. The guard is for interactive terminal conflicts;
+    programmatic subprocess usage is safe.
+    """
+    return {k: v for k, v in os.environ.items() if k != "CLAUDECODE"}
+
+
+class ClaudeCliBackend:
+    """Run queries with the `claude` CLI."""
+
+    name = "claude"
+
+    def cache_key(self) -> str | None:
+        """Identifies the outcomes of this backend in the eval result cache."""
+        return self.name
+
+    def stream(
+        self,
+        query: str,
+        clean_name: str,
+        skill_description: str,
+        project_root: str,
+        model: str | None,
+        deadline: float,
+        run_index: int = 0,
+    ) -> Iterator[bytes]:
+        """Yield output chunks until EOF or the deadline (time.time()).
+
+        The process is killed when the generator is closed. run_index (the
+        number of earlier runs of this query) is not used by the CLI.
+        """
+        process = subprocess.Popen(
+            build_command(query, model),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            cwd=project_root,
+            env=subprocess_env(),
+        )
+        try:
+            while time.time() < deadline:
+                ready, _, _ = select.select([process.stdout], [], [], 1.0)
+                if not ready:
+                    if process.poll() is not None:
+                        return
+                    continue
+                chunk = os.read(process.stdout.fileno(), 8192)
+                if not chunk:
+                    return
+                yield chunk
+        finally:
+            # Clean up process on any exit path (decision, exception, timeout)
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+
+    async def astream(
+        self,
+        query: str,
+        clean_name: str,
+        skill_description: str,
+        project_root: str,
+        model: str | None,
+        run_index: int = 0,
+    ) -> AsyncIterator[bytes]:
+        """Yield output chunks until EOF. The process is killed on close or cancel."""
+        process = await asyncio.create_subprocess_exec(
+            *build_command(query, model),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            cwd=project_root,
+            env=subprocess_env(),
+        )
+        try:
+            while True:
+                chunk = await process.stdout.read(65536)
+                if not chunk:
+                    return
+                yield chunk
+        finally:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+
+
+# =============================================================================
+# Simulator
+# =============================================================================
+
+WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def keyword_trigger_probability(query: str, description: str) -> float:
+    """Default simulated trigger behavior: share of query words found in the description."""
+    query_words = set(WORD_RE.findall(query.lower()))
+    if not query_words:
+        return 0.0
+    description_words = set(WORD_RE.findall(description.lower()))
+    return len(query_words & description_words) / len(query_words)
+
+
+class SimulatedBackend:
+    """Deterministic stand-in for `claude -p`.
+
+    Every run of a (query, description) pair is reproducible for a given seed
+    and run index. The run index is passed by the executor, so the outcome
+    does not depend on which worker process or backend copy makes the run.
+    Each run waits `latency` seconds (+/- `jitter`) before its first event,
+    then emits `text_deltas` text deltas `event_interval` seconds apart. It
+    then either calls the Skill tool with the command name, in several
+    input_json_delta pieces, or stops without a tool call.
+
+    trigger_probability is either a constant or a function
+    (query, description) -> probability. It defaults to keyword overlap, so
+    improving a description changes the outcome as it would with Claude.
+    """
+
+    name = "simulate"
+
+    def __init__(
+        self,
+        latency: float = 0.5,
+        jitter: float = 0.2,
+        event_interval: float = 0.01,
+        text_deltas: int = 5,
+        trigger_probability=None,
+        seed: int = 0,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.event_interval = event_interval
+        self.text_deltas = text_deltas
+        self.trigger_probability = trigger_probability
+        self.seed = seed
+
+    def cache_key(self) -> str | None:
+        """Seed and trigger settings, or None (no caching) for a custom function.
+
+        Timing settings only change which runs time out, and those are not
+        cached.
+        """
+        if callable(self.trigger_probability):
+            return None
+        return json.dumps([self.name, self.seed, self.trigger_probability])
+
+    def _probability(self, query: str, description: str) -> float:
+        if self.trigger_probability is None:
+            return keyword_trigger_probability(query, description)
+        if callable(self.trigger_probability):
+            return self.trigger_probability(query, description)
+        return float(self.trigger_probability)
+
+    def _rng(self, query: str, description: str, run_index: int) -> random.Random:
+        digest = hashlib.sha256(
+            json.dumps([self.seed, query, description, run_index]).encode("utf-8")
+        ).digest()
+        return random.Random(digest)
+
+    def plan(self, query: str, clean_name: str, description: str,
+             run_index: int = 0) -> list[tuple[float, bytes]]:
+        """Events of run number run_index as (delay before the line, line) pairs."""
+        rng = self._rng(query, description, run_index)
+        triggered = rng.random() < self._probability(query, description)
+        first_delay = max(0.0, self.latency + rng.uniform(-self.jitter, self.jitter))
+
+        def stream_event(event: dict) -> dict:
+            return {"type": "stream_event", "event": event}
+
+        events = [
+            {"type": "system", "subtype": "init", "session_id": f"sim-{clean_name}"},
+            stream_event({"type": "message_start", "message": {"role": "assistant"}}),
+            stream_event({"type": "content_block_start", "index": 0,
+                          "content_block": {"type": "text", "text": ""}}),
+        ]
+        events += [
+            stream_event({"type": "content_block_delta", "index": 0,
+                          "delta": {"type": "text_delta", "text": f"token{i} "}})
+            for i in range(self.text_deltas)
+        ]
+        events.append(stream_event({"type": "content_block_stop", "index": 0}))
+
+        if triggered:
+            tool_input = json.dumps({"skill": clean_name})
+            pieces = [tool_input[i:i + 8] for i in range(0, len(tool_input), 8)]
+            events.append(stream_event({"type": "content_block_start", "index": 1,
+                                        "content_block": {"type": "tool_use", "name": "Skill", "input": {}}}))
+            events += [
+                stream_event({"type": "content_block_delta", "index": 1,
+                              "delta": {"type": "input_json_delta", "partial_json": piece}})
+                for piece in pieces
+            ]
+            events.append(stream_event({"type": "content_block_stop", "index": 1}))
+        else:
+            events.append(stream_event({"type": "message_stop"}))
+        events.append({"type": "result", "subtype": "success", "is_error": False})
+
+        lines = [(json.dumps(e) + "\n").encode("utf-8") for e in events]
+        return [(first_delay if i == 0 else self.event_interval, line) for i, line in enumerate(lines)]
+
+    def stream(
+        self,
+        query: str,
+        clean_name: str,
+        skill_description: str,
+        project_root: str,
+        model: str | None,
+        deadline: float,
+        run_index: int = 0,
+    ) -> Iterator[bytes]:
+        for delay, line in self.plan(query, clean_name, skill_description, run_index):
+            if time.time() + delay > deadline:
+                time.sleep(max(0.0, deadline - time.time()))
+                return
+            time.sleep(delay)
+            yield line
+
+    async def astream(
+        self,
+        query: str,
+        clean_name: str,
+        skill_description: str,
+        project_root: str,
+        model: str | None,
+        run_index: int = 0,
+    ) -> AsyncIterator[bytes]:
+        for delay, line in self.plan(query, clean_name, skill_description, run_index):
+            await asyncio.sleep(delay)
+            yield line
+
+
+def simulated_improve_description(current_description: str, eval_results: dict, iteration: int) -> str:
+    """Offline stand-in for improve_description(): add the words of failed should-trigger queries."""
+    missing = []
+    for r in eval_results["results"]:
+        if r["should_trigger"] and not r["pass"]:
+            missing.extend(w for w in WORD_RE.findall(r["query"].lower()) if w not in missing)
+    if not missing:
+        return f"{current_description} (revision {iteration})"
+    return f"{current_description} Also covers: {' '.join(missing)}."
+
+
+# =============================================================================
+# Command line
+# =============================================================================
+
+def add_backend_arguments(parser):
+    """Add --backend and the simulator options to an argparse parser."""
+    parser.add_argument("--backend", choices=["claude", "simulate"], default="claude",
+                        help="Run queries with the claude CLI or the offline simulator")
+    parser.add_argument("--sim-latency", type=float, default=0.5,
+                        help="Simulator: seconds before the first event of a run")
+    parser.add_argument("--sim-jitter", type=float, default=0.2,
+                        help="Simulator: +/- random variation of the latency")
+    parser.add_argument("--sim-trigger-prob", type=float, default=None,
+                        help="Simulator: fixed trigger probability (default: keyword overlap)")
+    parser.add_argument("--sim-seed", type=int, default=0, help="Simulator: random seed")
+
+
+def backend_from_args(args):
+    """Build the backend selected on the command line."""
+    if args.backend == "simulate":
+        return SimulatedBackend(
+            latency=args.sim_latency,
+            jitter=args.sim_jitter,
+            trigger_probability=args.sim_trigger_prob,
+            seed=args.sim_seed,
+        )
+    return ClaudeCliBackend()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Benchmark the eval harness itself, offline.
+
+Runs a synthetic eval set through run_eval() on the simulated backend, for
+each executor and --num-workers setting. It reports the harness's own
+throughput: runs/s, events/s, time to decision, and how busy the
+concurrency slots were. No claude CLI or API access is needed.
+
+Usage:
+    python -m scripts.benchmark_eval
+    python -m scripts.benchmark_eval --workers 1,8,32 --queries 40 --latency 0.2
+    python -m scripts.benchmark_eval --executors async --output bench.json
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+from scripts.backends import SimulatedBackend
+from scripts.run_eval import run_eval
+
+DESCRIPTION = "Create, convert and validate benchmark spreadsheets and charts"
+
+
+def synthetic_eval_set(num_queries: int) -> list[dict]:
+    """Half the queries share words with DESCRIPTION (should trigger), half don't."""
+    eval_set = []
+    for i in range(num_queries):
+        if i % 2 == 0:
+            query = f"please convert benchmark spreadsheets number {i} and validate the charts"
+        else:
+            query = f"write a short poem about the sea, variation {i}"
+        eval_set.append({"query": query, "should_trigger": i % 2 == 0})
+    return eval_set
+
+
+def run_case(executor: str, num_workers: int, args) -> dict:
+    """Run the synthetic eval set once and return run_eval's metrics."""
+    backend = SimulatedBackend(
+        latency=args.latency,
+        jitter=args.jitter,
+        event_interval=args.event_interval,
+        seed=args.seed,
+    )
+    with tempfile.TemporaryDirectory() as project_root:
+        output = run_eval(
+            eval_set=synthetic_eval_set(args.queries),
+            skill_name="bench",
+            description=DESCRIPTION,
+            num_workers=num_workers,
+            timeout=args.timeout,
+            project_root=Path(project_root),
+            runs_per_query=args.runs_per_query,
+            executor=executor,
+            backend=backend,
+        )
+    metrics = output["metrics"]
+    summary = output["summary"]
+    ttd = metrics["mean_time_to_decision"]
+    return {
+        "executor": executor,
+        "num_workers": num_workers,
+        "passed": summary["passed"],
+        "total": summary["total"],
+        **metrics,
+        # Time to decision beyond the simulated first-event latency
+        "decision_overhead_ms": round((ttd - args.latency) * 1000, 1) if ttd is not None else None,
+    }
+
+
+def print_table(rows: list[dict]):
+    header = (f"{'executor':<9} {'workers':>7} {'runs':>5} {'wall s':>8} {'runs/s':>8} "
+              f"{'events/s':>9} {'ttd s':>7} {'ovh ms':>7} {'util':>6}")
+    print(header)
+    print("-" * len(header))
+    for r in rows:
+        ttd = r["mean_time_to_decision"]
+        overhead = r["decision_overhead_ms"]
+        print(
+            f"{r['executor']:<9} {r['num_workers']:>7} {r['queries']:>5} {r['wall_seconds']:>8.2f} "
+            f"{r['queries_per_second']:>8.2f} {r['events_per_second']:>9.1f} "
+            f"{ttd if ttd is not None else float('nan'):>7.3f} "
+            f"{overhead if overhead is not None else float('nan'):>7.1f} {r['utilization']:>6.0%}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the eval harness with the offline simulator")
+    parser.add_argument("--workers", default="1,4,16,64", help="Comma-separated --num-workers values")
+    parser.add_argument("--executors", default="async,process", help="Comma-separated executors to compare")
+    parser.add_argument("--queries", type=int, default=32, help="Number of synthetic queries")
+    parser.add_argument("--runs-per-query", type=int, default=3, help="Number of runs per query")
+    parser.add_argument("--latency", type=float, default=0.2, help="Simulated seconds before the first event")
+    parser.add_argument("--jitter", type=float, default=0.05, help="Simulated latency variation")
+    parser.add_argument("--event-interval", type=float, default=0.005, help="Simulated seconds between events")
+    parser.add_argument("--timeout", type=int, default=30, help="Timeout per query in seconds")
+    parser.add_argument("--seed", type=int, default=0, help="Simulator seed")
+    parser.add_argument("--output", default=None, help="Also write the results as JSON to this path")
+    args = parser.parse_args()
+
+    rows = []
+    for executor in [e.strip() for e in args.executors.split(",") if e.strip()]:
+        for num_workers in [int(w) for w in args.workers.split(",") if w.strip()]:
+            print(f"Running {executor} with {num_workers} workers...", file=sys.stderr)
+            rows.append(run_case(executor, num_workers, args))
+
+    print_table(rows)
+    if args.output:
+        Path(args.output).write_text(json.dumps(rows, indent=2))
+        print(f"\nResults saved to: {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
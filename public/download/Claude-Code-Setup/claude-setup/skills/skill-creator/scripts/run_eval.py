@@ -3,19 +3,27 @@
 
 Tests whether a skill's description causes Claude to trigger (read the skill)
 for a set of queries. Outputs results as JSON.
+
+Queries run through a backend (see backends.py): the claude CLI by default,
+or an offline simulator with --backend simulate.
 """
 
 import argparse
+import asyncio
+import codecs
+import hashlib
 import json
-import os
-import select
-import subprocess
 import sys
 import time
 import uuid
 from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
+from scripts.backends import (
+    ClaudeCliBackend,
+    add_backend_arguments,
+    backend_from_args,
+)
 from scripts.utils import parse_skill_md
 
 
@@ -32,6 +40,131 @@ def find_project_root() -> Path:
     return current
 
 
+def write_command_file(project_root: str, skill_name: str, skill_description: str) -> tuple[str, Path]:
+    """Create a uniquely named command file so the skill shows up in available_skills.
+
+    Returns (clean_name, command_file). The caller is responsible for removing
+    the file once the query is done.
+    """
+    unique_id = uuid.uuid4().hex[:8]
+    clean_name = f"{skill_name}-skill-{unique_id}"
+    project_commands_dir = Path(project_root) / ".claude" / "commands"
+    command_file = project_commands_dir / f"{clean_name}.md"
+
+    project_commands_dir.mkdir(parents=True, exist_ok=True)
+    # Use YAML block scalar to avoid breaking on quotes in description
+    indented_desc = "\n  ".join(skill_description.split("\n"))
+    command_content = (
+        f"---\n"
+        f"description: |\n"
+        f"  {indented_desc}\n"
+        f"---\n\n"
+        f"# {skill_name}\n\n"
+        f"This skill handles: {skill_description}\n"
+    )
+    command_file.write_text(command_content)
+    return clean_name, command_file
+
+
+class StreamJsonDecoder:
+    """Incremental decoder for stream-json output (one JSON object per line)."""
+
+    def __init__(self):
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._buffer = ""
+
+    def feed(self, chunk: bytes) -> list[dict]:
+        """Decode a chunk of output and return the complete events it finished."""
+        self._buffer += self._decoder.decode(chunk)
+        events = []
+        while "\n" in self._buffer:
+            line, self._buffer = self._buffer.split("\n", 1)
+            event = self._parse(line)
+            if event is not None:
+                events.append(event)
+        return events
+
+    def flush(self) -> list[dict]:
+        """Return the last event if the output did not end with a newline."""
+        line, self._buffer = self._buffer + self._decoder.decode(b"", final=True), ""
+        event = self._parse(line)
+        return [event] if event is not None else []
+
+    @staticmethod
+    def _parse(line: str) -> dict | None:
+        line = line.strip()
+        if not line:
+            return None
+        try:
+            event = json.loads(line)
+        except json.JSONDecodeError:
+            return None
+        return event if isinstance(event, dict) else None
+
+
+class TriggerDetector:
+    """Decide from stream-json events whether the skill was triggered.
+
+    Uses --include-partial-messages stream events (content_block_start) to
+    decide early rather than waiting for the full assistant message, which
+    only arrives after tool execution. feed() returns True/False as soon as
+    the outcome is known, None while it is still undecided.
+    """
+
+    def __init__(self, clean_name: str):
+        self.clean_name = clean_name
+        self.pending_tool_name = None
+        self.accumulated_json = ""
+
+    def feed(self, event: dict) -> bool | None:
+        # Early detection via stream events
+        if event.get("type") == "stream_event":
+            se = event.get("event", {})
+            se_type = se.get("type", "")
+
+            if se_type == "content_block_start":
+                cb = se.get("content_block", {})
+                if cb.get("type") == "tool_use":
+                    tool_name = cb.get("name", "")
+                    if tool_name in ("Skill", "Read"):
+                        self.pending_tool_name = tool_name
+                        self.accumulated_json = ""
+                    else:
+                        return False
+
+            elif se_type == "content_block_delta" and self.pending_tool_name:
+                delta = se.get("delta", {})
+                if delta.get("type") == "input_json_delta":
+                    self.accumulated_json += delta.get("partial_json", "")
+                    if self.clean_name in self.accumulated_json:
+                        return True
+
+            elif se_type in ("content_block_stop", "message_stop"):
+                if self.pending_tool_name:
+                    return self.clean_name in self.accumulated_json
+                if se_type == "message_stop":
+                    return False
+
+        # Fallback: full assistant message
+        elif event.get("type") == "assistant":
+            message = event.get("message", {})
+            for content_item in message.get("content", []):
+                if content_item.get("type") != "tool_use":
+                    continue
+                tool_name = content_item.get("name", "")
+                tool_input = content_item.get("input", {})
+                if tool_name == "Skill" and self.clean_name in tool_input.get("skill", ""):
+                    return True
+                if tool_name == "Read" and self.clean_name in tool_input.get("file_path", ""):
+                    return True
+                return False
+
+        elif event.get("type") == "result":
+            return False
+
+        return None
+
+
 def run_single_query(
     query: str,
     skill_name: str,
@@ -39,149 +172,278 @@ def run_single_query(
     timeout: int,
     project_root: str,
     model: str | None = None,
+    backend=None,
+    stats: dict | None = None,
+    run_index: int = 0,
 ) -> bool:
     """Run a single query and return whether the skill was triggered.
 
     Creates a command file in .claude/commands/ so it appears in Claude's
-    available_skills list, then runs `claude -p` with the raw query.
-    Uses --include-partial-messages to detect triggering early from
-    stream events (content_block_start) rather than waiting for the
-    full assistant message, which only arrives after tool execution.
+    available_skills list, then runs the query through the backend
+    (`claude -p` by default). Used by the process-pool executor; see
+    run_single_query_async() for the asyncio executor. If stats is given,
+    it receives the number of events and whether the run was decided or
+    timed out. run_index numbers the runs of the same query (0, 1, ...) for
+    backends whose outcome depends on it, such as the simulator.
     """
-    unique_id = uuid.uuid4().hex[:8]
-    clean_name = f"{skill_name}-skill-{unique_id}"
-    project_commands_dir = Path(project_root) / ".claude" / "commands"
-    command_file = project_commands_dir / f"{clean_name}.md"
-
+    backend = backend or ClaudeCliBackend()
+    stats = stats if stats is not None else {}
+    stats.update(events=0, decided=False, timed_out=False)
+    command_file = None
     try:
-        project_commands_dir.mkdir(parents=True, exist_ok=True)
-        # Use YAML block scalar to avoid breaking on quotes in description
-        indented_desc = "\n  ".join(skill_description.split("\n"))
-        command_content = (
-            f"---\n"
-            f"description: |\n"
-            f"  {indented_desc}\n"
-            f"---\n\n"
-            f"# {skill_name}\n\n"
-            f"This skill handles: {skill_description}\n"
-        )
-        command_file.write_text(command_content)
-
-        cmd = [
-            "claude",
-            "-p", query,
-            "--output-format", "stream-json",
-            "--verbose",
-            "--include-partial-messages",
-        ]
-        if model:
-            cmd.extend(["--model", model])
-
-        # Remove CLAUDECODE env var to allow nesting claude -p inside a
-        # Claude Code session. The guard is for interactive terminal conflicts;
-        # programmatic subprocess usage is safe.
-        env = {k: v for k, v in os.environ.items() if k != "CLAUDECODE"}
-
-        process = subprocess.Popen(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.DEVNULL,
-            cwd=project_root,
-            env=env,
-        )
-
-        triggered = False
-        start_time = time.time()
-        buffer = ""
-        # Track state for stream event detection
-        pending_tool_name = None
-        accumulated_json = ""
+        clean_name, command_file = write_command_file(project_root, skill_name, skill_description)
 
+        decoder = StreamJsonDecoder()
+        detector = TriggerDetector(clean_name)
+        deadline = time.time() + timeout
+        chunks = backend.stream(query, clean_name, skill_description, project_root, model, deadline,
+                                run_index)
         try:
-            while time.time() - start_time < timeout:
-                if process.poll() is not None:
-                    remaining = process.stdout.read()
-                    if remaining:
-                        buffer += remaining.decode("utf-8", errors="replace")
-                    break
+            for chunk in chunks:
+                for event in decoder.feed(chunk):
+                    stats["events"] += 1
+                    decision = detector.feed(event)
+                    if decision is not None:
+                        stats["decided"] = True
+                        return decision
+            for event in decoder.flush():
+                stats["events"] += 1
+                decision = detector.feed(event)
+                if decision is not None:
+                    stats["decided"] = True
+                    return decision
+            stats["timed_out"] = time.time() >= deadline
+        finally:
+            # Stops the backend (kills the process) on any exit path
+            chunks.close()
 
-                ready, _, _ = select.select([process.stdout], [], [], 1.0)
-                if not ready:
-                    continue
+        return False
+    finally:
+        if command_file is not None and command_file.exists():
+            command_file.unlink()
 
-                chunk = os.read(process.stdout.fileno(), 8192)
-                if not chunk:
-                    break
-                buffer += chunk.decode("utf-8", errors="replace")
-
-                while "\n" in buffer:
-                    line, buffer = buffer.split("\n", 1)
-                    line = line.strip()
-                    if not line:
-                        continue
-
-                    try:
-                        event = json.loads(line)
-                    except json.JSONDecodeError:
-                        continue
-
-                    # Early detection via stream events
-                    if event.get("type") == "stream_event":
-                        se = event.get("event", {})
-                        se_type = se.get("type", "")
-
-                        if se_type == "content_block_start":
-                            cb = se.get("content_block", {})
-                            if cb.get("type") == "tool_use":
-                                tool_name = cb.get("name", "")
-                                if tool_name in ("Skill", "Read"):
-                                    pending_tool_name = tool_name
-                                    accumulated_json = ""
-                                else:
-                                    return False
-
-                        elif se_type == "content_block_delta" and pending_tool_name:
-                            delta = se.get("delta", {})
-                            if delta.get("type") == "input_json_delta":
-                                accumulated_json += delta.get("partial_json", "")
-                                if clean_name in accumulated_json:
-                                    return True
-
-                        elif se_type in ("content_block_stop", "message_stop"):
-                            if pending_tool_name:
-                                return clean_name in accumulated_json
-                            if se_type == "message_stop":
-                                return False
-
-                    # Fallback: full assistant message
-                    elif event.get("type") == "assistant":
-                        message = event.get("message", {})
-                        for content_item in message.get("content", []):
-                            if content_item.get("type") != "tool_use":
-                                continue
-                            tool_name = content_item.get("name", "")
-                            tool_input = content_item.get("input", {})
-                            if tool_name == "Skill" and clean_name in tool_input.get("skill", ""):
-                                triggered = True
-                            elif tool_name == "Read" and clean_name in tool_input.get("file_path", ""):
-                                triggered = True
-                            return triggered
-
-                    elif event.get("type") == "result":
-                        return triggered
-        finally:
-            # Clean up process on any exit path (return, exception, timeout)
-            if process.poll() is None:
-                process.kill()
-                process.wait()
 
-        return triggered
+def _run_single_query_timed(*args, run_index: int = 0) -> tuple[bool, float, dict]:
+    """Process-pool entry point: run_single_query() plus elapsed time and stats."""
+    stats: dict = {}
+    start = time.monotonic()
+    triggered = run_single_query(*args, stats=stats, run_index=run_index)
+    return triggered, time.monotonic() - start, stats
+
+
+# =============================================================================
+# Asyncio executor
+# =============================================================================
+
+class EvalMetrics:
+    """Throughput metrics of an eval run (both executors)."""
+
+    def __init__(self, max_concurrency: int):
+        self.max_concurrency = max_concurrency
+        self.started = 0
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.events = 0
+        self.cached_runs = 0
+        self.skipped_runs = 0
+        self.active = 0
+        self.peak_active = 0
+        self.decision_times: list[float] = []
+        self._start = time.monotonic()
+        self._busy_time = 0.0
+
+    def query_started(self):
+        self.started += 1
+        self.active += 1
+        self.peak_active = max(self.peak_active, self.active)
+
+    def query_finished(self, elapsed: float, decided: bool):
+        self.active -= 1
+        self.completed += 1
+        self._busy_time += elapsed
+        if decided:
+            self.decision_times.append(elapsed)
+
+    def record_run(self, elapsed: float, stats: dict):
+        """Record a run measured in a worker process."""
+        self.started += 1
+        self.completed += 1
+        self._busy_time += elapsed
+        self.events += stats.get("events", 0)
+        if stats.get("timed_out"):
+            self.timeouts += 1
+        if stats.get("decided"):
+            self.decision_times.append(elapsed)
+
+    def to_dict(self) -> dict:
+        wall = time.monotonic() - self._start
+        times = sorted(self.decision_times)
+        return {
+            "queries": self.completed,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+            "events": self.events,
+            "cached_runs": self.cached_runs,
+            "skipped_runs": self.skipped_runs,
+            "wall_seconds": round(wall, 3),
+            "queries_per_second": round(self.completed / wall, 3) if wall > 0 else 0.0,
+            "events_per_second": round(self.events / wall, 1) if wall > 0 else 0.0,
+            "mean_time_to_decision": round(sum(times) / len(times), 3) if times else None,
+            "max_time_to_decision": round(times[-1], 3) if times else None,
+            "max_concurrency": self.max_concurrency,
+            "peak_concurrency": self.peak_active,
+            # Share of the concurrency slots that were busy over the run
+            "utilization": round(self._busy_time / (wall * self.max_concurrency), 3) if wall > 0 else 0.0,
+        }
+
+
+async def run_single_query_async(
+    query: str,
+    skill_name: str,
+    skill_description: str,
+    timeout: int,
+    project_root: str,
+    model: str | None = None,
+    metrics: EvalMetrics | None = None,
+    backend=None,
+    run_index: int = 0,
+    stats: dict | None = None,
+) -> bool:
+    """Async version of run_single_query().
+
+    Reads the stream-json output incrementally and stops the backend (kills
+    `claude -p`) as soon as triggering is decided or the timeout expires.
+    If stats is given, it receives whether the run timed out.
+    """
+    backend = backend or ClaudeCliBackend()
+    stats = stats if stats is not None else {}
+    stats.update(timed_out=False)
+    command_file = None
+    chunks = None
+    decided = False
+    start = time.monotonic()
+    if metrics:
+        metrics.query_started()
+
+    async def read_decision() -> bool:
+        nonlocal decided
+        decoder = StreamJsonDecoder()
+        detector = TriggerDetector(clean_name)
+        async for chunk in chunks:
+            for event in decoder.feed(chunk):
+                if metrics:
+                    metrics.events += 1
+                decision = detector.feed(event)
+                if decision is not None:
+                    decided = True
+                    return decision
+        for event in decoder.flush():
+            if metrics:
+                metrics.events += 1
+            decision = detector.feed(event)
+            if decision is not None:
+                decided = True
+                return decision
+        return False
+
+    try:
+        clean_name, command_file = write_command_file(project_root, skill_name, skill_description)
+        chunks = backend.astream(query, clean_name, skill_description, project_root, model, run_index)
+        try:
+            return await asyncio.wait_for(read_decision(), timeout)
+        except asyncio.TimeoutError:
+            stats["timed_out"] = True
+            if metrics:
+                metrics.timeouts += 1
+            return False
     finally:
-        if command_file.exists():
+        if chunks is not None:
+            await chunks.aclose()
+        if command_file is not None and command_file.exists():
             command_file.unlink()
+        if metrics:
+            metrics.query_finished(time.monotonic() - start, decided)
 
 
-def run_eval(
+def decided_outcome(triggers: int, runs: int, total_runs: int, trigger_threshold: float) -> bool | None:
+    """Return whether the final trigger rate will reach the threshold, if already known.
+
+    After `runs` of `total_runs` runs, the final rate lies between
+    triggers/total_runs (no more triggers) and
+    (triggers + remaining)/total_runs (all remaining trigger). Once both
+    bounds fall on the same side of the threshold, pass/fail can no longer
+    change. Returns True/False (rate >= threshold or not), or None.
+    """
+    remaining = total_runs - runs
+    if triggers / total_runs >= trigger_threshold:
+        return True
+    if (triggers + remaining) / total_runs < trigger_threshold:
+        return False
+    return None
+
+
+def runs_until_decidable(triggers: int, runs: int, total_runs: int, trigger_threshold: float) -> int:
+    """Smallest number of further runs after which the outcome could be decided."""
+    remaining = total_runs - runs
+    for extra in range(1, remaining + 1):
+        if (decided_outcome(triggers + extra, runs + extra, total_runs, trigger_threshold) is not None
+                or decided_outcome(triggers, runs + extra, total_runs, trigger_threshold) is not None):
+            return extra
+    return remaining
+
+
+class EvalResultCache:
+    """Trigger outcomes of past runs, keyed by (query, description hash, model, backend).
+
+    Runs for an unchanged (query, description, model, backend) are reused
+    instead of re-running `claude -p`. backend is the backend's cache_key()
+    (e.g. the simulator seed). Optionally persisted to a JSON file.
+    """
+
+    VERSION = 2
+
+    def __init__(self, path: Path | None = None):
+        self.path = Path(path) if path else None
+        self.entries: dict[str, dict] = {}
+        if self.path and self.path.exists():
+            try:
+                data = json.loads(self.path.read_text())
+                if data.get("version") == self.VERSION:
+                    self.entries = data.get("entries", {})
+            except (json.JSONDecodeError, OSError):
+                pass
+
+    @staticmethod
+    def description_hash(description: str) -> str:
+        return hashlib.sha256(description.encode("utf-8")).hexdigest()[:16]
+
+    def _key(self, query: str, description: str, model: str | None, backend: str) -> str:
+        return json.dumps([query, self.description_hash(description), model or "", backend])
+
+    def get(self, query: str, description: str, model: str | None, backend: str) -> list[bool]:
+        """Cached trigger outcomes (possibly empty)."""
+        entry = self.entries.get(self._key(query, description, model, backend))
+        return list(entry["triggers"]) if entry else []
+
+    def add(self, query: str, description: str, model: str | None, backend: str, triggered: bool):
+        """Record the outcome of one run."""
+        entry = self.entries.setdefault(self._key(query, description, model, backend), {
+            "query": query,
+            "description_hash": self.description_hash(description),
+            "model": model or "",
+            "backend": backend,
+            "triggers": [],
+        })
+        entry["triggers"].append(triggered)
+
+    def save(self):
+        if self.path:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps({"version": self.VERSION, "entries": self.entries}))
+
+
+async def run_eval_async(
     eval_set: list[dict],
     skill_name: str,
     description: str,
@@ -191,39 +453,93 @@ def run_eval(
     runs_per_query: int = 1,
     trigger_threshold: float = 0.5,
     model: str | None = None,
+    cache: EvalResultCache | None = None,
+    early_stop: bool = False,
+    backend=None,
 ) -> dict:
-    """Run the full eval set and return results."""
-    results = []
-
-    with ProcessPoolExecutor(max_workers=num_workers) as executor:
-        future_to_info = {}
-        for item in eval_set:
-            for run_idx in range(runs_per_query):
-                future = executor.submit(
-                    run_single_query,
-                    item["query"],
-                    skill_name,
-                    description,
-                    timeout,
-                    str(project_root),
-                    model,
-                )
-                future_to_info[future] = (item, run_idx)
-
-        query_triggers: dict[str, list[bool]] = {}
-        query_items: dict[str, dict] = {}
-        for future in as_completed(future_to_info):
-            item, _ = future_to_info[future]
-            query = item["query"]
-            query_items[query] = item
-            if query not in query_triggers:
-                query_triggers[query] = []
+    """Run the eval set with asyncio subprocesses, at most num_workers at a time.
+
+    With a cache, outcomes already recorded for (query, description, model,
+    backend) count as runs; runs that raised or timed out are reported but
+    never cached, and nothing is cached for a backend without a cache_key().
+    With early_stop, a query stops being repeated as soon as its pass/fail
+    against trigger_threshold can no longer change; the reported rate is
+    then over the runs actually made.
+    """
+    backend = backend or ClaudeCliBackend()
+    backend_key = backend.cache_key()
+    if backend_key is None:
+        cache = None
+    metrics = EvalMetrics(num_workers)
+    semaphore = asyncio.Semaphore(num_workers)
+
+    async def run_one(item: dict, run_index: int) -> bool:
+        stats: dict = {}
+        async with semaphore:
             try:
-                query_triggers[query].append(future.result())
+                triggered = await run_single_query_async(
+                    item["query"], skill_name, description, timeout,
+                    str(project_root), model, metrics, backend, run_index, stats,
+                )
             except Exception as e:
+                # Counted as not triggered for this eval, like the process
+                # executor, but not cached: the next eval runs it again
                 print(f"Warning: query failed: {e}", file=sys.stderr)
-                query_triggers[query].append(False)
+                metrics.failed += 1
+                return False
+        # A timeout says nothing about the description: run it again next time
+        if cache is not None and not stats["timed_out"]:
+            cache.add(item["query"], description, model, backend_key, triggered)
+        return triggered
 
+    async def run_query(item: dict, total_runs: int) -> list[bool]:
+        triggers = cache.get(item["query"], description, model, backend_key)[:total_runs] if cache else []
+        metrics.cached_runs += len(triggers)
+        while len(triggers) < total_runs:
+            if early_stop:
+                # At least one run is needed to report a trigger rate
+                if triggers and decided_outcome(sum(triggers), len(triggers), total_runs, trigger_threshold) is not None:
+                    metrics.skipped_runs += total_runs - len(triggers)
+                    break
+                batch = runs_until_decidable(sum(triggers), len(triggers), total_runs, trigger_threshold)
+            else:
+                batch = total_runs - len(triggers)
+            # Cached outcomes are the first runs: new runs continue the numbering
+            triggers += await asyncio.gather(*(run_one(item, len(triggers) + i) for i in range(batch)))
+        return triggers
+
+    # Repeated queries are merged, as in the process executor
+    query_items: dict[str, dict] = {}
+    query_runs: dict[str, int] = {}
+    for item in eval_set:
+        query_items[item["query"]] = item
+        query_runs[item["query"]] = query_runs.get(item["query"], 0) + runs_per_query
+
+    outcomes = await asyncio.gather(*(
+        run_query(query_items[query], total_runs) for query, total_runs in query_runs.items()
+    ))
+    query_triggers = dict(zip(query_runs, outcomes))
+    if cache is not None:
+        cache.save()
+
+    output = summarize_results(skill_name, description, query_triggers, query_items, trigger_threshold)
+    output["metrics"] = metrics.to_dict()
+    return output
+
+
+# =============================================================================
+# Eval set
+# =============================================================================
+
+def summarize_results(
+    skill_name: str,
+    description: str,
+    query_triggers: dict[str, list[bool]],
+    query_items: dict[str, dict],
+    trigger_threshold: float,
+) -> dict:
+    """Turn per-query trigger lists into pass/fail results."""
+    results = []
     for query, triggers in query_triggers.items():
         item = query_items[query]
         trigger_rate = sum(triggers) / len(triggers)
@@ -256,17 +572,107 @@ def run_eval(
     }
 
 
+def run_eval(
+    eval_set: list[dict],
+    skill_name: str,
+    description: str,
+    num_workers: int,
+    timeout: int,
+    project_root: Path,
+    runs_per_query: int = 1,
+    trigger_threshold: float = 0.5,
+    model: str | None = None,
+    executor: str = "async",
+    cache: EvalResultCache | None = None,
+    early_stop: bool = False,
+    backend=None,
+) -> dict:
+    """Run the full eval set and return results.
+
+    executor="async" runs all queries from one event loop (num_workers is the
+    concurrency limit); executor="process" uses one worker process per query.
+    The result cache and early stopping are only used by the async executor.
+    backend defaults to the claude CLI (see backends.py).
+    """
+    if executor == "async":
+        return asyncio.run(run_eval_async(
+            eval_set=eval_set,
+            skill_name=skill_name,
+            description=description,
+            num_workers=num_workers,
+            timeout=timeout,
+            project_root=project_root,
+            runs_per_query=runs_per_query,
+            trigger_threshold=trigger_threshold,
+            model=model,
+            cache=cache,
+            early_stop=early_stop,
+            backend=backend,
+        ))
+
+    metrics = EvalMetrics(num_workers)
+    with ProcessPoolExecutor(max_workers=num_workers) as pool:
+        future_to_info = {}
+        # Runs of a repeated query are numbered across its items
+        next_run: dict[str, int] = {}
+        for item in eval_set:
+            for _ in range(runs_per_query):
+                run_idx = next_run.get(item["query"], 0)
+                next_run[item["query"]] = run_idx + 1
+                future = pool.submit(
+                    _run_single_query_timed,
+                    item["query"],
+                    skill_name,
+                    description,
+                    timeout,
+                    str(project_root),
+                    model,
+                    backend,
+                    run_index=run_idx,
+                )
+                future_to_info[future] = (item, run_idx)
+        metrics.peak_active = min(num_workers, len(future_to_info))
+
+        query_triggers: dict[str, list[bool]] = {}
+        query_items: dict[str, dict] = {}
+        for future in as_completed(future_to_info):
+            item, _ = future_to_info[future]
+            query = item["query"]
+            query_items[query] = item
+            if query not in query_triggers:
+                query_triggers[query] = []
+            try:
+                triggered, elapsed, stats = future.result()
+                metrics.record_run(elapsed, stats)
+                query_triggers[query].append(triggered)
+            except Exception as e:
+                print(f"Warning: query failed: {e}", file=sys.stderr)
+                metrics.failed += 1
+                query_triggers[query].append(False)
+
+    output = summarize_results(skill_name, description, query_triggers, query_items, trigger_threshold)
+    output["metrics"] = metrics.to_dict()
+    return output
+
+
 def main():
     parser = argparse.ArgumentParser(description="Run trigger evaluation for a skill description")
     parser.add_argument("--eval-set", required=True, help="Path to eval set JSON file")
     parser.add_argument("--skill-path", required=True, help="Path to skill directory")
     parser.add_argument("--description", default=None, help="Override description to test")
-    parser.add_argument("--num-workers", type=int, default=10, help="Number of parallel workers")
+    parser.add_argument("--num-workers", type=int, default=10, help="Number of queries run concurrently")
+    parser.add_argument("--executor", choices=["async", "process"], default="async",
+                        help="Run queries from one asyncio event loop (default) or one worker process each")
+    parser.add_argument("--early-stop", action="store_true",
+                        help="Stop repeating a query once its pass/fail is decided (async executor)")
+    parser.add_argument("--cache", default=None,
+                        help="JSON file caching run outcomes by (query, description, model) (async executor)")
     parser.add_argument("--timeout", type=int, default=30, help="Timeout per query in seconds")
     parser.add_argument("--runs-per-query", type=int, default=3, help="Number of runs per query")
     parser.add_argument("--trigger-threshold", type=float, default=0.5, help="Trigger rate threshold")
     parser.add_argument("--model", default=None, help="Model to use for claude -p (default: user's configured model)")
     parser.add_argument("--verbose", action="store_true", help="Print progress to stderr")
+    add_backend_arguments(parser)
     args = parser.parse_args()
 
     eval_set = json.loads(Path(args.eval_set).read_text())
@@ -293,11 +699,25 @@ def main():
         runs_per_query=args.runs_per_query,
         trigger_threshold=args.trigger_threshold,
         model=args.model,
+        executor=args.executor,
+        cache=EvalResultCache(args.cache) if args.cache else None,
+        early_stop=args.early_stop,
+        backend=backend_from_args(args),
     )
 
     if args.verbose:
         summary = output["summary"]
         print(f"Results: {summary['passed']}/{summary['total']} passed", file=sys.stderr)
+        if "metrics" in output:
+            m = output["metrics"]
+            print(
+                f"Throughput: {m['queries']} runs in {m['wall_seconds']}s "
+                f"({m['queries_per_second']}/s, {m['events_per_second']} events/s), "
+                f"peak concurrency {m['peak_concurrency']}/{m['max_concurrency']}, "
+                f"{m['timeouts']} timeouts, {m['cached_runs']} cached, "
+                f"{m['skipped_runs']} skipped",
+                file=sys.stderr,
+            )
         for r in output["results"]:
             status = "PASS" if r["pass"] else "FAIL"
             rate_str = f"{r['triggers']}/{r['runs']}"
@@ -4,6 +4,10 @@
 Combines run_eval.py and improve_description.py in a loop, tracking history
 and returning the best description found. Supports train/test split to prevent
 overfitting.
+
+With --backend simulate, queries run on the offline simulator and the
+description is "improved" locally, so the loop needs neither the claude CLI
+nor the Anthropic API.
 """
 
 import argparse
@@ -15,11 +19,14 @@ import time
 import webbrowser
 from pathlib import Path
 
-import anthropic
-
+from scripts.backends import (
+    SimulatedBackend,
+    add_backend_arguments,
+    backend_from_args,
+    simulated_improve_description,
+)
 from scripts.generate_report import generate_html
-from scripts.improve_description import improve_description
-from scripts.run_eval import find_project_root, run_eval
+from scripts.run_eval import EvalResultCache, find_project_root, run_eval
 from scripts.utils import parse_skill_md
 
 
@@ -60,8 +67,17 @@ def run_loop(
     verbose: bool,
     live_report_path: Path | None = None,
     log_dir: Path | None = None,
+    executor: str = "async",
+    early_stop: bool = True,
+    cache_path: Path | None = None,
+    backend=None,
 ) -> dict:
-    """Run the eval + improvement loop."""
+    """Run the eval + improvement loop.
+
+    Run outcomes are cached by (query, description, model, backend), so a
+    description seen in an earlier iteration is not re-evaluated. With early_stop, each
+    query stops being repeated once its pass/fail is decided.
+    """
     project_root = find_project_root()
     name, original_description, content = parse_skill_md(skill_path)
     current_description = description_override or original_description
@@ -75,7 +91,14 @@ def run_loop(
         train_set = eval_set
         test_set = []
 
-    client = anthropic.Anthropic()
+    simulated = isinstance(backend, SimulatedBackend)
+    if not simulated:
+        # Imported here so the simulated loop runs without the anthropic package
+        import anthropic
+        from scripts.improve_description import improve_description
+
+        client = anthropic.Anthropic()
+    eval_cache = EvalResultCache(cache_path)
     history = []
     exit_reason = "unknown"
 
@@ -99,8 +122,16 @@ def run_loop(
             runs_per_query=runs_per_query,
             trigger_threshold=trigger_threshold,
             model=model,
+            executor=executor,
+            cache=eval_cache,
+            early_stop=early_stop,
+            backend=backend,
         )
         eval_elapsed = time.time() - t0
+        if verbose and "metrics" in all_results:
+            m = all_results["metrics"]
+            print(f"Eval runs: {m['queries']} run, {m['cached_runs']} cached, "
+                  f"{m['skipped_runs']} skipped by early stopping", file=sys.stderr)
 
         # Split results back into train/test by matching queries
         train_queries_set = {q["query"] for q in train_set}
@@ -199,17 +230,20 @@ def run_loop(
             {k: v for k, v in h.items() if not k.startswith("test_")}
             for h in history
         ]
-        new_description = improve_description(
-            client=client,
-            skill_name=name,
-            skill_content=content,
-            current_description=current_description,
-            eval_results=train_results,
-            history=blinded_history,
-            model=model,
-            log_dir=log_dir,
-            iteration=iteration,
-        )
+        if simulated:
+            new_description = simulated_improve_description(current_description, train_results, iteration)
+        else:
+            new_description = improve_description(
+                client=client,
+                skill_name=name,
+                skill_content=content,
+                current_description=current_description,
+                eval_results=train_results,
+                history=blinded_history,
+                model=model,
+                log_dir=log_dir,
+                iteration=iteration,
+            )
         improve_elapsed = time.time() - t0
 
         if verbose:
@@ -250,7 +284,13 @@ def main():
     parser.add_argument("--eval-set", required=True, help="Path to eval set JSON file")
     parser.add_argument("--skill-path", required=True, help="Path to skill directory")
     parser.add_argument("--description", default=None, help="Override starting description")
-    parser.add_argument("--num-workers", type=int, default=10, help="Number of parallel workers")
+    parser.add_argument("--num-workers", type=int, default=10, help="Number of queries run concurrently")
+    parser.add_argument("--executor", choices=["async", "process"], default="async",
+                        help="Run eval queries from one asyncio event loop (default) or one worker process each")
+    parser.add_argument("--no-early-stop", action="store_true",
+                        help="Always run every query --runs-per-query times")
+    parser.add_argument("--eval-cache", default=None,
+                        help="JSON file caching run outcomes across loops (default: results dir if set, else memory only)")
     parser.add_argument("--timeout", type=int, default=30, help="Timeout per query in seconds")
     parser.add_argument("--max-iterations", type=int, default=5, help="Max improvement iterations")
     parser.add_argument("--runs-per-query", type=int, default=3, help="Number of runs per query")
@@ -260,6 +300,7 @@ def main():
     parser.add_argument("--verbose", action="store_true", help="Print progress to stderr")
     parser.add_argument("--report", default="auto", help="Generate HTML report at this path (default: 'auto' for temp file, 'none' to disable)")
     parser.add_argument("--results-dir", default=None, help="Save all outputs (results.json, report.html, log.txt) to a timestamped subdirectory here")
+    add_backend_arguments(parser)
     args = parser.parse_args()
 
     eval_set = json.loads(Path(args.eval_set).read_text())
@@ -293,6 +334,10 @@ def main():
         results_dir = None
 
     log_dir = results_dir / "logs" if results_dir else None
+    if args.eval_cache:
+        cache_path = Path(args.eval_cache)
+    else:
+        cache_path = results_dir / "eval_cache.json" if results_dir else None
 
     output = run_loop(
         eval_set=eval_set,
@@ -308,6 +353,10 @@ def main():
         verbose=args.verbose,
         live_report_path=live_report_path,
         log_dir=log_dir,
+        executor=args.executor,
+        early_stop=not args.no_early_stop,
+        cache_path=cache_path,
+        backend=backend_from_args(args),
     )
 
     # Save JSON output
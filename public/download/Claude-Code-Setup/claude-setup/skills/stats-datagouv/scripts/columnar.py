@@ -0,0 +1,538 @@
+#!/usr/bin/env python3
+"""Moteur colonnaire pour les fichiers bruts data.gouv.fr (CSV/XLSX).
+
+Le fichier est lu en flux, sans construire de dict par ligne : chaque
+colonne est encodee par dictionnaire (un code entier par ligne dans un
+tableau compact + la liste des valeurs distinctes). Les conversions
+(to_num, auto_type) et les filtres sont evalues une seule fois par valeur
+distincte, puis appliques aux lignes par leurs codes.
+
+Les filtres s'enchainent sur une selection d'indices de lignes. NumPy est
+utilise s'il est installe, sinon le module array de la bibliotheque standard.
+
+La semantique est celle de extract.py (lecture csv.DictReader, to_num,
+comparaison des chaines apres strip).
+
+Cache sur disque : a la premiere lecture, la table est convertie une fois
+pour toutes dans _data/.columnar/<fichier brut>/ (un fichier binaire de
+codes int32 par colonne + schema.json avec les valeurs distinctes). Les
+lectures suivantes memory-mappent ces fichiers au lieu de relire le brut.
+Le cache est invalide si le fichier brut change (taille/mtime, puis SHA-1).
+
+extract.py y ecrit aussi les colonnes numeriques de l'extrait (fichiers
+float64), que verify.py memory-mappe a la place de extract.json.
+
+Usage:
+    python columnar.py _data/raw_file.csv            # construit le cache
+    python columnar.py _data/raw_file.csv --rebuild  # le reconstruit
+
+Usage (bibliotheque):
+    from columnar import load_table
+    table = load_table(Path("_data/raw_file.csv"))
+    selection = table.all_rows()
+    selection = table.filter(selection, "annee==2024")
+    selection = table.sort(selection, "nb_licences", reverse=True)
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import mmap
+import operator
+import shutil
+import sys
+from array import array
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+try:
+    import numpy as np
+except ImportError:  # NumPy est optionnel
+    np = None
+
+
+# Ordre de detection des operateurs (identique a extract.apply_filter)
+FILTER_OPERATORS = [
+    ("!=", operator.ne),
+    ("==", operator.eq),
+    (">=", operator.ge),
+    ("<=", operator.le),
+    (">", operator.gt),
+    ("<", operator.lt),
+]
+
+# Type des codes de dictionnaire (entier C 32 bits)
+CODE_TYPECODE = "i"
+
+# Cache sur disque (dossier place a cote du fichier source)
+CACHE_DIR_NAME = ".columnar"
+CACHE_VERSION = 1
+SCHEMA_FILE = "schema.json"
+
+
+# ============================================================================
+# CONVERSIONS
+# ============================================================================
+def detect_separator(filepath: Path) -> str:
+    """Detecte le separateur CSV (virgule, point-virgule, tab)."""
+    with open(filepath, "r", encoding="utf-8", errors="replace") as f:
+        sample = f.read(4096)
+    for sep in [";", ",", "\t"]:
+        if sep in sample:
+            return sep
+    return ","
+
+
+def to_num(val):
+    """Convertit en nombre si possible."""
+    if val is None:
+        return 0
+    try:
+        return float(str(val).replace(",", ".").replace(" ", ""))
+    except (ValueError, TypeError):
+        return 0
+
+
+def auto_type(val):
+    """Convertit les valeurs en int/float si possible, sinon str."""
+    if val is None:
+        return None
+    s = str(val).strip()
+    if not s:
+        return None
+    # Tenter int
+    try:
+        return int(s)
+    except ValueError:
+        pass
+    # Tenter float (virgule francaise)
+    try:
+        return float(s.replace(",", ".").replace(" ", ""))
+    except ValueError:
+        pass
+    return s
+
+
+def parse_filter(filter_expr: str) -> Optional[tuple]:
+    """Decoupe 'colonne<op>valeur'. Retourne (colonne, op, valeur) ou None."""
+    for op, _ in FILTER_OPERATORS:
+        if op in filter_expr:
+            col, val = filter_expr.split(op, 1)
+            return col.strip(), op, val
+    return None
+
+
+# ============================================================================
+# TABLE COLONNAIRE
+# ============================================================================
+class ColumnTable:
+    """Table encodee par dictionnaire, colonne par colonne."""
+
+    def __init__(self, columns: list[str]):
+        # Noms en double : comme csv.DictReader, la derniere occurrence gagne
+        positions = {}
+        for i, name in enumerate(columns):
+            positions[name] = i
+        self.columns = list(positions)
+        self._positions = [positions[name] for name in self.columns]
+
+        self.n_rows = 0
+        self._codes = {c: array(CODE_TYPECODE) for c in self.columns}
+        self._values = {c: [] for c in self.columns}
+        self._lookup = {c: {} for c in self.columns}
+
+        # Caches des conversions (par valeur distincte, puis par ligne)
+        self._numbers = {}
+        self._typed = {}
+        self._numeric = {}
+
+    @classmethod
+    def from_columns(cls, columns: list[str], n_rows: int, codes: dict, values: dict):
+        """Table en lecture seule construite a partir de colonnes deja encodees."""
+        table = cls(columns)
+        table.n_rows = n_rows
+        table._codes = codes
+        table._values = values
+        table._lookup = None
+        return table
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    # ------------------------------------------------------------------
+    # Ingestion
+    # ------------------------------------------------------------------
+    def append(self, row: list):
+        """Ajoute une ligne (valeurs dans l'ordre de l'en-tete d'origine)."""
+        width = len(row)
+        for name, pos in zip(self.columns, self._positions):
+            value = row[pos] if pos < width else None
+            lookup = self._lookup[name]
+            code = lookup.get(value)
+            if code is None:
+                code = len(self._values[name])
+                lookup[value] = code
+                self._values[name].append(value)
+            self._codes[name].append(code)
+        self.n_rows += 1
+
+    def extend(self, rows: Iterable[list]):
+        """Ajoute des lignes lues en flux."""
+        self._invalidate()
+        for row in rows:
+            self.append(row)
+
+    def _invalidate(self):
+        """Vide les caches de conversion (la table a change)."""
+        self._numbers.clear()
+        self._typed.clear()
+        self._numeric.clear()
+
+    # ------------------------------------------------------------------
+    # Colonnes
+    # ------------------------------------------------------------------
+    def codes(self, col: str):
+        """Codes de dictionnaire d'une colonne (tableau NumPy si disponible)."""
+        codes = self._codes[col]
+        if np is not None:
+            return np.frombuffer(codes, dtype=np.int32) if len(codes) else np.zeros(0, np.int32)
+        return codes
+
+    def distinct(self, col: str) -> list:
+        """Valeurs distinctes d'une colonne (indexees par code)."""
+        return self._values[col]
+
+    def numbers(self, col: str) -> array:
+        """to_num de chaque valeur distincte, calcule une seule fois."""
+        cached = self._numbers.get(col)
+        if cached is None:
+            cached = array("d", (to_num(v) for v in self._values[col]))
+            self._numbers[col] = cached
+        return cached
+
+    def typed(self, col: str) -> list:
+        """auto_type de chaque valeur distincte, calcule une seule fois."""
+        cached = self._typed.get(col)
+        if cached is None:
+            cached = [auto_type(v) for v in self._values[col]]
+            self._typed[col] = cached
+        return cached
+
+    def numeric(self, col: str):
+        """Colonne numerique complete (to_num), convertie une seule fois."""
+        cached = self._numeric.get(col)
+        if cached is None:
+            numbers = self.numbers(col)
+            if np is not None:
+                cached = np.frombuffer(numbers, dtype=np.float64)[self.codes(col)] \
+                    if len(numbers) else np.zeros(self.n_rows)
+            else:
+                codes = self._codes[col]
+                cached = array("d", (numbers[c] for c in codes))
+            self._numeric[col] = cached
+        return cached
+
+    # ------------------------------------------------------------------
+    # Selections et filtres
+    # ------------------------------------------------------------------
+    def all_rows(self):
+        """Selection de toutes les lignes."""
+        if np is not None:
+            return np.arange(self.n_rows, dtype=np.int64)
+        return array("q", range(self.n_rows))
+
+    def _select_codes(self, selection, col: str, keep: list):
+        """Garde les lignes de la selection dont le code de `col` est retenu."""
+        if np is not None:
+            keep_mask = np.array(keep, dtype=bool)
+            return selection[keep_mask[self.codes(col)[selection]]]
+        codes = self._codes[col]
+        return array("q", (i for i in selection if keep[codes[i]]))
+
+    def filter(self, selection, filter_expr: str):
+        """Applique un filtre 'colonne<op>valeur' a une selection."""
+        parsed = parse_filter(filter_expr)
+        if parsed is None:
+            return selection
+        col, op, val = parsed
+        compare = dict(FILTER_OPERATORS)[op]
+
+        if op in ("==", "!="):
+            val = val.strip()
+            if col not in self._codes:
+                # Colonne absente : valeur "" pour toutes les lignes
+                return selection if compare("", val) else selection[:0]
+            keep = [compare(str(v).strip(), val) for v in self._values[col]]
+        else:
+            threshold = to_num(val)
+            if col not in self._codes:
+                return selection if compare(0, threshold) else selection[:0]
+            keep = [compare(x, threshold) for x in self.numbers(col)]
+
+        if all(keep):
+            return selection
+        return self._select_codes(selection, col, keep)
+
+    def sort(self, selection, col: str, reverse: bool = False):
+        """Tri stable de la selection selon to_num(col)."""
+        if col not in self._codes:
+            return selection
+        keys = self.numeric(col)
+        if np is not None:
+            sub = keys[selection]
+            order = np.argsort(-sub if reverse else sub, kind="stable")
+            return selection[order]
+        return array("q", sorted(selection, key=keys.__getitem__, reverse=reverse))
+
+    # ------------------------------------------------------------------
+    # Sortie
+    # ------------------------------------------------------------------
+    def iter_rows(self, selection, columns: list[str], typed: bool = True) -> Iterator[dict]:
+        """Produit les lignes selectionnees sous forme de dicts (valeurs typees)."""
+        lookups = []
+        for col in columns:
+            if col in self._codes:
+                values = self.typed(col) if typed else self._values[col]
+                lookups.append((col, self._codes[col], values))
+            else:
+                lookups.append((col, None, None))
+        indices = selection.tolist() if np is not None else selection
+        for i in indices:
+            yield {
+                col: (values[codes[i]] if codes is not None else None)
+                for col, codes, values in lookups
+            }
+
+    def memory_bytes(self) -> int:
+        """Taille approximative des codes en memoire (hors dictionnaires)."""
+        return sum(codes.itemsize * len(codes) for codes in self._codes.values())
+
+
+# ============================================================================
+# LECTURE EN FLUX
+# ============================================================================
+def read_csv_table(filepath: Path) -> ColumnTable:
+    """Lit un CSV en flux dans une ColumnTable."""
+    sep = detect_separator(filepath)
+    with open(filepath, "r", encoding="utf-8", errors="replace") as f:
+        reader = csv.reader(f, delimiter=sep)
+        header = next(reader, None)
+        table = ColumnTable(header or [])
+        # csv.DictReader ignore les lignes vides
+        table.extend(row for row in reader if row)
+    return table
+
+
+def read_xlsx_table(filepath: Path) -> ColumnTable:
+    """Lit la feuille active d'un XLSX en flux (necessite openpyxl)."""
+    try:
+        import openpyxl
+    except ImportError:
+        print("ERREUR: pip install openpyxl pour lire les fichiers XLSX")
+        raise SystemExit(1)
+    wb = openpyxl.load_workbook(filepath, read_only=True, data_only=True)
+    try:
+        rows_iter = wb.active.iter_rows(values_only=True)
+        table = ColumnTable([str(h) for h in next(rows_iter)])
+        # Valeurs conservees sous forme de chaine : to_num et auto_type
+        # passent par str(), le resultat est identique
+        table.extend(
+            [None if v is None else str(v) for v in row]
+            for row in rows_iter
+        )
+    finally:
+        wb.close()
+    return table
+
+
+def read_table(filepath: Path) -> ColumnTable:
+    """Lit un CSV ou XLSX brut dans une ColumnTable."""
+    ext = filepath.suffix.lower()
+    if ext in (".xlsx", ".xls"):
+        return read_xlsx_table(filepath)
+    return read_csv_table(filepath)
+
+
+# ============================================================================
+# CACHE SUR DISQUE
+# ============================================================================
+def cache_dir_for(filepath: Path) -> Path:
+    """Dossier de cache d'un fichier (_data/.columnar/<nom du fichier>/)."""
+    return filepath.parent / CACHE_DIR_NAME / filepath.name
+
+
+def file_sha1(path: Path) -> str:
+    """Empreinte SHA-1 d'un fichier."""
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def source_signature(path: Path, with_hash: bool = True) -> dict:
+    """Signature d'un fichier source (taille, mtime, empreinte)."""
+    stat = path.stat()
+    signature = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    if with_hash:
+        signature["sha1"] = file_sha1(path)
+    return signature
+
+
+def map_array(path: Path, typecode: str):
+    """Memory-mappe un fichier binaire de valeurs `typecode` (lecture seule)."""
+    if path.stat().st_size == 0:
+        return array(typecode)
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return memoryview(mapped).cast(typecode)
+
+
+def write_cache(cache_dir: Path, schema: dict, arrays: dict):
+    """Ecrit un cache (fichiers binaires + schema.json) de facon atomique."""
+    tmp_dir = cache_dir.with_name(cache_dir.name + ".tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+    for filename, values in arrays.items():
+        with open(tmp_dir / filename, "wb") as f:
+            values.tofile(f)
+    schema = {"version": CACHE_VERSION, "byteorder": sys.byteorder, **schema}
+    (tmp_dir / SCHEMA_FILE).write_text(
+        json.dumps(schema, ensure_ascii=False, separators=(",", ":")), encoding="utf-8"
+    )
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    tmp_dir.replace(cache_dir)
+
+
+def read_schema(cache_dir: Path) -> Optional[dict]:
+    """Lit schema.json d'un cache compatible (None sinon)."""
+    try:
+        schema = json.loads((cache_dir / SCHEMA_FILE).read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    if schema.get("version") != CACHE_VERSION or schema.get("byteorder") != sys.byteorder:
+        return None
+    return schema
+
+
+def check_source(cache_dir: Path, schema: dict, filepath: Path) -> bool:
+    """True si le cache correspond encore au fichier source."""
+    saved = schema.get("source", {})
+    stat = filepath.stat()
+    if stat.st_size != saved.get("size"):
+        return False
+    if stat.st_mtime_ns == saved.get("mtime_ns"):
+        return True
+    # Meme taille, date differente : confirmer par l'empreinte
+    if file_sha1(filepath) != saved.get("sha1"):
+        return False
+    saved["mtime_ns"] = stat.st_mtime_ns
+    (cache_dir / SCHEMA_FILE).write_text(
+        json.dumps(schema, ensure_ascii=False, separators=(",", ":")), encoding="utf-8"
+    )
+    return True
+
+
+def save_table_cache(table: ColumnTable, filepath: Path):
+    """Convertit une table lue depuis `filepath` en cache colonnaire."""
+    names = [f"{i}.codes" for i in range(len(table.columns))]
+    write_cache(
+        cache_dir_for(filepath),
+        {
+            "source": {"name": filepath.name, **source_signature(filepath)},
+            "columns": table.columns,
+            "n_rows": table.n_rows,
+            "files": names,
+            "values": [table.distinct(col) for col in table.columns],
+        },
+        {name: table._codes[col] for name, col in zip(names, table.columns)},
+    )
+
+
+def open_table_cache(filepath: Path) -> Optional[ColumnTable]:
+    """Ouvre le cache de `filepath` s'il est a jour (codes memory-mappes)."""
+    cache_dir = cache_dir_for(filepath)
+    schema = read_schema(cache_dir)
+    if schema is None or not check_source(cache_dir, schema, filepath):
+        return None
+    try:
+        codes = {
+            col: map_array(cache_dir / name, CODE_TYPECODE)
+            for col, name in zip(schema["columns"], schema["files"])
+        }
+    except (OSError, KeyError, TypeError, ValueError):
+        return None
+    if any(len(c) != schema["n_rows"] for c in codes.values()):
+        return None
+    values = dict(zip(schema["columns"], schema["values"]))
+    return ColumnTable.from_columns(schema["columns"], schema["n_rows"], codes, values)
+
+
+def load_table(filepath: Path, use_cache: bool = True) -> ColumnTable:
+    """Charge CSV ou XLSX, via le cache colonnaire si possible (cree sinon)."""
+    if not use_cache:
+        return read_table(filepath)
+    table = open_table_cache(filepath)
+    if table is None:
+        table = read_table(filepath)
+        try:
+            save_table_cache(table, filepath)
+        except OSError as e:
+            print(f"  Cache colonnaire non ecrit: {e}")
+    return table
+
+
+def numeric_column(rows: list[dict], col: str) -> array:
+    """Valeurs numeriques d'une colonne de l'extrait (regle de verify.col_values)."""
+    vals = array("d")
+    for r in rows:
+        v = r.get(col)
+        if v is not None:
+            try:
+                vals.append(float(v))
+            except (ValueError, TypeError):
+                pass
+    return vals
+
+
+def save_extract_cache(extract_path: Path, columns: list[str], rows: list[dict]):
+    """Ecrit les colonnes numeriques de l'extrait pour verify.py."""
+    names = [f"{i}.f64" for i in range(len(columns))]
+    write_cache(
+        cache_dir_for(extract_path),
+        {
+            "source": {"name": extract_path.name, **source_signature(extract_path)},
+            "columns": columns,
+            "n_rows": len(rows),
+            "files": names,
+        },
+        {name: numeric_column(rows, col) for name, col in zip(names, columns)},
+    )
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+def main():
+    parser = argparse.ArgumentParser(description="Cache colonnaire d'un fichier brut")
+    parser.add_argument("input", help="Fichier brut (CSV/XLSX)")
+    parser.add_argument("--rebuild", action="store_true", help="Reconstruire le cache")
+    args = parser.parse_args()
+
+    input_path = Path(args.input)
+    table = None if args.rebuild else open_table_cache(input_path)
+    if table is None:
+        table = read_table(input_path)
+        save_table_cache(table, input_path)
+        print(f"[OK] Cache construit: {cache_dir_for(input_path)}")
+    else:
+        print(f"[OK] Cache a jour: {cache_dir_for(input_path)}")
+
+    print(f"  {len(table)} lignes, {len(table.columns)} colonnes")
+    for col in table.columns:
+        print(f"  {col}: {len(table.distinct(col))} valeurs distinctes")
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,17 @@ Produit :
     - _data/extract.csv         (sous-ensemble filtre, separateur ;)
     - _data/extract.json        (meme contenu en JSON)
     - _data/extract_params.json (parametres de filtrage pour reproductibilite)
+
+Le fichier brut est lu en flux par le moteur colonnaire (columnar.py) : une
+colonne encodee par dictionnaire au lieu d'un dict par ligne, filtres
+enchaines sur une selection d'indices. --rows revient au chargement
+historique en list[dict] (utile pour comparer les sorties).
+
+A la premiere lecture, le brut est converti en cache colonnaire binaire
+(_data/.columnar/, a cote de source.json) : les extractions suivantes sur le
+meme fichier le memory-mappent et demarrent sans relire le CSV/XLSX. Les
+colonnes numeriques de l'extrait y sont aussi ecrites pour verify.py.
+--no-cache desactive les deux.
 """
 
 import argparse
@@ -22,15 +33,7 @@ import csv
 import json
 from pathlib import Path
 
-
-def detect_separator(filepath: Path) -> str:
-    """Detecte le separateur CSV (virgule, point-virgule, tab)."""
-    with open(filepath, "r", encoding="utf-8", errors="replace") as f:
-        sample = f.read(4096)
-    for sep in [";", ",", "\t"]:
-        if sep in sample:
-            return sep
-    return ","
+from columnar import auto_type, detect_separator, load_table, save_extract_cache, to_num
 
 
 def read_csv(filepath: Path) -> list[dict]:
@@ -86,52 +89,14 @@ def apply_filter(rows: list[dict], filter_expr: str) -> list[dict]:
     return rows
 
 
-def to_num(val):
-    """Convertit en nombre si possible."""
-    if val is None:
-        return 0
-    try:
-        return float(str(val).replace(",", ".").replace(" ", ""))
-    except (ValueError, TypeError):
-        return 0
-
-
-def auto_type(val):
-    """Convertit les valeurs en int/float si possible, sinon str."""
-    if val is None:
-        return None
-    s = str(val).strip()
-    if not s:
-        return None
-    # Tenter int
-    try:
-        return int(s)
-    except ValueError:
-        pass
-    # Tenter float (virgule francaise)
-    try:
-        return float(s.replace(",", ".").replace(" ", ""))
-    except ValueError:
-        pass
-    return s
+def parse_sort(sort_expr: str) -> tuple[str, bool]:
+    """Decoupe 'colonne asc|desc'. Retourne (colonne, reverse)."""
+    parts = sort_expr.strip().split()
+    return parts[0], len(parts) > 1 and parts[1].lower() == "desc"
 
 
-def main():
-    parser = argparse.ArgumentParser(description="Extrait un sous-ensemble filtre")
-    parser.add_argument("--input", required=True, help="Fichier brut (CSV/XLSX)")
-    parser.add_argument("--output", required=True, help="Fichier de sortie (.csv)")
-    parser.add_argument("--columns", default="", help="Colonnes a garder (virgule)")
-    parser.add_argument("--filter", action="append", default=[], help="Filtre col==val (repeatable)")
-    parser.add_argument("--limit", type=int, default=0, help="Nombre max de lignes")
-    parser.add_argument("--sort", default="", help="Tri: 'colonne asc|desc'")
-    args = parser.parse_args()
-
-    input_path = Path(args.input)
-    output_path = Path(args.output)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-
-    # Charger
-    print(f"Lecture: {input_path}")
+def extract_rows(input_path: Path, args) -> tuple[list, list[dict]]:
+    """Extraction historique : tout le fichier en list[dict]."""
     rows = load_data(input_path)
     print(f"  {len(rows)} lignes chargees")
 
@@ -150,9 +115,7 @@ def main():
 
     # Trier
     if args.sort:
-        parts = args.sort.strip().split()
-        sort_col = parts[0]
-        reverse = len(parts) > 1 and parts[1].lower() == "desc"
+        sort_col, reverse = parse_sort(args.sort)
         rows.sort(key=lambda r: to_num(r.get(sort_col, 0)), reverse=reverse)
         print(f"  Tri par '{sort_col}' {'desc' if reverse else 'asc'}")
 
@@ -163,6 +126,67 @@ def main():
 
     # Typer les valeurs
     rows = [{k: auto_type(v) for k, v in r.items()} for r in rows]
+    return cols, rows
+
+
+def extract_columnar(input_path: Path, args) -> tuple[list, list[dict]]:
+    """Extraction colonnaire : seules les lignes retenues deviennent des dicts."""
+    table = load_table(input_path, use_cache=not args.no_cache)
+    print(f"  {len(table)} lignes chargees")
+
+    # Filtrer (chaque filtre restreint la selection courante)
+    selection = table.all_rows()
+    for f in args.filter:
+        before = len(selection)
+        selection = table.filter(selection, f)
+        print(f"  Filtre '{f}': {before} -> {len(selection)} lignes")
+
+    # Selectionner colonnes
+    if args.columns:
+        cols = [c.strip() for c in args.columns.split(",")]
+    else:
+        cols = list(table.columns) if len(selection) else []
+
+    # Trier (une colonne hors selection donne une cle constante)
+    if args.sort:
+        sort_col, reverse = parse_sort(args.sort)
+        if sort_col in cols:
+            selection = table.sort(selection, sort_col, reverse=reverse)
+        print(f"  Tri par '{sort_col}' {'desc' if reverse else 'asc'}")
+
+    # Limiter
+    if args.limit > 0:
+        selection = selection[:args.limit]
+        print(f"  Limite: {args.limit} lignes")
+
+    # Typer les valeurs (auto_type calcule une fois par valeur distincte)
+    return cols, list(table.iter_rows(selection, cols))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extrait un sous-ensemble filtre")
+    parser.add_argument("--input", required=True, help="Fichier brut (CSV/XLSX)")
+    parser.add_argument("--output", required=True, help="Fichier de sortie (.csv)")
+    parser.add_argument("--columns", default="", help="Colonnes a garder (virgule)")
+    parser.add_argument("--filter", action="append", default=[], help="Filtre col==val (repeatable)")
+    parser.add_argument("--limit", type=int, default=0, help="Nombre max de lignes")
+    parser.add_argument("--sort", default="", help="Tri: 'colonne asc|desc'")
+    parser.add_argument("--rows", action="store_true",
+                        help="Chargement historique en list[dict] (sans moteur colonnaire)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Ne pas lire ni ecrire le cache colonnaire (_data/.columnar/)")
+    args = parser.parse_args()
+
+    input_path = Path(args.input)
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Charger, filtrer, trier, limiter
+    print(f"Lecture: {input_path}")
+    if args.rows:
+        cols, rows = extract_rows(input_path, args)
+    else:
+        cols, rows = extract_columnar(input_path, args)
 
     # Ecrire CSV (separateur ;)
     with open(output_path, "w", encoding="utf-8", newline="") as f:
@@ -176,6 +200,8 @@ def main():
     json_data = {"columns": cols, "rows": rows}
     json_path.write_text(json.dumps(json_data, indent=2, ensure_ascii=False), encoding="utf-8")
     print(f"Sortie JSON: {json_path}")
+    if not args.no_cache:
+        save_extract_cache(json_path, cols, rows)
 
     # Ecrire params
     params_path = output_path.parent / "extract_params.json"
@@ -3,23 +3,81 @@
 
 Usage:
     python verify.py _data/
+    python verify.py _data/ --timings   # temps de calcul par colonne
 
 Lit _data/extract.json et _data/computed.json, recalcule chaque operation
 et compare aux resultats declares.
+
+Les colonnes de extract.json sont converties une seule fois en tableaux
+compacts (array('d')) et partagees par tous les calculs qui les utilisent.
+Si extract.py a ecrit le cache colonnaire de l'extrait (_data/.columnar/
+extract.json/) et qu'il est a jour, ses fichiers float64 sont memory-mappes
+et extract.json n'est pas relu. Le script reste autonome (copie locale).
+
+Les calculs sont regroupes par colonne : chaque colonne est lue une fois,
+chaque statistique demandee calculee une fois, et mediane/quartiles
+partagent un seul tri.
 """
 
 import json
+import mmap
 import sys
+import time
+from array import array
 from pathlib import Path
-from statistics import mean, median, stdev, variance
+from statistics import StatisticsError, mean, median, stdev, variance
+
+# Format du cache ecrit par columnar.save_extract_cache
+CACHE_DIR_NAME = ".columnar"
+CACHE_VERSION = 1
+
+
+def map_values(path: Path):
+    """Memory-mappe un fichier de float64 (lecture seule)."""
+    if path.stat().st_size == 0:
+        return array("d")
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return memoryview(mapped).cast("d")
+
+
+def load_extract_cache(extract_path: Path):
+    """Ouvre le cache colonnaire de l'extrait s'il est a jour (None sinon)."""
+    cache_dir = extract_path.parent / CACHE_DIR_NAME / extract_path.name
+    try:
+        schema = json.loads((cache_dir / "schema.json").read_text(encoding="utf-8"))
+        stat = extract_path.stat()
+        saved = schema["source"]
+        if (schema["version"] != CACHE_VERSION or schema["byteorder"] != sys.byteorder
+                or stat.st_size != saved["size"] or stat.st_mtime_ns != saved["mtime_ns"]):
+            return None
+        mapped = {
+            col: map_values(cache_dir / name)
+            for col, name in zip(schema["columns"], schema["files"])
+        }
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    extract = {"columns": schema["columns"], "n_rows": schema["n_rows"]}
+    return extract, ColumnCache([], mapped)
+
+
+def load_extract(extract_path: Path):
+    """Charge l'extrait (cache memory-mappe, sinon extract.json)."""
+    cached = load_extract_cache(extract_path)
+    if cached is not None:
+        return cached
+    data = json.loads(extract_path.read_text(encoding="utf-8"))
+    rows = data["rows"]
+    extract = {"columns": data.get("columns", []), "n_rows": len(rows)}
+    return extract, ColumnCache(rows)
 
 
 def load(data_dir: Path):
-    """Charge extract.json, computed.json et source.json."""
-    extract = json.loads((data_dir / "extract.json").read_text(encoding="utf-8"))
+    """Charge l'extrait, computed.json et source.json."""
+    extract, columns = load_extract(data_dir / "extract.json")
     computed = json.loads((data_dir / "computed.json").read_text(encoding="utf-8"))
     source = json.loads((data_dir / "source.json").read_text(encoding="utf-8"))
-    return extract, computed, source
+    return extract, columns, computed, source
 
 
 def col_values(rows: list[dict], col: str) -> list[float]:
@@ -35,6 +93,26 @@ def col_values(rows: list[dict], col: str) -> list[float]:
     return vals
 
 
+class ColumnCache:
+    """Colonnes numeriques de l'extrait, converties a la premiere demande."""
+
+    def __init__(self, rows: list[dict], mapped: dict = None):
+        self.rows = rows
+        self._columns: dict[str, array] = dict(mapped or {})
+
+    def values(self, col: str) -> list[float]:
+        """Valeurs numeriques de la colonne.
+
+        Stockees en tableau compact ; une liste est rendue a chaque appel pour
+        que les operations se comportent (et echouent) comme sur une liste.
+        """
+        cached = self._columns.get(col)
+        if cached is None:
+            cached = array("d", col_values(self.rows, col))
+            self._columns[col] = cached
+        return cached.tolist()
+
+
 def approx_equal(a, b, tol=1e-6):
     """Comparaison avec tolerance."""
     if isinstance(a, (int, float)) and isinstance(b, (int, float)):
@@ -122,33 +200,127 @@ OPERATIONS = {
 }
 
 
-def resolve_values(calc: dict, rows: list[dict]) -> list[float]:
+# --- Operations sur une colonne deja triee (meme calcul que statistics.median) ---
+
+def median_sorted(s):
+    n = len(s)
+    if n == 0:
+        raise StatisticsError("no median for empty data")
+    if n % 2 == 1:
+        return s[n // 2]
+    i = n // 2
+    return (s[i - 1] + s[i]) / 2
+
+def q1_sorted(s):
+    return median_sorted(s[:len(s) // 2])
+
+def q3_sorted(s):
+    return median_sorted(s[(len(s) + 1) // 2:])
+
+def iqr_sorted(s):
+    return q3_sorted(s) - q1_sorted(s)
+
+
+SORTED_OPERATIONS = {
+    "median": median_sorted, "q1": q1_sorted, "q3": q3_sorted, "iqr": iqr_sorted,
+}
+
+
+class ColumnStats:
+    """Statistiques d'une colonne, calculees une fois et partagees entre calculs."""
+
+    def __init__(self, values):
+        self.values = values
+        self._sorted = None
+        self._results = {}
+
+    def sorted_values(self) -> list[float]:
+        """Valeurs triees (un seul tri pour toutes les operations d'ordre)."""
+        if self._sorted is None:
+            self._sorted = sorted(self.values)
+        return self._sorted
+
+    def compute(self, op_name: str):
+        """Resultat memorise de l'operation (les erreurs sont relevees a l'identique)."""
+        if op_name not in self._results:
+            try:
+                if op_name in SORTED_OPERATIONS:
+                    result = SORTED_OPERATIONS[op_name](self.sorted_values())
+                else:
+                    result = OPERATIONS[op_name](self.values)
+            except Exception as e:
+                result = e
+            self._results[op_name] = result
+        result = self._results[op_name]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def plan_calculs(calculs: list[dict]) -> dict[str, list[str]]:
+    """Regroupe par colonne les operations connues des calculs sur colonne."""
+    plan: dict[str, list[str]] = {}
+    for calc in calculs:
+        if "input_values" in calc or "column" not in calc:
+            continue
+        op_name = calc["operation"].split("(")[0].strip()
+        if op_name in OPERATIONS:
+            ops = plan.setdefault(calc["column"], [])
+            if op_name not in ops:
+                ops.append(op_name)
+    return plan
+
+
+def compute_columns(calculs: list[dict], columns: ColumnCache):
+    """Calcule toutes les statistiques demandees, un passage par colonne.
+
+    Returns:
+        (stats par colonne, [(colonne, nb operations, secondes)])
+    """
+    stats: dict[str, ColumnStats] = {}
+    timings = []
+    for col, ops in plan_calculs(calculs).items():
+        start = time.perf_counter()
+        col_stats = ColumnStats(columns.values(col))
+        for op_name in ops:
+            try:
+                col_stats.compute(op_name)
+            except Exception:
+                pass  # signale avec la question correspondante
+        stats[col] = col_stats
+        timings.append((col, len(ops), time.perf_counter() - start))
+    return stats, timings
+
+
+def resolve_values(calc: dict, columns: ColumnCache) -> list[float]:
     """Determine les valeurs d'entree pour un calcul.
 
     Priorite :
     1. 'input_values' explicites dans computed.json
-    2. 'column' → extraire toutes les valeurs de cette colonne depuis extract
+    2. 'column' → valeurs de cette colonne depuis extract (cache partage)
     """
     if "input_values" in calc:
         return [float(v) for v in calc["input_values"]]
     if "column" in calc:
-        return col_values(rows, calc["column"])
+        return columns.values(calc["column"])
     return []
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python verify.py <data_dir>")
+    args = [a for a in sys.argv[1:] if a != "--timings"]
+    show_timings = len(args) < len(sys.argv) - 1
+    if not args:
+        print("Usage: python verify.py <data_dir> [--timings]")
         sys.exit(1)
 
-    data_dir = Path(sys.argv[1])
-    extract, computed, source = load(data_dir)
-    rows = extract["rows"]
+    data_dir = Path(args[0])
+    extract, columns, computed, source = load(data_dir)
+    stats, timings = compute_columns(computed["calculs"], columns)
 
     print(f"Dataset : {source.get('dataset_title', '?')}")
     print(f"Source  : {source.get('datagouv_url', source.get('download_url', '?'))}")
     print(f"Date    : {source.get('download_date', '?')}")
-    print(f"Lignes  : {len(rows)}")
+    print(f"Lignes  : {extract['n_rows']}")
     print(f"Colonnes: {extract.get('columns', [])}")
     print("-" * 60)
 
@@ -160,7 +332,10 @@ def main():
         q = calc["question"]
         op_name = calc["operation"].split("(")[0].strip()
         expected = calc["result"]
-        values = resolve_values(calc, rows)
+        col_stats = None
+        if "input_values" not in calc and "column" in calc:
+            col_stats = stats.get(calc["column"])
+        values = None if col_stats is not None else resolve_values(calc, columns)
 
         if op_name not in OPERATIONS:
             print(f"  ???  {q}: operation inconnue '{op_name}'")
@@ -169,7 +344,10 @@ def main():
             continue
 
         try:
-            actual = OPERATIONS[op_name](values)
+            if col_stats is not None:
+                actual = col_stats.compute(op_name)
+            else:
+                actual = OPERATIONS[op_name](values)
             if approx_equal(actual, expected):
                 print(f"  OK   {q}: {calc['operation']} = {actual}")
                 passed += 1
@@ -182,6 +360,12 @@ def main():
             failed += 1
             errors.append(q)
 
+    if show_timings:
+        print("-" * 60)
+        print("Temps par colonne :")
+        for col, n_ops, seconds in sorted(timings, key=lambda t: -t[2]):
+            print(f"  {col:<30} {n_ops:3d} stat(s) {seconds * 1000:9.1f} ms")
+
     print("-" * 60)
     total = passed + failed
     print(f"Resultat : {passed}/{total} OK")